@@ -10,8 +10,43 @@ class FirebaseConfig(BaseSettings):
     public_keys_url: str
 
 
+class DatabaseConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="database_", env_file=".env", extra="allow")
+    executor_max_workers: int = 16
+    fan_out_max_workers: int = 32
+    job_max_workers: int = 2
+
+
+class CacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="cache_", env_file=".env", extra="allow")
+    token_max_entries: int = 10000
+    user_max_entries: int = 5000
+    user_ttl_seconds: float = 60
+    menu_max_entries: int = 1000
+    menu_ttl_seconds: float = 60
+    dish_summary_max_entries: int = 5000
+    dish_summary_ttl_seconds: float = 30
+    idempotency_max_entries: int = 10000
+    idempotency_ttl_seconds: float = 86400
+    job_max_entries: int = 1000
+    job_ttl_seconds: float = 86400
+
+
+class StreamConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="stream_", env_file=".env", extra="allow")
+    heartbeat_seconds: float = 15
+    snapshot_timeout_seconds: float = 30
+    subscriber_queue_size: int = 100
+    status_history_size: int = 20
+    status_history_max_users: int = 10000
+    status_history_ttl_seconds: float = 600
+
+
 class Config(BaseModel):
     firebase_config: FirebaseConfig = FirebaseConfig()
+    database_config: DatabaseConfig = DatabaseConfig()
+    cache_config: CacheConfig = CacheConfig()
+    stream_config: StreamConfig = StreamConfig()
 
 
 settings = Config()
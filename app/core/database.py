@@ -1,5 +1,25 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, ParamSpec, TypeVar
+
 from firebase_admin import firestore  # type: ignore
 
+from app.config import settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_database_executor = ThreadPoolExecutor(
+    max_workers=settings.database_config.executor_max_workers, thread_name_prefix="firestore"
+)
+
+# Independent reads issued by code already running on `_database_executor` get their own pool, so a full
+# request pool can never wait on itself.
+_fan_out_executor = ThreadPoolExecutor(
+    max_workers=settings.database_config.fan_out_max_workers, thread_name_prefix="firestore-fan-out"
+)
+
 
 def get_database_ref() -> firestore.Client:
     """Get a reference to the Firestore database.
@@ -8,3 +28,42 @@ def get_database_ref() -> firestore.Client:
         firestore.Client: A Firestore client instance.
     """
     return firestore.client()
+
+
+async def run_in_database_executor(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking Firestore call on the bounded database thread pool.
+
+    The Firestore client is synchronous, so calling it straight from a coroutine stalls the event loop.
+    The pool size is controlled by `DATABASE_EXECUTOR_MAX_WORKERS`.
+
+    Args:
+        func (Callable): The blocking function to run.
+        *args: Positional arguments passed to `func`.
+        **kwargs: Keyword arguments passed to `func`.
+
+    Returns:
+        T: The value returned by `func`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_database_executor, partial(func, *args, **kwargs))
+
+
+def submit_to_database_executor(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+    """Start a blocking Firestore call on the database thread pool without waiting for it.
+
+    For cleanup code on the event loop that cannot await, e.g. while a request is being cancelled.
+    """
+    return _database_executor.submit(func, *args, **kwargs)
+
+
+def fan_out(*calls: Callable[[], Any]) -> list[Any]:
+    """Run independent blocking Firestore calls concurrently and wait for all of them.
+
+    Args:
+        *calls (Callable): Zero-argument callables, e.g. `partial(db_ref.get_all, refs)`.
+
+    Returns:
+        list[Any]: The results, in the same order as `calls`. The first exception raised is re-raised.
+    """
+    futures = [_fan_out_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
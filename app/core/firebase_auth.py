@@ -1,15 +1,14 @@
-from functools import lru_cache
+import hashlib
 from typing import Any
 
 import firebase_admin  # type: ignore
 import jwt
-import requests
 from fastapi import HTTPException
 from firebase_admin import auth, credentials
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
 
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.public_keys import FirebasePublicKeyStore
 
 if not firebase_admin._apps:
     cred = credentials.Certificate(settings.firebase_config.service_account_json)
@@ -20,31 +19,47 @@ if not firebase_admin._apps:
         },
     )
 
+token_cache: TTLCache[str, Any] = TTLCache("firebase_tokens", max_entries=settings.cache_config.token_max_entries)
+public_key_store = FirebasePublicKeyStore(settings.firebase_config.public_keys_url)
 
-@lru_cache()
-def get_firebase_public_keys() -> Any:
-    response = requests.get(settings.firebase_config.public_keys_url)
-    if response.status_code != 200:
-        raise HTTPException(status_code=500, detail="Unable to fetch Firebase public keys.")
-    return response.json()
+
+def get_token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_token_claims(token: str) -> Any | None:
+    """Return the claims of an already verified token, without blocking, or None."""
+    return token_cache.get(get_token_digest(token))
 
 
 def verify_firebase_token(token: str) -> Any:
+    cached_token = get_cached_token_claims(token)
+    if cached_token is not None:
+        return cached_token
+
     try:
-        if jwt.get_unverified_header(token).get("kid") not in get_firebase_public_keys():
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != "RS256":
             raise HTTPException(status_code=401, detail="Incorrect token.")
 
-        decoded_token = id_token.verify_firebase_token(
-            token, google_requests.Request(), settings.firebase_config.project_id
+        project_id = settings.firebase_config.project_id
+        decoded_token = jwt.decode(
+            token,
+            public_key_store.get_key(header.get("kid")),
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+            options={"require": ["exp", "iat", "sub"]},
         )
 
-        if not decoded_token:
+        if not decoded_token.get("sub"):
             raise HTTPException(status_code=401, detail="Incorrect Firebase token.")
-
-        return decoded_token
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Unable to authenticate: {str(e)}.")
 
+    token_cache.set(get_token_digest(token), decoded_token, expires_at=decoded_token["exp"])
+    return decoded_token
+
 
 def create_firebase_user(email: str, password: str) -> Any | str:
     try:
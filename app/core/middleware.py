@@ -1,46 +1,76 @@
-from typing import Any, Callable
+from typing import Any
 
-from fastapi import HTTPException, Request
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.core.database import get_database_ref
-from app.core.firebase_auth import verify_firebase_token
+from app.core.database import get_database_ref, run_in_database_executor
+from app.core.firebase_auth import get_cached_token_claims, verify_firebase_token
+from app.core.user_cache import cache_user, get_cached_user
 from app.models.collection_names import CollectionNames
 from app.models.user import PersistedUser, User, UserRole
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Any:
-        if request.method == "OPTIONS":
-            return await call_next(request)
 
-        if request.url.path.startswith("/docs") or request.url.path.startswith("/openapi.json"):
-            return await call_next(request)
+class AuthMiddleware:
+    """Pure ASGI authentication layer.
 
-        auth_header = request.headers.get("Authorization")
+    Unlike `BaseHTTPMiddleware` it does not wrap the response in an extra task and stream, so it adds no
+    per-request overhead beyond the token check itself.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path.startswith("/docs") or path.startswith("/openapi.json"):
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = Headers(scope=scope).get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "No Bearer token. Unauthorized."}
-            )
+            response = JSONResponse(status_code=401, content={"detail": "No Bearer token. Unauthorized."})
+            await response(scope, receive, send)
+            return
 
         token = auth_header.split("Bearer ")[1]
-        try:
-            user = verify_firebase_token(token)
-            request.state.user = self.persist_user_to_database(user)
-        except HTTPException as e:
-            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
-        response = await call_next(request)
-        return response
-
-    def persist_user_to_database(self, user: Any) -> User:
-        db_ref = get_database_ref()
+        # A token seen before is a cache lookup, only verifying a new one needs a database executor thread.
+        claims = get_cached_token_claims(token)
+        if claims is None:
+            try:
+                claims = await run_in_database_executor(verify_firebase_token, token)
+            except HTTPException as e:
+                response = JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+                await response(scope, receive, send)
+                return
+
+        # The profile is loaded lazily by `get_current_user`, so routes that only need the uid skip Firestore.
+        state = scope.setdefault("state", {})
+        state["token_claims"] = claims
+        state["user_id"] = claims.get("user_id")
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def persist_user_to_database(user: Any) -> User:
         user_id = user.get("user_id")
+        cached_user = get_cached_user(user_id)
+        if cached_user is not None:
+            return cached_user
+
+        db_ref = get_database_ref()
         user_doc = db_ref.collection(CollectionNames.USERS).document(user_id).get()
 
         if not user_doc.exists:
             persisted_user = PersistedUser(**user, role=UserRole.CUSTOMER)
             db_ref.collection(CollectionNames.USERS).document(user_id).set(persisted_user.model_dump())
-            return User(**persisted_user.model_dump(), id=user_id)
+            result = User(**persisted_user.model_dump(), id=user_id)
+        else:
+            result = User(**user_doc.to_dict(), id=user_id)
 
-        return User(**user_doc.to_dict(), id=user_id)
+        cache_user(result)
+        return result
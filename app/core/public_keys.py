@@ -0,0 +1,108 @@
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable
+
+import requests
+from cryptography.x509 import load_pem_x509_certificate
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class FirebasePublicKeyStore:
+    """Cache of the Firebase token signing keys that follows the rotation announced by Google.
+
+    Keys are kept for the `Cache-Control: max-age` of the certificate endpoint and refreshed in a background
+    thread shortly before they expire, so token verification does not hit the network in the steady state.
+    An unknown `kid` forces one synchronous re-fetch, rate limited to protect the endpoint from forged tokens.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        refresh_margin_seconds: float = 300,
+        default_max_age_seconds: float = 3600,
+        min_refetch_interval_seconds: float = 60,
+        request_timeout_seconds: float = 10,
+        session: requests.Session | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.url = url
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.default_max_age_seconds = default_max_age_seconds
+        self.min_refetch_interval_seconds = min_refetch_interval_seconds
+        self.request_timeout_seconds = request_timeout_seconds
+        self._session = session or requests.Session()
+        self._clock = clock
+        self._keys: dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch_at = float("-inf")
+        self._fetch_lock = threading.Lock()
+        self._background_refresh: threading.Thread | None = None
+
+    def get_key(self, kid: str | None) -> Any:
+        now = self._clock()
+
+        if now >= self._expires_at:
+            try:
+                self._refresh_if_stale(lambda: self._clock() >= self._expires_at)
+            except Exception as e:
+                if not self._keys:
+                    raise
+                logger.warning(f"Refresh of Firebase public keys failed, using previous keys: {e}")
+        elif now >= self._expires_at - self.refresh_margin_seconds:
+            self._schedule_background_refresh()
+
+        key = self._keys.get(kid) if kid is not None else None
+        if key is None and kid is not None:
+            self._refresh_if_stale(
+                lambda: kid not in self._keys
+                and self._clock() - self._last_fetch_at >= self.min_refetch_interval_seconds
+            )
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise HTTPException(status_code=401, detail="Incorrect token.")
+
+        return key
+
+    def refresh(self) -> None:
+        response = self._session.get(self.url, timeout=self.request_timeout_seconds)
+        if response.status_code != 200:
+            raise HTTPException(status_code=500, detail="Unable to fetch Firebase public keys.")
+
+        keys = {
+            kid: load_pem_x509_certificate(certificate.encode()).public_key()
+            for kid, certificate in response.json().items()
+        }
+
+        now = self._clock()
+        self._keys = keys
+        self._expires_at = now + self._parse_max_age(response.headers.get("Cache-Control", ""))
+        self._last_fetch_at = now
+
+    def _refresh_if_stale(self, is_stale: Callable[[], bool]) -> None:
+        with self._fetch_lock:
+            if is_stale():
+                self.refresh()
+
+    def _schedule_background_refresh(self) -> None:
+        if self._background_refresh is not None and self._background_refresh.is_alive():
+            return
+
+        self._background_refresh = threading.Thread(target=self._refresh_in_background, daemon=True)
+        self._background_refresh.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh_if_stale(lambda: self._clock() >= self._expires_at - self.refresh_margin_seconds)
+        except Exception as e:
+            logger.warning(f"Background refresh of Firebase public keys failed: {e}")
+
+    def _parse_max_age(self, cache_control: str) -> float:
+        match = _MAX_AGE_PATTERN.search(cache_control)
+        return float(match.group(1)) if match else self.default_max_age_seconds
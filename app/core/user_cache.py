@@ -0,0 +1,31 @@
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.user import User
+
+user_cache: TTLCache[str, User] = TTLCache(
+    "users",
+    max_entries=settings.cache_config.user_max_entries,
+    ttl_seconds=settings.cache_config.user_ttl_seconds,
+)
+
+
+def _copy_user(user: User) -> User:
+    return user.model_copy(update={"special_offers": list(user.special_offers)})
+
+
+def get_cached_user(user_id: str) -> User | None:
+    user = user_cache.get(user_id)
+    return _copy_user(user) if user is not None else None
+
+
+def cache_user(user: User) -> None:
+    user_cache.set(user.id, _copy_user(user))
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user profile from the cache after a write that changed the `users` document.
+
+    Args:
+        user_id (str): The ID of the changed user.
+    """
+    user_cache.invalidate(user_id)
@@ -0,0 +1,80 @@
+"""Rebuild the order rollups from the orders collection.
+
+Usage:
+    PYTHONPATH=. python -m app.jobs.backfill_order_rollups [--restaurant-id ID]
+
+Run it once after deploying rollups, or to repair them. Transitions committed while the job runs
+may be counted twice or lost, so run it when the restaurants are closed.
+"""
+
+import argparse
+import logging
+
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.models.collection_names import CollectionNames
+from app.models.order import PersistedOrder
+from app.services.orders.rollups import ROLLUP_STATUSES, RollupKey, add_order_to_rollups, get_rollup_ref, write_rollups
+from app.services.shared.batching import chunked
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def backfill_order_rollups(db_ref: firestore.Client, restaurant_id: str | None = None) -> int:
+    """Recompute rollups from every paid order and replace the stored ones.
+
+    Stored rollups that no longer match any order are deleted.
+
+    Args:
+        db_ref (firestore.Client): The Firestore client.
+        restaurant_id (str | None): Only rebuild the rollups of this restaurant.
+
+    Returns:
+        int: Number of rollups written.
+    """
+    orders_query = db_ref.collection(CollectionNames.ORDERS).where(filter=FieldFilter("status", "in", ROLLUP_STATUSES))
+    rollups_query = db_ref.collection(CollectionNames.ORDER_ROLLUPS)
+    if restaurant_id is not None:
+        restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+        orders_query = orders_query.where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
+        rollups_query = rollups_query.where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
+
+    rollups: dict[RollupKey, dict] = {}
+    for order_doc in orders_query.stream():
+        add_order_to_rollups(rollups, PersistedOrder(**order_doc.to_dict()), None)
+
+    rebuilt_paths = {get_rollup_ref(db_ref, key).path for key in rollups}
+    stale_refs = [doc.reference for doc in rollups_query.select([]).stream() if doc.reference.path not in rebuilt_paths]
+
+    for chunk in chunked(list(rollups.items()), BATCH_SIZE):
+        batch = db_ref.batch()
+        write_rollups(batch, db_ref, dict(chunk), increment=False)
+        batch.commit()
+
+    for chunk in chunked(stale_refs, BATCH_SIZE):
+        batch = db_ref.batch()
+        for ref in chunk:
+            batch.delete(ref)
+        batch.commit()
+
+    logger.info(f"Wrote {len(rollups)} order rollups, deleted {len(stale_refs)} stale ones")
+    return len(rollups)
+
+
+def main() -> None:
+    # Importing the auth module initializes the Firebase app.
+    import app.core.firebase_auth  # noqa: F401
+
+    parser = argparse.ArgumentParser(description="Rebuild order rollups from existing orders.")
+    parser.add_argument("--restaurant-id", help="Only rebuild the rollups of this restaurant.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    backfill_order_rollups(firestore.client(), args.restaurant_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Recompute loyalty points balances from the points ledger.
+
+Usage:
+    PYTHONPATH=. python -m app.jobs.reconcile_points_balances [--open-balances] [--dry-run]
+
+Run it with `--open-balances` once when the ledger is introduced, to record every user's current
+balance as an opening entry. Later runs set every balance that drifted from its ledger back to the
+ledger sum.
+
+The job runs in its own process and cannot clear the API server's in-memory user cache. Corrected
+balances are served once cached users expire, after at most CACHE_USER_TTL_SECONDS.
+"""
+
+import argparse
+import logging
+from datetime import UTC, datetime
+
+from firebase_admin import firestore  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.models.points_ledger import PointsLedgerEntry, PointsLedgerReason
+from app.services.shared.batching import chunked
+from app.services.users.points_ledger import get_ledger_entry_ref, reconcile_user_balance, sum_ledger
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def read_balances(db_ref: firestore.Client) -> tuple[dict[str, int], dict[str, int], set[str]]:
+    """Read the stored balances, the ledger sums and the users with an opening entry in bulk."""
+    user_docs = db_ref.collection(CollectionNames.USERS).select(["points"]).stream()
+    stored = {doc.id: doc.to_dict().get("points", 0) for doc in user_docs}
+
+    entries = list(db_ref.collection(CollectionNames.POINTS_LEDGER).select(["user_id", "delta", "reason"]).stream())
+    opened = {
+        entry.to_dict()["user_id"]
+        for entry in entries
+        if entry.to_dict().get("reason") == PointsLedgerReason.OPENING_BALANCE.value
+    }
+
+    return stored, sum_ledger(entries), opened
+
+
+def open_balances(db_ref: firestore.Client, dry_run: bool = False) -> int:
+    """Record the part of every balance that is not explained by the ledger as an opening entry.
+
+    Users that already have an opening entry are skipped.
+
+    Returns:
+        int: Number of opening entries written.
+    """
+    stored, ledger, opened = read_balances(db_ref)
+    now = datetime.now(UTC)
+    entries = [
+        PointsLedgerEntry(
+            user_id=user_id,
+            reason=PointsLedgerReason.OPENING_BALANCE,
+            delta=points - ledger.get(user_id, 0),
+            created_at=now,
+        )
+        for user_id, points in stored.items()
+        if user_id not in opened and points != ledger.get(user_id, 0)
+    ]
+
+    if not dry_run:
+        for chunk in chunked(entries, BATCH_SIZE):
+            batch = db_ref.batch()
+            for entry in chunk:
+                batch.set(get_ledger_entry_ref(db_ref, entry.user_id, entry.reason), entry.model_dump())
+            batch.commit()
+
+    logger.info(f"Opened {len(entries)} points balances")
+    return len(entries)
+
+
+def reconcile_points_balances(db_ref: firestore.Client, dry_run: bool = False) -> dict[str, tuple[int, int]]:
+    """Set every balance that differs from the sum of its ledger entries to that sum.
+
+    All balances and ledger entries are compared in bulk, and only drifted users are corrected,
+    each in its own transaction that re-reads their entries.
+
+    Returns:
+        dict[str, tuple[int, int]]: Drifted users mapped to their stored balance and ledger sum.
+    """
+    stored, ledger, _ = read_balances(db_ref)
+    drifted = {
+        user_id: (points, ledger.get(user_id, 0))
+        for user_id, points in stored.items()
+        if points != ledger.get(user_id, 0)
+    }
+
+    for user_id, (points, balance) in drifted.items():
+        logger.warning(f"Points balance of user {user_id} is {points}, ledger sum is {balance}")
+        if not dry_run:
+            reconcile_user_balance(user_id, db_ref)
+
+    logger.info(f"Reconciled {len(drifted)} of {len(stored)} points balances")
+    return drifted
+
+
+def main() -> None:
+    # Importing the auth module initializes the Firebase app.
+    import app.core.firebase_auth  # noqa: F401
+
+    parser = argparse.ArgumentParser(description="Recompute loyalty points balances from the points ledger.")
+    parser.add_argument("--open-balances", action="store_true", help="Record current balances as opening entries.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report differences.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.open_balances:
+        open_balances(firestore.client(), args.dry_run)
+    else:
+        reconcile_points_balances(firestore.client(), args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 from fastapi import Depends, FastAPI
+from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 
 from app.core.middleware import AuthMiddleware
 from app.routers.dishes import mobile as dishes_mobile
 from app.routers.dishes import panel as dishes_panel
+from app.routers.metrics import panel as metrics_panel
+from app.routers.opinions import mobile as opinions_mobile
 from app.routers.orders import mobile as orders_mobile
 from app.routers.orders import panel as orders_panel
 from app.routers.orders import worker_panel as orders_worker_panel
@@ -15,8 +18,7 @@ from app.routers.special_offers import panel as special_offers_panel
 from app.routers.users import mobile as users_mobile
 from app.routers.workers import panel as workers_panel
 from app.routers.workers import worker_panel as worker_panel
-from app.routers.opinions import mobile as opinions_mobile
-from fastapi.middleware.cors import CORSMiddleware
+
 security_scheme = HTTPBearer()
 
 app = FastAPI(
@@ -49,3 +51,4 @@ app.include_router(dishes_panel.router)
 app.include_router(restaurant_dishes_panel.router)
 app.include_router(users_mobile.router)
 app.include_router(opinions_mobile.router)
+app.include_router(metrics_panel.router)
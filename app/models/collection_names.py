@@ -4,8 +4,10 @@ from enum import Enum
 class CollectionNames(str, Enum):
     DISHES = "dishes"
     ORDERS = "orders"
+    ORDER_ROLLUPS = "order_rollups"
     RESTAURANTS = "restaurants"
     RESTAURANT_DISHES = "restaurant_dishes"
     SPECIAL_OFFERS = "special_offers"
     USERS = "users"
     OPINIONS = "opinions"
+    POINTS_LEDGER = "points_ledger"
@@ -2,10 +2,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Annotated, Dict, Optional
 
-from firebase_admin import firestore  # type: ignore
 from pydantic import BaseModel, NonNegativeInt, PositiveInt
 
-from app.models.collection_names import CollectionNames
 from app.models.firestore_ref import FirestoreRef
 from app.models.user import User
 
@@ -45,6 +43,17 @@ class TransitionOrderStatusPayload(BaseModel):
     status: OrderStatus
 
 
+class BulkTransitionOrderStatusPayload(BaseModel):
+    ids: list[str]
+    status: OrderStatus
+
+
+class OrderTransitionResult(BaseModel):
+    id: str
+    status: Optional[OrderStatus] = None
+    error: Optional[str] = None
+
+
 class PersistedOrder(BaseModel):
     user_id: str
     order_items: Dict[str, PositiveInt]
@@ -58,16 +67,13 @@ class PersistedOrder(BaseModel):
     restaurant_id: Annotated[FirestoreRef, ...]
     payment_method: str = ""
 
-    def finalize_users_loyalty_points(
-        self, user: User, loyalty_points_used: int, loyalty_points_gained: int, db_ref: firestore.Client
-    ) -> None:
-        if loyalty_points_used == 0:
-            return
-        self.points_used = min(loyalty_points_used, user.points, int(self.total_price_including_special_offers))
-        user.points -= self.points_used
-        user.points += loyalty_points_gained
+    def finalize_users_loyalty_points(self, user: User, loyalty_points_used: int, loyalty_points_gained: int) -> None:
+        """Spend the user's loyalty points on this order and credit the points it earns.
 
-        db_ref.collection(CollectionNames.USERS).document(user.id).update({"points": user.points})
+        Only the order and the in-memory user are changed, the caller persists the balance change.
+        """
+        self.points_used = min(loyalty_points_used, user.points, int(self.total_price_including_special_offers))
+        user.points += loyalty_points_gained - self.points_used
 
 
 class Order(BaseModel):
@@ -83,3 +89,22 @@ class Order(BaseModel):
     updated_at: datetime
     restaurant_id: str
     payment_method: str = ""
+
+
+class OrderSummary(BaseModel):
+    id: Optional[str] = None
+    user_id: str
+    total_price: float
+    total_price_including_special_offers: float
+    status: OrderStatus = OrderStatus.CHECKOUT
+    points_used: NonNegativeInt = 0
+    points_gained: NonNegativeInt = 0
+    created_at: datetime
+    updated_at: datetime
+    restaurant_id: str
+    payment_method: str = ""
+
+
+class OrderPage(BaseModel):
+    orders: list[Order | OrderSummary]
+    next_cursor: Optional[str] = None
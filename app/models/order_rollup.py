@@ -0,0 +1,22 @@
+from datetime import datetime
+from enum import Enum
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class RollupPeriod(str, Enum):
+    DAY = "day"
+    HOUR = "hour"
+
+
+class OrderRollup(BaseModel):
+    restaurant_id: str
+    period: RollupPeriod
+    start: datetime
+    order_count: int = 0
+    total_price: float = 0
+    total_price_including_special_offers: float = 0
+    points_used: int = 0
+    points_gained: int = 0
+    status_counts: Dict[str, int] = {}
@@ -0,0 +1,19 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PointsLedgerReason(str, Enum):
+    OPENING_BALANCE = "opening_balance"
+    ORDER_SPENT = "order_spent"
+    ORDER_EARNED = "order_earned"
+
+
+class PointsLedgerEntry(BaseModel):
+    user_id: str
+    order_id: Optional[str] = None
+    reason: PointsLedgerReason
+    delta: int
+    created_at: datetime
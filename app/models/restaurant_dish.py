@@ -6,7 +6,14 @@ from app.models.firestore_ref import FirestoreRef
 
 
 class RestaurantDish(BaseModel):
+    """A dish on the menu of a restaurant.
+
+    When `stock_shards` is greater than 0 the stock is split over that many documents in the
+    `stock_shards` subcollection and `stock_count` only holds the total from the last rebalance.
+    """
+
     dish_id: Annotated[FirestoreRef, ...]
     restaurant_id: Annotated[FirestoreRef, ...]
     is_available: bool
     stock_count: int
+    stock_shards: int = 0
@@ -1,11 +1,9 @@
-from fastapi import APIRouter, Depends, Response, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Header, Response, status
 from firebase_admin import firestore  # type: ignore
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
-from app.models.dish import Dish
+from app.core.database import get_database_ref, run_in_database_executor
+from app.services.dishes.menu_cache import build_menu, get_cached_menu
+from app.services.shared.etag import etag_matches
 from app.services.shared.request_handler import handle_request_errors
 
 router = APIRouter(
@@ -18,11 +16,14 @@ router = APIRouter(
 @handle_request_errors
 async def get_available_dishes(
     restaurant_id: str,
+    if_none_match: str | None = Header(default=None),
     db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
     """Get all available dishes for a given restaurant.
 
     Filters to dishes where `is_available == True` and `stock_count > 0`.
+    The menu is cached per restaurant and served with a strong `ETag`; a matching `If-None-Match`
+    gets `304 Not Modified` without touching Firestore.
 
     Args:
         restaurant_id (str): The ID of the restaurant.
@@ -32,32 +33,12 @@ async def get_available_dishes(
                   each including its `name`, `description`, `price`,
                   plus `stock_count` and `is_available` from the join record.
     """
-    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
-
-    rd_stream = (
-        db_ref.collection(CollectionNames.RESTAURANT_DISHES)
-        .where("restaurant_id", "==", restaurant_ref)
-        .where("is_available", "==", True)
-        .where("stock_count", ">", 0)
-        .stream()
-    )
-
-    result = []
-    for rd_doc in rd_stream:
-        rd = rd_doc.to_dict()
-        dish_ref = rd["dish_id"]
-        dish_doc = dish_ref.get()
-        if not dish_doc.exists:
-            continue
-
-        dish_data = dish_doc.to_dict()
-        dish_data["price"] = dish_data["base_price"]
-        dish_data["id"] = dish_doc.id
-        dish_payload = {
-            **jsonable_encoder(Dish(**dish_data)),
-            "stock_count": rd["stock_count"],
-            "is_available": rd["is_available"],
-        }
-        result.append(dish_payload)
-
-    return JSONResponse(content=result, status_code=status.HTTP_200_OK)
+    menu = get_cached_menu(restaurant_id)
+    if menu is None:
+        menu = await run_in_database_executor(build_menu, restaurant_id, db_ref)
+
+    headers = {"ETag": menu.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, menu.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=menu.body, media_type="application/json", headers=headers)
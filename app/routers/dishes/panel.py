@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
+from app.core.database import get_database_ref, run_in_database_executor
 from app.models.dish import Dish
+from app.services.dishes.panel import create_dish, get_all_dishes, get_dish, remove_dish, replace_dish
 from app.services.shared.request_handler import handle_request_errors
 
 router = APIRouter(
@@ -25,12 +25,7 @@ async def get_dish_by_id(dish_id: str, db_ref: firestore.Client = Depends(get_da
     Returns:
         Response: FastAPI response with the dish data.
     """
-    doc = db_ref.collection(CollectionNames.DISHES).document(dish_id).get()
-    if not doc.exists:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
-    data = doc.to_dict()
-    data["price"] = data.pop("base_price")
-    dish = Dish(**data)
+    dish = await run_in_database_executor(get_dish, dish_id, db_ref)
     return JSONResponse(content=jsonable_encoder(dish), status_code=status.HTTP_200_OK)
 
 
@@ -42,12 +37,7 @@ async def list_dishes(db_ref: firestore.Client = Depends(get_database_ref)) -> R
     Returns:
         Response: FastAPI response with a list of all dishes.
     """
-    docs = db_ref.collection(CollectionNames.DISHES).get()
-    dishes = []
-    for doc in docs:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        dishes.append(data)
+    dishes = await run_in_database_executor(get_all_dishes, db_ref)
     return JSONResponse(content=jsonable_encoder(dishes), status_code=status.HTTP_200_OK)
 
 
@@ -62,9 +52,7 @@ async def add_dish(dish: Dish, db_ref: firestore.Client = Depends(get_database_r
     Returns:
         Response: FastAPI response with the added dish data, including generated ID.
     """
-    dish_dict = dish.model_dump(exclude={"id"})
-    write_time, doc_ref = db_ref.collection(CollectionNames.DISHES).add(dish_dict)
-    created = {**dish_dict, "id": doc_ref.id}
+    created = await run_in_database_executor(create_dish, dish, db_ref)
     return JSONResponse(content=jsonable_encoder(created), status_code=status.HTTP_201_CREATED)
 
 
@@ -80,11 +68,7 @@ async def update_dish(dish_id: str, dish: Dish, db_ref: firestore.Client = Depen
     Returns:
         Response: FastAPI response with the updated dish data.
     """
-    dish_dict = dish.model_dump()
-    doc_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
-    if not doc_ref.get().exists:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
-    doc_ref.set(dish_dict)
+    dish_dict = await run_in_database_executor(replace_dish, dish_id, dish, db_ref)
     return JSONResponse(content=jsonable_encoder(dish_dict), status_code=status.HTTP_200_OK)
 
 
@@ -99,8 +83,5 @@ async def delete_dish(dish_id: str, db_ref: firestore.Client = Depends(get_datab
     Returns:
         Response: FastAPI response with a confirmation message.
     """
-    doc_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
-    if not doc_ref.get().exists:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
-    doc_ref.delete()
+    await run_in_database_executor(remove_dish, dish_id, db_ref)
     return JSONResponse(content={"message": "Dish deleted successfully"}, status_code=status.HTTP_200_OK)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import JSONResponse
+
+from app.core.cache import cache_stats
+from app.models.user import UserRole
+from app.services.shared.request_handler import handle_request_errors
+from app.services.shared.user_role_handler import role_required
+
+router = APIRouter(
+    prefix="/metrics/panel",
+    tags=["admin panel metrics"],
+    dependencies=[Depends(role_required(UserRole.ADMIN))],
+)
+
+
+@router.get("/cache")
+@handle_request_errors
+async def get_cache_stats() -> Response:
+    """Get hit, miss and eviction counters of the in-process caches.
+
+    Returns:
+        Response: FastAPI response with counters keyed by cache name.
+    """
+    return JSONResponse(content=cache_stats(), status_code=status.HTTP_200_OK)
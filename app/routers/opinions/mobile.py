@@ -3,12 +3,10 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
-from app.models.opinion import Opinion, OpinionCreate
+from app.core.database import get_database_ref, run_in_database_executor
+from app.models.opinion import OpinionCreate
+from app.services.opinions.mobile import create_opinion, get_opinions, remove_opinion, replace_opinion
 from app.services.shared.request_handler import handle_request_errors
-from app.models.firestore_ref import FirestoreRef
-from datetime import UTC, datetime
 
 router = APIRouter(
     prefix="/opinion/mobile",
@@ -24,13 +22,7 @@ async def get_all_opinions(db_ref: firestore.Client = Depends(get_database_ref))
     Returns:
         dict: A dictionary containing all opinions.
     """
-    opinion_docs = db_ref.collection(CollectionNames.OPINIONS).stream()
-
-    opinions = []
-    for doc in opinion_docs:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        opinions.append(Opinion(**data))
+    opinions = await run_in_database_executor(get_opinions, db_ref)
 
     json_compatible_docs = jsonable_encoder(opinions)
 
@@ -42,18 +34,7 @@ async def get_all_opinions(db_ref: firestore.Client = Depends(get_database_ref))
 async def add_opinion(opinion_data: OpinionCreate, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
     """Add an opinion with created_at and string IDs from frontend."""
 
-    opinion = Opinion(
-        restaurant_id=FirestoreRef(db_ref.collection(CollectionNames.RESTAURANTS).document(opinion_data.restaurant_id)),
-        user_id=FirestoreRef(db_ref.collection(CollectionNames.USERS).document(opinion_data.user_id)),
-        dish_id=FirestoreRef(db_ref.collection(CollectionNames.DISHES).document(opinion_data.dish_id)),
-        rating=opinion_data.rating,
-        comment=opinion_data.comment,
-        created_at=datetime.now(UTC)
-    )
-
-    opinion_dict = opinion.model_dump(exclude={"id"})
-    _, opinion_doc = db_ref.collection(CollectionNames.OPINIONS).add(opinion_dict)
-    opinion_with_id = opinion.model_copy(update={"id": opinion_doc.id})
+    opinion_with_id = await run_in_database_executor(create_opinion, opinion_data, db_ref)
 
     return JSONResponse(content=jsonable_encoder(opinion_with_id), status_code=status.HTTP_201_CREATED)
 
@@ -68,27 +49,9 @@ async def update_opinion(
     Returns:
         dict: A dictionary containing updated opinion
     """
-    doc_ref = db_ref.collection(CollectionNames.OPINIONS).document(opinion_id)
-    existing_doc = doc_ref.get()
-    if not existing_doc.exists:
+    opinion_with_id = await run_in_database_executor(replace_opinion, opinion_id, opinion_data, db_ref)
+    if opinion_with_id is None:
         return JSONResponse(content={"error": "Opinion not found"}, status_code=status.HTTP_404_NOT_FOUND)
-    
-    existing_data = existing_doc.to_dict()
-    created_at = existing_data.get("created_at")
-
-    opinion = Opinion(
-        id=opinion_id,
-        restaurant_id=FirestoreRef(db_ref.collection(CollectionNames.RESTAURANTS).document(opinion_data.restaurant_id)),
-        user_id=FirestoreRef(db_ref.collection(CollectionNames.USERS).document(opinion_data.user_id)),
-        dish_id=FirestoreRef(db_ref.collection(CollectionNames.DISHES).document(opinion_data.dish_id)),
-        rating=opinion_data.rating,
-        comment=opinion_data.comment,
-        created_at=created_at
-    )
-
-    opinion_dict = opinion.model_dump(exclude={"id"})
-    doc_ref.set(opinion_dict)
-    opinion_with_id = opinion.model_copy(update={"id": opinion_id})
 
     return JSONResponse(content=jsonable_encoder(opinion_with_id), status_code=status.HTTP_201_CREATED)
 
@@ -101,6 +64,6 @@ async def delete_opinion(opinion_id: str, db_ref: firestore.Client = Depends(get
     Returns:
         dict: A dictionary containing deleted opinion
     """
-    db_ref.collection(CollectionNames.OPINIONS).document(opinion_id).delete()
+    await run_in_database_executor(remove_opinion, opinion_id, db_ref)
 
     return JSONResponse(content={"message": "Opinion deleted successfully"}, status_code=status.HTTP_200_OK)
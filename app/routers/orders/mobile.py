@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, Request, Response, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 from firebase_admin import firestore  # type: ignore
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
-from app.models.order import (CreateOrderPayload, Order, PayForOrderPayload,
-                              UpdateOrderPayload)
-from app.services.orders.mobile import (create_order,
-                                        transition_order_to_payment,
-                                        update_order_items,
-                                        users_order_history)
-from app.services.orders.shared import check_order_validity_and_ownership
+from app.core.database import get_database_ref, run_in_database_executor
+from app.models.order import CreateOrderPayload, PayForOrderPayload, UpdateOrderPayload
+from app.models.user import User
+from app.services.orders.mobile import (
+    create_order,
+    transition_order_to_payment,
+    update_order_items,
+    users_order_history,
+)
+from app.services.orders.serialization import order_to_json
+from app.services.orders.shared import check_order_validity_and_ownership, persist_order
+from app.services.orders.status_stream import order_status_events
+from app.services.shared.current_user import get_current_user, get_current_user_id
+from app.services.shared.idempotency import StoredResponse, run_idempotent
+from app.services.shared.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.services.shared.request_handler import handle_request_errors
+from app.services.shared.responses import RawJSONResponse
+from app.services.shared.sse import SSE_HEADERS
 
 router = APIRouter(
     prefix="/order/mobile",
@@ -23,85 +32,126 @@ router = APIRouter(
 @handle_request_errors
 @router.post("/create")
 async def create(
-    order_data: CreateOrderPayload, request: Request, db_ref: firestore.Client = Depends(get_database_ref)
+    order_data: CreateOrderPayload,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    user: User = Depends(get_current_user),
+    db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
     """Create an order.
 
+    A retry with the same `Idempotency-Key` gets the order created by the first request.
+
     Returns:
         dict: A dictionary containing newly created order
     """
 
-    persisted_order = create_order(order_data, request.state.user, db_ref)
-    persisted_order_dict = persisted_order.model_dump()
-    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-    order = Order(**persisted_order_dict)
-    _, order_doc = db_ref.collection(CollectionNames.ORDERS).add(persisted_order.model_dump())
-    order.id = order_doc.id
+    async def create_and_persist() -> StoredResponse:
+        persisted_order = await run_in_database_executor(create_order, order_data, user, db_ref)
+        order_id = await run_in_database_executor(persist_order, persisted_order, db_ref)
+        return StoredResponse(status.HTTP_201_CREATED, order_to_json(persisted_order, order_id))
 
-    return JSONResponse(content=jsonable_encoder(order.model_dump()), status_code=status.HTTP_201_CREATED)
+    response = await run_idempotent("order_create", user.id, idempotency_key, order_data, create_and_persist)
+
+    return RawJSONResponse(content=response.content, status_code=response.status_code)
 
 
 @handle_request_errors
 @router.post("/update")
 async def update(
-    order_data: UpdateOrderPayload, request: Request, db_ref: firestore.Client = Depends(get_database_ref)
+    order_data: UpdateOrderPayload,
+    user: User = Depends(get_current_user),
+    db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
     """Update an order.
 
     Returns:
         dict: A dictionary containing updated order
     """
-    persisted_order = update_order_items(order_data, request.state.user, db_ref)
-    persisted_order_dict = persisted_order.model_dump()
-    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-    order = Order(**persisted_order_dict, id=order_data.id)
-    db_ref.collection(CollectionNames.ORDERS).document(order_data.id).set(persisted_order.model_dump())
+    persisted_order = await run_in_database_executor(update_order_items, order_data, user, db_ref)
+    await run_in_database_executor(persist_order, persisted_order, db_ref, order_data.id)
 
-    return JSONResponse(content=jsonable_encoder(order.model_dump()), status_code=status.HTTP_201_CREATED)
+    return RawJSONResponse(content=order_to_json(persisted_order, order_data.id), status_code=status.HTTP_201_CREATED)
 
 
 @handle_request_errors
 @router.get("/history")
-async def get_users_order_history(request: Request, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
-    """Get users order history
+async def get_users_order_history(
+    page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    user_id: str = Depends(get_current_user_id),
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+    """Get users order history, newest orders first
+
+    Args:
+        page_size (int): Number of orders per page.
+        cursor (str | None): `next_cursor` of the previous page, omitted for the first page.
+        summary (bool): Leave out `order_items` from every order.
 
     Returns:
-        dict[]: a list of orders made by authenticated user, that are in different state than checkout
+        dict: orders made by authenticated user that are in different state than checkout,
+              and `next_cursor`, which is null on the last page
     """
-    orders = users_order_history(request.state.user, db_ref)
+    page = await run_in_database_executor(users_order_history, user_id, db_ref, page_size, cursor, summary)
+
+    return RawJSONResponse(content=page.model_dump_json().encode("utf-8"), status_code=status.HTTP_201_CREATED)
+
+
+@handle_request_errors
+@router.get("/status/stream")
+async def stream_order_statuses(
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    user_id: str = Depends(get_current_user_id),
+) -> Response:
+    """Stream status changes of the authenticated user's orders as Server-Sent Events
+
+    Replaces polling `/{order_id}`. A reconnecting client sends `Last-Event-ID` and gets the events it
+    missed, or a `resync` event if they are no longer available.
 
-    return JSONResponse(
-        content=[jsonable_encoder(order.model_dump()) for order in orders], status_code=status.HTTP_201_CREATED
+    Returns:
+        Response: `status` events with the order `id`, `status` and `updated_at`
+    """
+    return StreamingResponse(
+        order_status_events(user_id, last_event_id), media_type="text/event-stream", headers=SSE_HEADERS
     )
 
 
 @handle_request_errors
 @router.get("/{order_id}")
 async def get_single_order(
-    order_id: str, request: Request, db_ref: firestore.Client = Depends(get_database_ref)
+    order_id: str, user: User = Depends(get_current_user), db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     """Get a single order.
 
     Returns:
         dict: A dictionary containing order with specified order id
     """
-    persisted_order = check_order_validity_and_ownership(order_id, None, request.state.user, db_ref)
-    persisted_order_dict = persisted_order.model_dump()
-    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-    order = Order(**persisted_order_dict, id=order_id)
+    persisted_order = await run_in_database_executor(check_order_validity_and_ownership, order_id, None, user, db_ref)
 
-    return JSONResponse(content=jsonable_encoder(order.model_dump()), status_code=status.HTTP_201_CREATED)
+    return RawJSONResponse(content=order_to_json(persisted_order, order_id), status_code=status.HTTP_201_CREATED)
 
 
 @handle_request_errors
 @router.post("/pay")
 async def pay_for_order(
-    order_data: PayForOrderPayload, request: Request, db_ref: firestore.Client = Depends(get_database_ref)
+    order_data: PayForOrderPayload,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    user: User = Depends(get_current_user),
+    db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
-    persisted_order = transition_order_to_payment(order_data, request.state.user, db_ref)
-    persisted_order_dict = persisted_order.model_dump()
-    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-    order = Order(**persisted_order_dict, id=order_data.id)
-    db_ref.collection(CollectionNames.ORDERS).document(order_data.id).set(persisted_order.model_dump())
+    """Pay for an order.
+
+    A retry with the same `Idempotency-Key` gets the response of the first request, without paying again.
+
+    Returns:
+        dict: A dictionary containing the paid order
+    """
+
+    async def pay() -> StoredResponse:
+        persisted_order = await run_in_database_executor(transition_order_to_payment, order_data, user, db_ref)
+        return StoredResponse(status.HTTP_201_CREATED, order_to_json(persisted_order, order_data.id))
+
+    response = await run_idempotent("order_pay", user.id, idempotency_key, order_data, pay)
 
-    return JSONResponse(content=jsonable_encoder(order.model_dump()), status_code=status.HTTP_201_CREATED)
+    return RawJSONResponse(content=response.content, status_code=response.status_code)
@@ -1,16 +1,21 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, Response, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from firebase_admin import firestore  # type: ignore
-from google.cloud.firestore_v1.base_query import FieldFilter
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
-from app.models.order import Order, PanelOrdersPayload, PersistedOrder
+from app.core.database import get_database_ref, run_in_database_executor
+from app.models.order import OrderStatus, PanelOrdersPayload
+from app.models.order_rollup import RollupPeriod
 from app.models.user import UserRole
+from app.services.orders.panel import build_orders_query, get_all_orders, stream_orders_ndjson
+from app.services.orders.rollups import get_order_rollups
+from app.services.orders.serialization import order_to_json
+from app.services.orders.shared import get_order_by_id
+from app.services.shared.pagination import decode_cursor
 from app.services.shared.request_handler import handle_request_errors
+from app.services.shared.responses import RawJSONResponse
 from app.services.shared.user_role_handler import role_required
 
 router = APIRouter(
@@ -26,23 +31,70 @@ async def all_orders(
     dep: Any = Depends(role_required(UserRole.ADMIN)),
     db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
-    order_docs = db_ref.collection(CollectionNames.ORDERS)
+    result = await run_in_database_executor(get_all_orders, filters, db_ref)
 
-    if filters.restaurant_id is not None:
-        restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(filters.restaurant_id)
-        order_docs = order_docs.where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
-    if filters.status is not None:
-        order_docs = order_docs.where(filter=FieldFilter("status", "==", filters.status))
+    return RawJSONResponse(content=result, status_code=status.HTTP_201_CREATED)
 
-    result = []
 
-    for doc in order_docs.stream():
-        persisted_order = PersistedOrder(**doc.to_dict())
-        persisted_order_dict = persisted_order.model_dump()
-        persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-        result.append(Order(**persisted_order_dict, id=doc.id).model_dump())
+@handle_request_errors
+@router.get("/export")
+async def export_orders(
+    restaurant_id: Optional[str] = None,
+    order_status: Optional[OrderStatus] = Query(default=None, alias="status"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    dep: Any = Depends(role_required(UserRole.ADMIN)),
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+    """Stream matching orders as NDJSON, newest first.
+
+    Orders are serialized as Firestore returns them, so memory stays flat however many orders match.
+
+    Args:
+        restaurant_id (str | None): Only orders of this restaurant.
+        order_status (OrderStatus | None): Only orders in this status.
+        created_from (datetime | None): Only orders created at or after this time.
+        created_to (datetime | None): Only orders created before this time.
+        cursor (str | None): `cursor` of the last received line, to resume an interrupted export.
+
+    Returns:
+        Response: One `{"order": {...}, "cursor": "..."}` line per order.
+    """
+    query = build_orders_query(db_ref, restaurant_id, order_status, created_from, created_to)
+    if cursor is not None:
+        # Reject a malformed cursor before the response starts streaming.
+        decode_cursor(cursor)
+
+    return StreamingResponse(stream_orders_ndjson(query, cursor), media_type="application/x-ndjson")
+
+
+@handle_request_errors
+@router.get("/rollups")
+async def order_rollups(
+    restaurant_id: str,
+    start_from: datetime,
+    start_to: datetime,
+    period: RollupPeriod = RollupPeriod.DAY,
+    dep: Any = Depends(role_required(UserRole.ADMIN)),
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+    """Get order counts, revenue and points of a restaurant per day or hour.
+
+    Reads only the rollup documents, which are kept up to date on every order status transition.
+
+    Args:
+        restaurant_id (str): The restaurant.
+        start_from (datetime): First period to include.
+        start_to (datetime): End of the range, exclusive.
+        period (RollupPeriod): `day` or `hour`, in UTC.
+
+    Returns:
+        dict[]: One rollup per period with paid orders, oldest first.
+    """
+    rollups = await run_in_database_executor(get_order_rollups, restaurant_id, period, start_from, start_to, db_ref)
 
-    return JSONResponse(content=jsonable_encoder(result), status_code=status.HTTP_201_CREATED)
+    return JSONResponse(content=[rollup.model_dump(mode="json") for rollup in rollups], status_code=status.HTTP_200_OK)
 
 
 @handle_request_errors
@@ -53,9 +105,5 @@ async def single_order(
     db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
 
-    doc = db_ref.collection(CollectionNames.ORDERS).document(order_id).get()
-    persisted_order = PersistedOrder(**doc.to_dict())
-    persisted_order_dict = persisted_order.model_dump()
-    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-    order = Order(**persisted_order_dict, id=doc.id)
-    return JSONResponse(content=jsonable_encoder(order), status_code=status.HTTP_201_CREATED)
+    persisted_order = await run_in_database_executor(get_order_by_id, order_id, db_ref)
+    return RawJSONResponse(content=order_to_json(persisted_order, order_id), status_code=status.HTTP_201_CREATED)
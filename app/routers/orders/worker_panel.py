@@ -1,19 +1,23 @@
 from typing import Any
 
-from fastapi import (APIRouter, Depends, HTTPException, Request, Response,
-                     status)
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from firebase_admin import firestore  # type: ignore
-from google.cloud.firestore_v1.base_query import FieldFilter
-
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
-from app.models.order import (Order, OrderStatus, PersistedOrder,
-                              TransitionOrderStatusPayload)
-from app.models.user import UserRole
-from app.services.orders.worker_panel import transition_order_status
+
+from app.core.database import get_database_ref, run_in_database_executor
+from app.models.order import BulkTransitionOrderStatusPayload, OrderStatus, TransitionOrderStatusPayload
+from app.models.user import User, UserRole
+from app.services.orders.kitchen_queue import kitchen_queue_events, subscribe_to_kitchen_queue
+from app.services.orders.serialization import order_to_json
+from app.services.orders.worker_panel import (
+    apply_order_status_transition,
+    bulk_transition_order_status,
+    get_restaurant_orders_with_status,
+)
+from app.services.shared.current_user import get_current_user
 from app.services.shared.request_handler import handle_request_errors
+from app.services.shared.responses import RawJSONResponse
+from app.services.shared.sse import SSE_HEADERS
 from app.services.shared.user_role_handler import role_required
 
 router = APIRouter(
@@ -26,13 +30,11 @@ router = APIRouter(
 @router.get("/{order_status}/all")
 async def all_orders_with_status(
     order_status: str,
-    request: Request,
+    user: User = Depends(get_current_user),
     dep: Any = Depends(role_required(UserRole.WORKER)),
     db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
-    order_docs = db_ref.collection(CollectionNames.ORDERS)
-
-    if request.state.user.restaurant_id is None:
+    if user.restaurant_id is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Worker is not assigned to any restaurant.",
@@ -45,34 +47,73 @@ async def all_orders_with_status(
             detail=f"{order_status} is not acceptable order status for this endpoint. Acceptable order statuses: {acceptable_order_statuses}",
         )
 
-    order_docs = order_docs.where(filter=FieldFilter("restaurant_id", "==", request.state.user.restaurant_id))
-    order_docs = order_docs.where(filter=FieldFilter("status", "==", order_status))
+    result = await run_in_database_executor(get_restaurant_orders_with_status, user.restaurant_id, order_status, db_ref)
 
-    result = []
+    return RawJSONResponse(content=result, status_code=status.HTTP_201_CREATED)
 
-    for doc in order_docs.stream():
-        persisted_order = PersistedOrder(**doc.to_dict())
-        persisted_order_dict = persisted_order.model_dump()
-        persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-        result.append(Order(**persisted_order_dict, id=doc.id).model_dump())
 
-    return JSONResponse(content=jsonable_encoder(result), status_code=status.HTTP_201_CREATED)
+@handle_request_errors
+@router.get("/queue/stream")
+async def stream_kitchen_queue(
+    user: User = Depends(get_current_user),
+    dep: Any = Depends(role_required(UserRole.WORKER)),
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+    """Stream the kitchen queue of the worker's restaurant as Server-Sent Events.
+
+    Replaces polling `/{order_status}/all`: one Firestore listener per restaurant feeds every
+    connected screen. The first `snapshot` event lists all paid, in progress and ready orders;
+    `added`, `modified` and `removed` events follow as the queue changes. The response starts only
+    once that snapshot is available, otherwise the request fails with 503.
+    """
+    if user.restaurant_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Worker is not assigned to any restaurant.",
+        )
+
+    subscriber, snapshot = await subscribe_to_kitchen_queue(user.restaurant_id, db_ref)
+
+    return StreamingResponse(
+        kitchen_queue_events(user.restaurant_id, subscriber, snapshot),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
 
 @handle_request_errors
 @router.post("/transition_status")
 async def transition_order_to_status(
     order_data: TransitionOrderStatusPayload,
-    request: Request,
+    user: User = Depends(get_current_user),
+    dep: Any = Depends(role_required(UserRole.WORKER)),
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+
+    persisted_order = await run_in_database_executor(
+        apply_order_status_transition, order_data.id, user.restaurant_id, order_data.status, db_ref
+    )
+    return RawJSONResponse(content=order_to_json(persisted_order, order_data.id), status_code=status.HTTP_201_CREATED)
+
+
+@handle_request_errors
+@router.post("/transition_status/bulk")
+async def bulk_transition_orders_to_status(
+    order_data: BulkTransitionOrderStatusPayload,
+    user: User = Depends(get_current_user),
     dep: Any = Depends(role_required(UserRole.WORKER)),
     db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
+    """Move many orders to the same status at once.
+
+    Returns:
+        dict[]: one result per order, with the new `status`, or an `error` if that order could not be moved
+    """
+    results = await run_in_database_executor(
+        bulk_transition_order_status, order_data.ids, user.restaurant_id, order_data.status, db_ref
+    )
 
-    persisted_order = transition_order_status(
-        order_data.id, request.state.user.restaurant_id, order_data.status, db_ref
+    return JSONResponse(
+        content=[result.model_dump(mode="json", exclude_none=True) for result in results],
+        status_code=status.HTTP_200_OK,
     )
-    persisted_order_dict = persisted_order.model_dump()
-    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
-    db_ref.collection(CollectionNames.ORDERS).document(order_data.id).set(persisted_order.model_dump())
-    order = Order(**persisted_order_dict, id=order_data.id)
-    return JSONResponse(content=jsonable_encoder(order), status_code=status.HTTP_201_CREATED)
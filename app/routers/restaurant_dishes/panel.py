@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 from pydantic import BaseModel
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
+from app.core.database import get_database_ref, run_in_database_executor
+from app.services.restaurant_dishes.panel import set_restaurant_dish_state, set_restaurant_dish_stock_shards
 from app.services.shared.request_handler import handle_request_errors
 
 router = APIRouter(
@@ -38,18 +38,46 @@ async def update_restaurant_dish_state(
     Returns:
         Response: FastAPI response with a confirmation message.
     """
-    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
-    dish_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
+    await run_in_database_executor(
+        set_restaurant_dish_state, restaurant_id, dish_id, state.is_available, state.stock_count, db_ref
+    )
+
+    return JSONResponse(
+        content={"message": "Restaurant–dish state updated successfully"}, status_code=status.HTTP_200_OK
+    )
+
+
+class RestaurantDishStockShardsUpdate(BaseModel):
+    """New number of stock shards for a dish in a restaurant, 0 to disable sharding."""
+
+    stock_shards: int
+
+
+@router.put("/{restaurant_id}/{dish_id}/stock_shards")
+@handle_request_errors
+async def update_restaurant_dish_stock_shards(
+    restaurant_id: str,
+    dish_id: str,
+    shards: RestaurantDishStockShardsUpdate,
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+    """Shard, rebalance or unshard the stock of a specific dish in a restaurant.
 
-    coll = db_ref.collection(CollectionNames.RESTAURANT_DISHES)
-    query = coll.where("restaurant_id", "==", restaurant_ref).where("dish_id", "==", dish_ref).limit(1).get()
+    Sharding spreads the stock over several documents, so concurrent checkouts of a popular dish
+    no longer contend on a single document. Calling it again with the same count rebalances the shards.
 
-    if not query:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not assigned to this restaurant")
+    Args:
+        restaurant_id (str): The ID of the restaurant.
+        dish_id (str): The ID of the dish.
+        shards (RestaurantDishStockShardsUpdate): New number of stock shards.
 
-    entry_ref = query[0].reference
-    entry_ref.update({"is_available": state.is_available, "stock_count": state.stock_count})
+    Returns:
+        Response: FastAPI response with the new shard count and the total stock.
+    """
+    stock_count = await run_in_database_executor(
+        set_restaurant_dish_stock_shards, restaurant_id, dish_id, shards.stock_shards, db_ref
+    )
 
     return JSONResponse(
-        content={"message": "Restaurant–dish state updated successfully"}, status_code=status.HTTP_200_OK
+        content={"stock_shards": shards.stock_shards, "stock_count": stock_count}, status_code=status.HTTP_200_OK
     )
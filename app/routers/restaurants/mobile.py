@@ -3,9 +3,8 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 
-from app.core.database import get_database_ref
-from app.models.collection_names import CollectionNames
-from app.models.restaurant import Restaurant
+from app.core.database import get_database_ref, run_in_database_executor
+from app.services.restaurants.mobile import get_restaurants
 from app.services.shared.request_handler import handle_request_errors
 
 router = APIRouter(
@@ -22,13 +21,7 @@ async def get_all_restaurants(db_ref: firestore.Client = Depends(get_database_re
     Returns:
         dict: A dictionary containing all restaurants.
     """
-    restaurant_docs = db_ref.collection(CollectionNames.RESTAURANTS).stream()
-
-    restaurants = []
-    for doc in restaurant_docs:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        restaurants.append(Restaurant(**data))
+    restaurants = await run_in_database_executor(get_restaurants, db_ref)
 
     json_compatible_docs = jsonable_encoder(restaurants)
 
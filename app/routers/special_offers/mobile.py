@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 
-from app.core.database import get_database_ref
+from app.core.database import get_database_ref, run_in_database_executor
+from app.models.user import User
+from app.services.shared.current_user import get_current_user
 from app.services.shared.request_handler import handle_request_errors
 from app.services.special_offers.mobile import (
-    generate_special_offer_for_user, get_restaurant_special_offers,
-    get_user_special_offers)
+    generate_special_offer_for_user,
+    get_restaurant_special_offers,
+    get_user_special_offers,
+)
 
 router = APIRouter(
     prefix="/special_offer/mobile",
@@ -19,24 +23,30 @@ router = APIRouter(
 @handle_request_errors
 async def get_restaurant_offers(restaurant_id: str, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(get_restaurant_special_offers(restaurant_id, db_ref)), status_code=status.HTTP_200_OK
+        content=jsonable_encoder(await run_in_database_executor(get_restaurant_special_offers, restaurant_id, db_ref)),
+        status_code=status.HTTP_200_OK,
     )
 
 
 @router.get("/user")
 @handle_request_errors
-async def get_user_offers(request: Request, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
+async def get_user_offers(
+    user: User = Depends(get_current_user), db_ref: firestore.Client = Depends(get_database_ref)
+) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(get_user_special_offers(request.state.user, db_ref)), status_code=status.HTTP_200_OK
+        content=jsonable_encoder(await run_in_database_executor(get_user_special_offers, user, db_ref)),
+        status_code=status.HTTP_200_OK,
     )
 
 
 @router.patch("/generate")
 @handle_request_errors
 async def generate_offer(
-    restaurant_id: str, request: Request, db_ref: firestore.Client = Depends(get_database_ref)
+    restaurant_id: str, user: User = Depends(get_current_user), db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(generate_special_offer_for_user(request.state.user, restaurant_id, db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(generate_special_offer_for_user, user, restaurant_id, db_ref)
+        ),
         status_code=status.HTTP_200_OK,
     )
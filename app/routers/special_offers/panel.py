@@ -1,17 +1,27 @@
-from fastapi import APIRouter, Depends, Response, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 from pydantic import BaseModel
 
-from app.core.database import get_database_ref
+from app.core.database import get_database_ref, run_in_database_executor
 from app.models.user import UserRole
+from app.services.shared.background_jobs import get_background_job
+from app.services.shared.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.services.shared.request_handler import handle_request_errors
 from app.services.shared.user_role_handler import role_required
 from app.services.special_offers.panel import (
-    add_special_offer_to_restaurant, create_special_offer,
-    delete_special_offer, get_all_special_offers, get_special_offer_by_id,
-    remove_special_offer_from_restaurant, update_special_offer)
+    add_special_offer_to_restaurant,
+    add_special_offer_to_restaurants,
+    create_special_offer,
+    delete_special_offer,
+    get_all_special_offers,
+    get_special_offer_by_id,
+    remove_special_offer_from_restaurant,
+    update_special_offer,
+)
 
 
 class CreateSpecialOfferRequest(BaseModel):
@@ -24,6 +34,10 @@ class UpdateSpecialOfferRequest(BaseModel):
     special_price: float
 
 
+class AddSpecialOfferToRestaurantsRequest(BaseModel):
+    restaurant_ids: list[str]
+
+
 router = APIRouter(
     prefix="/special_offer/panel",
     tags=["admin panel special offers"],
@@ -33,15 +47,32 @@ router = APIRouter(
 
 @router.get("/all")
 @handle_request_errors
-async def get_offers(db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
-    return JSONResponse(content=jsonable_encoder(get_all_special_offers(db_ref)), status_code=status.HTTP_200_OK)
+async def get_offers(
+    page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db_ref: firestore.Client = Depends(get_database_ref),
+) -> Response:
+    """Get one page of all special offers.
+
+    Args:
+        page_size (int): Number of offers per page.
+        cursor (str | None): `next_cursor` of the previous page, omitted for the first page.
+
+    Returns:
+        dict: `special_offers` and `next_cursor`, which is null on the last page
+    """
+    return JSONResponse(
+        content=jsonable_encoder(await run_in_database_executor(get_all_special_offers, db_ref, page_size, cursor)),
+        status_code=status.HTTP_200_OK,
+    )
 
 
 @router.get("/{offer_id}")
 @handle_request_errors
 async def get_offer(offer_id: str, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(get_special_offer_by_id(offer_id, db_ref)), status_code=status.HTTP_200_OK
+        content=jsonable_encoder(await run_in_database_executor(get_special_offer_by_id, offer_id, db_ref)),
+        status_code=status.HTTP_200_OK,
     )
 
 
@@ -51,7 +82,9 @@ async def create_offer(
     offer_data: CreateSpecialOfferRequest, db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(create_special_offer(offer_data.dish_id, offer_data.special_price, db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(create_special_offer, offer_data.dish_id, offer_data.special_price, db_ref)
+        ),
         status_code=status.HTTP_201_CREATED,
     )
 
@@ -62,26 +95,65 @@ async def update_offer(
     offer_id: str, offer_data: UpdateSpecialOfferRequest, db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(update_special_offer(offer_id, offer_data.special_price, db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(update_special_offer, offer_id, offer_data.special_price, db_ref)
+        ),
         status_code=status.HTTP_200_OK,
     )
 
 
 @router.delete("/{offer_id}")
 @handle_request_errors
-async def delete_offer(offer_id: str, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
+async def delete_offer(
+    offer_id: str, background: bool = False, db_ref: firestore.Client = Depends(get_database_ref)
+) -> Response:
+    """Delete a special offer and remove it from all restaurants and users.
+
+    Offers held by many users are deleted by a background job, answered with 202 and the `job`,
+    whose progress is available at `/jobs/{job_id}`.
+    """
+    result = await run_in_database_executor(delete_special_offer, offer_id, db_ref, background)
+
     return JSONResponse(
-        content=jsonable_encoder(delete_special_offer(offer_id, db_ref)), status_code=status.HTTP_200_OK
+        content=jsonable_encoder(result),
+        status_code=status.HTTP_202_ACCEPTED if "job" in result else status.HTTP_200_OK,
     )
 
 
+@router.get("/jobs/{job_id}")
+@handle_request_errors
+async def get_job(job_id: str) -> Response:
+    """Get the progress of a background job.
+
+    Returns:
+        dict: The job `status`, the number of items `done` out of `total`, and the `error` of a failed job
+    """
+    return JSONResponse(content=get_background_job(job_id).model_dump(mode="json"), status_code=status.HTTP_200_OK)
+
+
 @router.post("/restaurant/{restaurant_id}/offer/{offer_id}")
 @handle_request_errors
 async def add_offer_to_restaurant(
     restaurant_id: str, offer_id: str, db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(add_special_offer_to_restaurant(restaurant_id, offer_id, db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(add_special_offer_to_restaurant, restaurant_id, offer_id, db_ref)
+        ),
+        status_code=status.HTTP_200_OK,
+    )
+
+
+@router.post("/offer/{offer_id}/restaurants")
+@handle_request_errors
+async def add_offer_to_restaurants(
+    offer_id: str, request: AddSpecialOfferToRestaurantsRequest, db_ref: firestore.Client = Depends(get_database_ref)
+) -> Response:
+    """Add a special offer to many restaurants at once, either to all of them or, on error, to none."""
+    return JSONResponse(
+        content=jsonable_encoder(
+            await run_in_database_executor(add_special_offer_to_restaurants, offer_id, request.restaurant_ids, db_ref)
+        ),
         status_code=status.HTTP_200_OK,
     )
 
@@ -92,6 +164,8 @@ async def remove_offer_from_restaurant(
     restaurant_id: str, offer_id: str, db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(remove_special_offer_from_restaurant(restaurant_id, offer_id, db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(remove_special_offer_from_restaurant, restaurant_id, offer_id, db_ref)
+        ),
         status_code=status.HTTP_200_OK,
     )
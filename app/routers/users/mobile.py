@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Request, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
-from app.models.user import DisplayedUser
+from app.models.user import DisplayedUser, User
+from app.services.shared.current_user import get_current_user
 from app.services.shared.request_handler import handle_request_errors
 
 router = APIRouter(
@@ -14,8 +15,8 @@ router = APIRouter(
 @handle_request_errors
 @router.get("/me")
 async def get_user_data(
-    request: Request,
+    user: User = Depends(get_current_user),
 ) -> Response:
-    displayed_user = DisplayedUser(**request.state.user.model_dump())
+    displayed_user = DisplayedUser(**user.model_dump())
 
     return JSONResponse(content=jsonable_encoder(displayed_user.model_dump()), status_code=status.HTTP_201_CREATED)
@@ -4,15 +4,19 @@ from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 from pydantic import BaseModel, EmailStr
 
-from app.core.database import get_database_ref
+from app.core.database import get_database_ref, run_in_database_executor
 from app.models.user import UserRole
 from app.services.shared.request_handler import handle_request_errors
 from app.services.shared.user_role_handler import role_required
-from app.services.workers.panel import (assign_worker_to_restaurant,
-                                        create_worker, delete_worker,
-                                        generate_secure_password,
-                                        get_all_workers, get_worker_by_id,
-                                        remove_worker_from_restaurant)
+from app.services.workers.panel import (
+    assign_worker_to_restaurant,
+    create_worker,
+    delete_worker,
+    generate_secure_password,
+    get_all_workers,
+    get_worker_by_id,
+    remove_worker_from_restaurant,
+)
 
 
 class CreateWorkerRequest(BaseModel):
@@ -29,13 +33,19 @@ router = APIRouter(
 @router.get("/all")
 @handle_request_errors
 async def get_workers(db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
-    return JSONResponse(content=jsonable_encoder(get_all_workers(db_ref)), status_code=status.HTTP_200_OK)
+    return JSONResponse(
+        content=jsonable_encoder(await run_in_database_executor(get_all_workers, db_ref)),
+        status_code=status.HTTP_200_OK,
+    )
 
 
 @router.get("/{worker_id}")
 @handle_request_errors
 async def get_worker(worker_id: str, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
-    return JSONResponse(content=jsonable_encoder(get_worker_by_id(worker_id, db_ref)), status_code=status.HTTP_200_OK)
+    return JSONResponse(
+        content=jsonable_encoder(await run_in_database_executor(get_worker_by_id, worker_id, db_ref)),
+        status_code=status.HTTP_200_OK,
+    )
 
 
 @router.post("/create")
@@ -44,7 +54,9 @@ async def add_worker(
     worker_data: CreateWorkerRequest, db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(create_worker(worker_data.email, generate_secure_password(), db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(create_worker, worker_data.email, generate_secure_password(), db_ref)
+        ),
         status_code=status.HTTP_201_CREATED,
     )
 
@@ -55,7 +67,9 @@ async def assign_to_restaurant(
     worker_id: str, restaurant_id: str, db_ref: firestore.Client = Depends(get_database_ref)
 ) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(assign_worker_to_restaurant(worker_id, restaurant_id, db_ref)),
+        content=jsonable_encoder(
+            await run_in_database_executor(assign_worker_to_restaurant, worker_id, restaurant_id, db_ref)
+        ),
         status_code=status.HTTP_200_OK,
     )
 
@@ -64,7 +78,7 @@ async def assign_to_restaurant(
 @handle_request_errors
 async def remove_from_restaurant(worker_id: str, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
     return JSONResponse(
-        content=jsonable_encoder(remove_worker_from_restaurant(worker_id, db_ref)),
+        content=jsonable_encoder(await run_in_database_executor(remove_worker_from_restaurant, worker_id, db_ref)),
         status_code=status.HTTP_200_OK,
     )
 
@@ -72,4 +86,7 @@ async def remove_from_restaurant(worker_id: str, db_ref: firestore.Client = Depe
 @router.delete("/{worker_id}")
 @handle_request_errors
 async def remove_worker(worker_id: str, db_ref: firestore.Client = Depends(get_database_ref)) -> Response:
-    return JSONResponse(content=jsonable_encoder(delete_worker(worker_id, db_ref)), status_code=status.HTTP_200_OK)
+    return JSONResponse(
+        content=jsonable_encoder(await run_in_database_executor(delete_worker, worker_id, db_ref)),
+        status_code=status.HTTP_200_OK,
+    )
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi import APIRouter, Depends, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from firebase_admin import firestore  # type: ignore
 from pydantic import BaseModel, Field
 
-from app.core.database import get_database_ref
+from app.core.database import get_database_ref, run_in_database_executor
 from app.models.user import UserRole
+from app.services.shared.current_user import get_current_user_id
 from app.services.shared.request_handler import handle_request_errors
 from app.services.shared.user_role_handler import role_required
 from app.services.workers.panel import change_worker_password
@@ -23,8 +24,10 @@ router = APIRouter(
 @router.post("/change-password")
 @handle_request_errors
 async def worker_change_password(
-    password_data: ChangePasswordRequest, request: Request, db_ref: firestore.Client = Depends(get_database_ref)
+    password_data: ChangePasswordRequest,
+    user_id: str = Depends(get_current_user_id),
+    db_ref: firestore.Client = Depends(get_database_ref),
 ) -> Response:
-    result = change_worker_password(request.state.user.id, password_data.new_password, db_ref)
+    result = await run_in_database_executor(change_worker_password, user_id, password_data.new_password, db_ref)
 
     return JSONResponse(content=jsonable_encoder(result), status_code=status.HTTP_200_OK)
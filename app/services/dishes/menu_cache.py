@@ -0,0 +1,125 @@
+import json
+import threading
+
+from firebase_admin import firestore  # type: ignore
+from pydantic import BaseModel
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.services.dishes.mobile import list_available_dishes
+from app.services.shared.etag import make_strong_etag
+
+
+class CachedMenu(BaseModel):
+    version: int
+    etag: str
+    body: bytes
+    dishes: list[dict]
+
+
+menu_cache: TTLCache[str, CachedMenu] = TTLCache(
+    "restaurant_menus",
+    max_entries=settings.cache_config.menu_max_entries,
+    ttl_seconds=settings.cache_config.menu_ttl_seconds,
+)
+
+_menu_versions: dict[str, int] = {}
+_global_version = 0
+_versions_lock = threading.Lock()
+
+
+def _current_version(restaurant_id: str) -> int:
+    with _versions_lock:
+        return _global_version + _menu_versions.get(restaurant_id, 0)
+
+
+def get_cached_menu(restaurant_id: str) -> CachedMenu | None:
+    return menu_cache.get(restaurant_id)
+
+
+def make_menu(version: int, dishes: list[dict]) -> CachedMenu:
+    body = json.dumps(dishes, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return CachedMenu(version=version, etag=make_strong_etag(body), body=body, dishes=dishes)
+
+
+def build_menu(restaurant_id: str, db_ref: firestore.Client) -> CachedMenu:
+    """Build the available-dishes menu of a restaurant from Firestore and cache it.
+
+    A menu built while an invalidation was in flight is returned but not cached, so a concurrent
+    write can never be hidden behind a stale entry.
+    """
+    version = _current_version(restaurant_id)
+    menu = make_menu(version, list_available_dishes(restaurant_id, db_ref))
+
+    with _versions_lock:
+        if _global_version + _menu_versions.get(restaurant_id, 0) == version:
+            menu_cache.set(restaurant_id, menu)
+
+    return menu
+
+
+def get_available_dishes(restaurant_id: str, db_ref: firestore.Client) -> list[dict]:
+    """Get the available, in-stock dishes of a restaurant with their prices, from the menu cache.
+
+    The cached menu is invalidated by every stock and availability write, and checkouts subtract
+    their quantities from it in place, so it doubles as an index of the dishes that can be offered
+    right now without a Firestore read per call.
+    """
+    menu = get_cached_menu(restaurant_id) or build_menu(restaurant_id, db_ref)
+    return menu.dishes
+
+
+def invalidate_menu(restaurant_id: str) -> None:
+    """Drop the cached menu of a restaurant after a write that changes its dishes, availability or stock."""
+    with _versions_lock:
+        _menu_versions[restaurant_id] = _menu_versions.get(restaurant_id, 0) + 1
+    menu_cache.invalidate(restaurant_id)
+
+
+def reserve_menu_version(restaurant_id: str) -> int:
+    """Mark the menu of a restaurant as changing, before a stock write commits.
+
+    Menus being built right now are not cached anymore, since they may or may not see the write.
+
+    Returns:
+        int: The version to pass to `apply_menu_stock_decrements` once the write has committed.
+    """
+    with _versions_lock:
+        _menu_versions[restaurant_id] = _menu_versions.get(restaurant_id, 0) + 1
+        return _global_version + _menu_versions[restaurant_id]
+
+
+def apply_menu_stock_decrements(restaurant_id: str, quantities: dict[str, int], version: int) -> None:
+    """Subtract committed order quantities from the cached menu of a restaurant instead of dropping it.
+
+    Only a menu built before `version` was reserved is known to predate the write, so it is updated
+    and dishes that ran out are removed from it. The entry keeps its original expiry. A newer menu
+    may already include the write and is dropped instead.
+
+    Args:
+        restaurant_id (str): The ID of the restaurant.
+        quantities (dict[str, int]): Quantities sold per dish ID.
+        version (int): The version returned by `reserve_menu_version` before the write.
+    """
+    with _versions_lock:
+        menu = menu_cache.get(restaurant_id)
+        if menu is None:
+            return
+        if menu.version >= version:
+            menu_cache.invalidate(restaurant_id)
+            return
+
+        dishes = []
+        for dish in menu.dishes:
+            stock_count = dish["stock_count"] - quantities.get(dish["id"], 0)
+            if stock_count > 0:
+                dishes.append({**dish, "stock_count": stock_count})
+        menu_cache.replace(restaurant_id, make_menu(menu.version, dishes))
+
+
+def invalidate_all_menus() -> None:
+    """Drop every cached menu, e.g. after a dish shared by many restaurants changes."""
+    global _global_version
+    with _versions_lock:
+        _global_version += 1
+    menu_cache.clear()
@@ -0,0 +1,48 @@
+from fastapi.encoders import jsonable_encoder
+from firebase_admin import firestore  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.models.dish import Dish
+from app.services.restaurant_dishes.stock import read_stock_counts
+from app.services.shared.batching import get_all_in_chunks
+
+MENU_DISH_FIELDS = ["name", "description", "ingredients", "base_price", "points"]
+
+
+def list_available_dishes(restaurant_id: str, db_ref: firestore.Client) -> list[dict]:
+    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+
+    # Stock is filtered after the query because sharded dishes keep their stock outside the row.
+    restaurant_dish_docs = list(
+        db_ref.collection(CollectionNames.RESTAURANT_DISHES)
+        .where("restaurant_id", "==", restaurant_ref)
+        .where("is_available", "==", True)
+        .stream()
+    )
+    stock_counts = read_stock_counts(db_ref, [(rd_doc.reference, rd_doc.to_dict()) for rd_doc in restaurant_dish_docs])
+    restaurant_dishes = [
+        {**rd_doc.to_dict(), "stock_count": stock_counts[rd_doc.reference.path]}
+        for rd_doc in restaurant_dish_docs
+        if stock_counts[rd_doc.reference.path] > 0
+    ]
+
+    dish_docs = get_all_in_chunks(db_ref, [rd["dish_id"] for rd in restaurant_dishes], field_paths=MENU_DISH_FIELDS)
+    dishes_by_id = {dish_doc.id: dish_doc for dish_doc in dish_docs if dish_doc.exists}
+
+    result = []
+    for rd in restaurant_dishes:
+        dish_doc = dishes_by_id.get(rd["dish_id"].id)
+        if dish_doc is None:
+            continue
+
+        dish_data = dish_doc.to_dict()
+        dish_data["price"] = dish_data["base_price"]
+        dish_data["id"] = dish_doc.id
+        dish_payload = {
+            **jsonable_encoder(Dish(**dish_data)),
+            "stock_count": rd["stock_count"],
+            "is_available": rd["is_available"],
+        }
+        result.append(dish_payload)
+
+    return result
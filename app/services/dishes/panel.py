@@ -0,0 +1,52 @@
+from fastapi import HTTPException, status
+from firebase_admin import firestore  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.models.dish import Dish
+from app.services.dishes.menu_cache import invalidate_all_menus
+from app.services.special_offers.shared import invalidate_dish_summary
+
+
+def get_dish(dish_id: str, db_ref: firestore.Client) -> Dish:
+    doc = db_ref.collection(CollectionNames.DISHES).document(dish_id).get()
+    if not doc.exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+    data = doc.to_dict()
+    data["price"] = data.pop("base_price")
+    return Dish(**data)
+
+
+def get_all_dishes(db_ref: firestore.Client) -> list[dict]:
+    docs = db_ref.collection(CollectionNames.DISHES).get()
+    dishes = []
+    for doc in docs:
+        data = doc.to_dict()
+        data["id"] = doc.id
+        dishes.append(data)
+    return dishes
+
+
+def create_dish(dish: Dish, db_ref: firestore.Client) -> dict:
+    dish_dict = dish.model_dump(exclude={"id"})
+    write_time, doc_ref = db_ref.collection(CollectionNames.DISHES).add(dish_dict)
+    return {**dish_dict, "id": doc_ref.id}
+
+
+def replace_dish(dish_id: str, dish: Dish, db_ref: firestore.Client) -> dict:
+    dish_dict = dish.model_dump()
+    doc_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
+    if not doc_ref.get().exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+    doc_ref.set(dish_dict)
+    invalidate_all_menus()
+    invalidate_dish_summary(dish_id)
+    return dish_dict
+
+
+def remove_dish(dish_id: str, db_ref: firestore.Client) -> None:
+    doc_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
+    if not doc_ref.get().exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+    doc_ref.delete()
+    invalidate_all_menus()
+    invalidate_dish_summary(dish_id)
@@ -0,0 +1,62 @@
+from datetime import UTC, datetime
+
+from firebase_admin import firestore  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.models.firestore_ref import FirestoreRef
+from app.models.opinion import Opinion, OpinionCreate
+
+
+def get_opinions(db_ref: firestore.Client) -> list[Opinion]:
+    opinion_docs = db_ref.collection(CollectionNames.OPINIONS).stream()
+
+    opinions = []
+    for doc in opinion_docs:
+        data = doc.to_dict()
+        data["id"] = doc.id
+        opinions.append(Opinion(**data))
+
+    return opinions
+
+
+def create_opinion(opinion_data: OpinionCreate, db_ref: firestore.Client) -> Opinion:
+    opinion = Opinion(
+        restaurant_id=FirestoreRef(db_ref.collection(CollectionNames.RESTAURANTS).document(opinion_data.restaurant_id)),
+        user_id=FirestoreRef(db_ref.collection(CollectionNames.USERS).document(opinion_data.user_id)),
+        dish_id=FirestoreRef(db_ref.collection(CollectionNames.DISHES).document(opinion_data.dish_id)),
+        rating=opinion_data.rating,
+        comment=opinion_data.comment,
+        created_at=datetime.now(UTC),
+    )
+
+    opinion_dict = opinion.model_dump(exclude={"id"})
+    _, opinion_doc = db_ref.collection(CollectionNames.OPINIONS).add(opinion_dict)
+    return opinion.model_copy(update={"id": opinion_doc.id})
+
+
+def replace_opinion(opinion_id: str, opinion_data: OpinionCreate, db_ref: firestore.Client) -> Opinion | None:
+    doc_ref = db_ref.collection(CollectionNames.OPINIONS).document(opinion_id)
+    existing_doc = doc_ref.get()
+    if not existing_doc.exists:
+        return None
+
+    existing_data = existing_doc.to_dict()
+    created_at = existing_data.get("created_at")
+
+    opinion = Opinion(
+        id=opinion_id,
+        restaurant_id=FirestoreRef(db_ref.collection(CollectionNames.RESTAURANTS).document(opinion_data.restaurant_id)),
+        user_id=FirestoreRef(db_ref.collection(CollectionNames.USERS).document(opinion_data.user_id)),
+        dish_id=FirestoreRef(db_ref.collection(CollectionNames.DISHES).document(opinion_data.dish_id)),
+        rating=opinion_data.rating,
+        comment=opinion_data.comment,
+        created_at=created_at,
+    )
+
+    opinion_dict = opinion.model_dump(exclude={"id"})
+    doc_ref.set(opinion_dict)
+    return opinion.model_copy(update={"id": opinion_id})
+
+
+def remove_opinion(opinion_id: str, db_ref: firestore.Client) -> None:
+    db_ref.collection(CollectionNames.OPINIONS).document(opinion_id).delete()
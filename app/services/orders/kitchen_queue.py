@@ -0,0 +1,236 @@
+import threading
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException, status
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.config import settings
+from app.core.database import run_in_database_executor, submit_to_database_executor
+from app.models.collection_names import CollectionNames
+from app.models.order import OrderStatus
+from app.services.orders.serialization import snapshot_to_json
+from app.services.shared.sse import EventSubscriber, format_sse
+
+KITCHEN_QUEUE_STATUSES = [OrderStatus.PAID.value, OrderStatus.IN_PROGRESS.value, OrderStatus.READY.value]
+
+
+class KitchenQueueHub:
+    """One Firestore snapshot listener on the open orders of a restaurant, shared by all its screens.
+
+    The listener callback runs on a Firestore thread. Every change is serialized once and the encoded
+    event is handed to each subscriber's event loop. Subscribers that join before Firestore has
+    delivered the first snapshot wait in `pending` and get their `snapshot` event once it arrives.
+    """
+
+    def __init__(self, restaurant_ref: DocumentReference, db_ref: firestore.Client) -> None:
+        self.restaurant_ref = restaurant_ref
+        self.db_ref = db_ref
+        self.orders: dict[str, str] = {}
+        self.subscribers: set[EventSubscriber] = set()
+        self.pending: set[EventSubscriber] = set()
+        self.ready = False
+        self.watch: Any = None
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        query = (
+            self.db_ref.collection(CollectionNames.ORDERS)
+            .where(filter=FieldFilter("restaurant_id", "==", self.restaurant_ref))
+            .where(filter=FieldFilter("status", "in", KITCHEN_QUEUE_STATUSES))
+        )
+        self.watch = query.on_snapshot(self.on_snapshot)
+
+    def stop(self) -> None:
+        if self.watch is not None:
+            self.watch.unsubscribe()
+            self.watch = None
+
+    def snapshot_event(self) -> bytes:
+        return format_sse("snapshot", "[" + ",".join(self.orders.values()) + "]")
+
+    def subscribe(self, subscriber: EventSubscriber) -> None:
+        """Register a subscriber, whose first event is a `snapshot` of the current queue.
+
+        Before the first Firestore snapshot has arrived the subscriber waits in `pending`.
+        A subscriber that was already closed, e.g. because its client left, is ignored.
+        """
+        with self.lock:
+            if subscriber.closed:
+                return
+            if not self.ready:
+                self.pending.add(subscriber)
+                return
+            subscriber.offer_threadsafe(self.snapshot_event())
+            self.subscribers.add(subscriber)
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        with self.lock:
+            self.subscribers.discard(subscriber)
+            self.pending.discard(subscriber)
+
+    def is_unused(self) -> bool:
+        with self.lock:
+            return not self.subscribers and not self.pending
+
+    def on_snapshot(self, documents: list, changes: list, read_time: Any) -> None:
+        with self.lock:
+            messages = []
+            for change in changes:
+                order_id = change.document.id
+                if change.type.name == "REMOVED":
+                    self.orders.pop(order_id, None)
+                    messages.append(format_sse("removed", f'{{"id":"{order_id}"}}'))
+                    continue
+
+                self.orders[order_id] = snapshot_to_json(change.document).decode("utf-8")
+                messages.append(format_sse(change.type.name.lower(), self.orders[order_id]))
+
+            # Streams whose response never started cannot unsubscribe, they are closed once they
+            # fall behind and dropped here.
+            live_subscribers = {subscriber for subscriber in self.subscribers if not subscriber.closed}
+            pruned = len(live_subscribers) < len(self.subscribers)
+            self.subscribers = live_subscribers
+            for subscriber in self.subscribers:
+                for message in messages:
+                    subscriber.offer_threadsafe(message)
+
+            if not self.ready:
+                self.ready = True
+                snapshot = self.snapshot_event()
+                for subscriber in self.pending:
+                    subscriber.offer_threadsafe(snapshot)
+                self.subscribers |= self.pending
+                self.pending.clear()
+
+            abandoned = pruned and not self.subscribers and not self.pending
+
+        if abandoned:
+            # The listener cannot be stopped from its own callback thread.
+            submit_to_database_executor(stop_unused_hub, self.restaurant_ref.id, self)
+
+
+_hubs: dict[str, KitchenQueueHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def release_hub(restaurant_id: str, hub: KitchenQueueHub) -> KitchenQueueHub | None:
+    """Forget a hub that no screen uses anymore. Must hold `_hubs_lock`.
+
+    Returns:
+        KitchenQueueHub | None: The forgotten hub, whose listener the caller must stop.
+    """
+    if _hubs.get(restaurant_id) is not hub or not hub.is_unused():
+        return None
+    del _hubs[restaurant_id]
+    return hub
+
+
+def stop_unused_hub(restaurant_id: str, hub: KitchenQueueHub) -> None:
+    with _hubs_lock:
+        unused_hub = release_hub(restaurant_id, hub)
+    if unused_hub is not None:
+        unused_hub.stop()
+
+
+def join_kitchen_queue(
+    restaurant_ref: DocumentReference, subscriber: EventSubscriber, db_ref: firestore.Client
+) -> None:
+    """Register a subscriber with the restaurant's hub, starting its listener if needed.
+
+    Starting a listener blocks, so it must run off the event loop.
+    """
+    with _hubs_lock:
+        hub = _hubs.get(restaurant_ref.id)
+        if hub is None:
+            hub = KitchenQueueHub(restaurant_ref, db_ref)
+            hub.start()
+            _hubs[restaurant_ref.id] = hub
+        hub.subscribe(subscriber)
+        # The subscriber is ignored if it was closed while this was queued on the executor.
+        unused_hub = release_hub(restaurant_ref.id, hub)
+
+    if unused_hub is not None:
+        unused_hub.stop()
+
+
+def leave_kitchen_queue(restaurant_ref: DocumentReference, subscriber: EventSubscriber) -> None:
+    """Close a subscriber and drop it, and the restaurant's hub with it once no screen is left.
+
+    Runs on the event loop, also while a request is being cancelled, so the blocking listener stop
+    is handed to the database executor without waiting for it.
+    """
+    # Closing first keeps a join that is still queued on the executor from registering it.
+    subscriber.close()
+    with _hubs_lock:
+        hub = _hubs.get(restaurant_ref.id)
+        if hub is None:
+            return
+        hub.unsubscribe(subscriber)
+        unused_hub = release_hub(restaurant_ref.id, hub)
+
+    if unused_hub is not None:
+        submit_to_database_executor(unused_hub.stop)
+
+
+async def subscribe_to_kitchen_queue(
+    restaurant_ref: DocumentReference, db_ref: firestore.Client
+) -> tuple[EventSubscriber, bytes]:
+    """Join the kitchen queue of a restaurant and wait for its first `snapshot` event.
+
+    Only starting the listener uses the database executor; the wait for Firestore's first snapshot
+    happens on the event loop.
+
+    Args:
+        restaurant_ref (DocumentReference): The restaurant of the worker.
+        db_ref (firestore.Client): The Firestore client.
+
+    Raises:
+        HTTPException: 503 if Firestore does not deliver the first snapshot in time.
+
+    Returns:
+        tuple[EventSubscriber, bytes]: The subscriber and its encoded `snapshot` event.
+    """
+    subscriber = EventSubscriber(settings.stream_config.subscriber_queue_size)
+
+    try:
+        await run_in_database_executor(join_kitchen_queue, restaurant_ref, subscriber, db_ref)
+        snapshot = await subscriber.next_message(settings.stream_config.snapshot_timeout_seconds)
+    except BaseException:
+        leave_kitchen_queue(restaurant_ref, subscriber)
+        raise
+
+    if snapshot is None:
+        leave_kitchen_queue(restaurant_ref, subscriber)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Kitchen queue of restaurant {restaurant_ref.id} is not available",
+        )
+
+    return subscriber, snapshot
+
+
+async def kitchen_queue_events(
+    restaurant_ref: DocumentReference, subscriber: EventSubscriber, snapshot: bytes
+) -> AsyncIterator[bytes]:
+    """Stream the open orders of a restaurant as Server-Sent Events.
+
+    The first event is the `snapshot` with every open order, followed by `added`, `modified` and
+    `removed` events as orders enter, change in, or leave the kitchen queue.
+
+    Args:
+        restaurant_ref (DocumentReference): The restaurant of the worker.
+        subscriber (EventSubscriber): The subscriber returned by `subscribe_to_kitchen_queue`.
+        snapshot (bytes): Its `snapshot` event.
+
+    Yields:
+        bytes: Encoded events and heartbeat comments.
+    """
+    try:
+        yield snapshot
+        async for message in subscriber.stream(settings.stream_config.heartbeat_seconds):
+            yield message
+    finally:
+        # Runs on disconnect too, when the generator is cancelled, so it cannot await the executor.
+        leave_kitchen_queue(restaurant_ref, subscriber)
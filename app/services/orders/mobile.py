@@ -2,18 +2,36 @@ from datetime import UTC, datetime
 
 from fastapi import HTTPException, status
 from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import Transaction  # type: ignore
 from google.cloud.firestore_v1.base_query import FieldFilter
 
+from app.core.user_cache import invalidate_cached_user
 from app.models.collection_names import CollectionNames
-from app.models.order import (CreateOrderPayload, Order, OrderStatus,
-                              PayForOrderPayload, PersistedOrder,
-                              UpdateOrderPayload)
+from app.models.order import (
+    CreateOrderPayload,
+    Order,
+    OrderPage,
+    OrderStatus,
+    OrderSummary,
+    PayForOrderPayload,
+    PersistedOrder,
+    UpdateOrderPayload,
+)
 from app.models.user import User
+from app.services.dishes.menu_cache import apply_menu_stock_decrements, reserve_menu_version
 from app.services.restaurants.shared import check_restaurant_existence
+from app.services.shared.pagination import DEFAULT_PAGE_SIZE, get_page
+from app.services.users.points_ledger import record_order_points
 
-from .shared import (calculate_order_points, calculate_order_prices,
-                     check_order_validity_and_ownership,
-                     check_restaurant_dishes_existence, finalize_order_stock)
+from .pricing import price_order
+from .rollups import record_order_transition
+from .shared import (
+    check_order_validity_and_ownership,
+    check_restaurant_dishes_existence,
+    read_order_stock_updates,
+    validate_order_snapshot,
+    write_order_stock_updates,
+)
 
 
 def create_order(order_data: CreateOrderPayload, user: User, db_ref: firestore.Client) -> PersistedOrder:
@@ -31,10 +49,7 @@ def create_order(order_data: CreateOrderPayload, user: User, db_ref: firestore.C
         created_at=now,
         updated_at=now,
     )
-    (result_order.total_price, result_order.total_price_including_special_offers) = calculate_order_prices(
-        result_order, user, db_ref
-    )
-    result_order.points_gained = calculate_order_points(result_order, db_ref)
+    price_order(result_order, user, db_ref).apply_to(result_order)
 
     return result_order
 
@@ -46,40 +61,108 @@ def update_order_items(order_data: UpdateOrderPayload, user: User, db_ref: fires
     )
 
     order.order_items = order_data.order_items
-    order.total_price, order.total_price_including_special_offers = calculate_order_prices(order, user, db_ref)
-    order.points_gained = calculate_order_points(order, db_ref)
+    price_order(order, user, db_ref).apply_to(order)
     order.updated_at = datetime.now(UTC)
     return order
 
 
-def users_order_history(user: User, db_ref: firestore.Client) -> list[Order]:
-    order_docs = (
+ORDER_SUMMARY_FIELDS = [field for field in OrderSummary.model_fields if field != "id"]
+ORDER_HISTORY_STATUSES = [order_status.value for order_status in OrderStatus if order_status != OrderStatus.CHECKOUT]
+
+
+def users_order_history(
+    user_id: str,
+    db_ref: firestore.Client,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    summary: bool = False,
+) -> OrderPage:
+    """Get one page of a user's order history, newest orders first.
+
+    Args:
+        user_id (str): The ID of the user.
+        db_ref (firestore.Client): The Firestore client.
+        page_size (int): Number of orders per page, capped at `MAX_PAGE_SIZE`.
+        cursor (str | None): Continuation token returned with the previous page.
+        summary (bool): Leave out `order_items`, reading only the summary fields.
+
+    Returns:
+        OrderPage: The orders of the page and the token of the next page.
+    """
+    query = (
         db_ref.collection(CollectionNames.ORDERS)
-        .where(filter=FieldFilter("user_id", "==", user.id))
-        .where(filter=FieldFilter("status", "!=", OrderStatus.CHECKOUT))
-        .stream()
+        .where(filter=FieldFilter("user_id", "==", user_id))
+        .where(filter=FieldFilter("status", "in", ORDER_HISTORY_STATUSES))
+    )
+    if summary:
+        query = query.select(ORDER_SUMMARY_FIELDS)
+
+    order_docs, next_cursor = get_page(query, page_size, cursor)
+    order_model = OrderSummary if summary else Order
+
+    return OrderPage(
+        orders=[
+            order_model(**{**doc.to_dict(), "restaurant_id": doc.get("restaurant_id").id}, id=doc.id)
+            for doc in order_docs
+        ],
+        next_cursor=next_cursor,
     )
-
-    return [
-        Order(**(lambda d: d.update({"restaurant_id": d["restaurant_id"].id}) or d)(doc.to_dict()), id=doc.id)
-        for doc in order_docs
-    ]
 
 
 def transition_order_to_payment(order_data: PayForOrderPayload, user: User, db_ref: firestore.Client) -> PersistedOrder:
-    order = check_order_validity_and_ownership(order_data.id, OrderStatus.CHECKOUT, user, db_ref)
-
-    if len(order.order_items) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Cannot pay for empty order with id: {order_data.id}.",
-        )
-    order.payment_method = order_data.payment_method
-    order.total_price, order.total_price_including_special_offers = calculate_order_prices(order, user, db_ref)
-    order.points_gained = calculate_order_points(order, db_ref)
-    finalize_order_stock(order, order_data.id, db_ref)
-    order.finalize_users_loyalty_points(user, order_data.points, order.points_gained, db_ref)
-    order.status = OrderStatus.PAID
-    order.updated_at = datetime.now(UTC)
+    """Pay for an order in a single Firestore transaction.
+
+    The order and the user are read together, the order is priced, and the stock decrements,
+    the loyalty points update and the paid order are committed atomically, so a failure at any
+    step leaves nothing applied. Once committed, the sold quantities are subtracted from the cached
+    menu of the restaurant instead of dropping it.
+
+    Args:
+        order_data (PayForOrderPayload): The order to pay for, loyalty points to use and payment method.
+        user (User): The authenticated user.
+        db_ref (firestore.Client): The Firestore client.
+
+    Raises:
+        HTTPException: 422 if the order is missing, not owned by the user, not in checkout, empty,
+            or exceeds the restaurant stock.
+
+    Returns:
+        PersistedOrder: The paid order, as persisted.
+    """
+    order_ref = db_ref.collection(CollectionNames.ORDERS).document(order_data.id)
+    user_ref = db_ref.collection(CollectionNames.USERS).document(user.id)
+
+    @firestore.transactional
+    def checkout(transaction: Transaction) -> tuple[PersistedOrder, int]:
+        docs = {doc.reference.path: doc for doc in transaction.get_all([order_ref, user_ref])}
+        order = validate_order_snapshot(order_data.id, docs[order_ref.path], OrderStatus.CHECKOUT, user)
+
+        if len(order.order_items) == 0:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Cannot pay for empty order with id: {order_data.id}.",
+            )
+
+        user_doc = docs[user_ref.path]
+        current_user = User(**user_doc.to_dict(), id=user.id) if user_doc.exists else user
+
+        price_order(order, current_user, db_ref).apply_to(order)
+        menu_version = reserve_menu_version(order.restaurant_id.id)
+        stock_updates = read_order_stock_updates(transaction, order, order_data.id, db_ref)
+
+        write_order_stock_updates(transaction, stock_updates)
+        order.finalize_users_loyalty_points(current_user, order_data.points, order.points_gained)
+        record_order_points(transaction, db_ref, user.id, order_data.id, order.points_used, order.points_gained)
+        order.payment_method = order_data.payment_method
+        order.status = OrderStatus.PAID
+        order.updated_at = datetime.now(UTC)
+        transaction.set(order_ref, order.model_dump())
+        record_order_transition(transaction, db_ref, order, OrderStatus.CHECKOUT)
+
+        return order, menu_version
+
+    order, menu_version = checkout(db_ref.transaction())
+    apply_menu_stock_decrements(order.restaurant_id.id, order.order_items, menu_version)
+    invalidate_cached_user(user.id)
 
     return order
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import AsyncIterator
+
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import Query  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.core.database import run_in_database_executor
+from app.models.collection_names import CollectionNames
+from app.models.order import OrderStatus, PanelOrdersPayload
+from app.services.orders.serialization import snapshot_to_json, snapshots_to_json
+from app.services.shared.pagination import MAX_PAGE_SIZE, encode_cursor, get_page
+
+
+def build_orders_query(
+    db_ref: firestore.Client,
+    restaurant_id: str | None = None,
+    order_status: OrderStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> Query:
+    query = db_ref.collection(CollectionNames.ORDERS)
+
+    if restaurant_id is not None:
+        restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+        query = query.where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
+    if order_status is not None:
+        query = query.where(filter=FieldFilter("status", "==", order_status))
+    if created_from is not None:
+        query = query.where(filter=FieldFilter("created_at", ">=", created_from))
+    if created_to is not None:
+        query = query.where(filter=FieldFilter("created_at", "<", created_to))
+
+    return query
+
+
+def get_all_orders(filters: PanelOrdersPayload, db_ref: firestore.Client) -> bytes:
+    order_docs = build_orders_query(db_ref, filters.restaurant_id, filters.status)
+    return snapshots_to_json(order_docs.stream())
+
+
+async def stream_orders_ndjson(query: Query, cursor: str | None = None) -> AsyncIterator[bytes]:
+    """Stream orders as NDJSON, newest first, one page of Firestore reads at a time.
+
+    Every line is `{"order": {...}, "cursor": "..."}`. Passing the cursor of the last received line
+    as `cursor` resumes an interrupted export right after that order.
+
+    Args:
+        query (Query): The filtered orders query, without ordering.
+        cursor (str | None): Cursor of the last order already received.
+
+    Yields:
+        bytes: One NDJSON line per order.
+    """
+    while True:
+        order_docs, next_cursor = await run_in_database_executor(get_page, query, MAX_PAGE_SIZE, cursor)
+
+        for doc in order_docs:
+            yield b'{"order":' + snapshot_to_json(doc)
+            yield b',"cursor":"' + encode_cursor(doc).encode("ascii") + b'"}\n'
+
+        if next_cursor is None:
+            return
+        cursor = next_cursor
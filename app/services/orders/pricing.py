@@ -0,0 +1,78 @@
+from functools import partial
+
+from firebase_admin import firestore  # type: ignore
+from pydantic import BaseModel
+
+from app.core.database import fan_out
+from app.models.collection_names import CollectionNames
+from app.models.order import PersistedOrder
+from app.models.user import User
+from app.services.shared.batching import get_all_in_chunks
+from app.services.special_offers.best_prices import get_best_prices, lowest_special_prices
+
+PRICING_DISH_FIELDS = ["base_price", "points"]
+PRICING_SPECIAL_OFFER_FIELDS = ["dish_id", "special_price"]
+
+
+class OrderPricing(BaseModel):
+    total_price: float
+    total_price_including_special_offers: float
+    points_gained: int
+
+    def apply_to(self, order: PersistedOrder) -> None:
+        order.total_price = self.total_price
+        order.total_price_including_special_offers = self.total_price_including_special_offers
+        order.points_gained = self.points_gained
+
+
+def price_order(order: PersistedOrder, user: User, db_ref: firestore.Client) -> OrderPricing:
+    """Price an order and count the loyalty points it earns.
+
+    The dishes, the user's special offers and the restaurant's best-price table are read concurrently,
+    each with a single projected read. Every dish is charged at the lowest of its base price, the
+    restaurant's best special price and the user's own special prices for it.
+
+    Args:
+        order (PersistedOrder): The order to price.
+        user (User): The user placing the order.
+        db_ref (firestore.Client): The Firestore client.
+
+    Returns:
+        OrderPricing: Base total, total including special offers and points gained.
+    """
+    order_items = order.order_items
+    dish_refs = [db_ref.collection(CollectionNames.DISHES).document(dish_id) for dish_id in order_items]
+
+    dish_docs, user_special_offer_docs, restaurant_best_prices = fan_out(
+        partial(get_all_in_chunks, db_ref, dish_refs, field_paths=PRICING_DISH_FIELDS),
+        partial(get_all_in_chunks, db_ref, user.special_offers, field_paths=PRICING_SPECIAL_OFFER_FIELDS),
+        partial(get_best_prices, order.restaurant_id, db_ref),
+    )
+
+    total_price = 0.0
+    points_gained = 0
+    best_prices: dict[str, float] = {}
+
+    for dish_doc in dish_docs:
+        if not dish_doc.exists:
+            continue
+
+        dish = dish_doc.to_dict()
+        quantity = order_items[dish_doc.id]
+        total_price += quantity * float(dish.get("base_price"))
+        points_gained += int(quantity * dish.get("points", 0))
+        best_prices[dish_doc.id] = float(dish.get("base_price"))
+
+    user_best_prices = lowest_special_prices(user_special_offer_docs)
+    for dish_id in best_prices:
+        for special_price in (restaurant_best_prices.get(dish_id), user_best_prices.get(dish_id)):
+            if special_price is not None:
+                best_prices[dish_id] = min(best_prices[dish_id], float(special_price))
+
+    total_including_discounts = sum(price * order_items[dish_id] for dish_id, price in best_prices.items())
+
+    return OrderPricing(
+        total_price=round(total_price, 2),
+        total_price_including_special_offers=round(total_including_discounts, 2),
+        points_gained=points_gained,
+    )
@@ -0,0 +1,138 @@
+from datetime import UTC, datetime
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference, Increment  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.models.collection_names import CollectionNames
+from app.models.order import OrderStatus, PersistedOrder
+from app.models.order_rollup import OrderRollup, RollupPeriod
+
+ROLLUP_TOTAL_FIELDS = ["total_price", "total_price_including_special_offers", "points_used", "points_gained"]
+ROLLUP_STATUSES = [order_status.value for order_status in OrderStatus if order_status != OrderStatus.CHECKOUT]
+MAX_ROLLUPS_PER_QUERY = 1000
+
+# An order belongs to one rollup per period, so each order changes at most this many rollups.
+ROLLUPS_PER_ORDER = len(RollupPeriod)
+
+RollupKey = tuple[str, RollupPeriod, datetime]
+
+
+def rollup_start(created_at: datetime, period: RollupPeriod) -> datetime:
+    """Start of the UTC day or hour `created_at` falls in."""
+    start = created_at.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    return start.replace(hour=0) if period == RollupPeriod.DAY else start
+
+
+def get_rollup_ref(db_ref: firestore.Client, key: RollupKey) -> DocumentReference:
+    restaurant_id, period, start = key
+    return db_ref.collection(CollectionNames.ORDER_ROLLUPS).document(f"{restaurant_id}_{period.value}_{start:%Y%m%d%H}")
+
+
+def add_order_to_rollups(
+    rollups: dict[RollupKey, dict], order: PersistedOrder, previous_status: OrderStatus | None
+) -> None:
+    """Accumulate the rollup changes of one order moving from `previous_status` to its current status.
+
+    An order enters the rollups of the day and hour it was created in once it is paid: it is counted
+    and its prices and points are added. Later transitions only move it between status counts.
+    Orders still in checkout are not rolled up.
+
+    Args:
+        rollups (dict[RollupKey, dict]): Pending changes per rollup, updated in place.
+        order (PersistedOrder): The order, already in its new status.
+        previous_status (OrderStatus | None): The status it left, None or checkout for a newly paid order.
+    """
+    if order.status == OrderStatus.CHECKOUT:
+        return
+
+    newly_paid = previous_status is None or previous_status == OrderStatus.CHECKOUT
+
+    for period in RollupPeriod:
+        changes = rollups.setdefault(
+            (order.restaurant_id.id, period, rollup_start(order.created_at, period)), {"status_counts": {}}
+        )
+        status_counts = changes["status_counts"]
+
+        if newly_paid:
+            changes["order_count"] = changes.get("order_count", 0) + 1
+            for field in ROLLUP_TOTAL_FIELDS:
+                changes[field] = changes.get(field, 0) + getattr(order, field)
+        else:
+            status_counts[previous_status.value] = status_counts.get(previous_status.value, 0) - 1
+
+        status_counts[order.status.value] = status_counts.get(order.status.value, 0) + 1
+
+
+def write_rollups(
+    writer: Any, db_ref: firestore.Client, rollups: dict[RollupKey, dict], increment: bool = True
+) -> None:
+    """Queue rollup writes on a transaction or write batch.
+
+    With `increment` the changes are applied with `Increment`, so concurrent writers never overwrite
+    each other and missing rollups are created. Without it the rollups are replaced by the given values.
+    """
+    value: Callable[[float], Any] = Increment if increment else lambda change: change
+
+    for key, changes in rollups.items():
+        restaurant_id, period, start = key
+
+        document = {field: value(change) for field, change in changes.items() if field != "status_counts"}
+        document["status_counts"] = {
+            order_status: value(count) for order_status, count in changes["status_counts"].items()
+        }
+        document["restaurant_id"] = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+        document["period"] = period.value
+        document["start"] = start
+
+        writer.set(get_rollup_ref(db_ref, key), document, merge=increment)
+
+
+def record_order_transition(
+    writer: Any, db_ref: firestore.Client, order: PersistedOrder, previous_status: OrderStatus | None
+) -> None:
+    """Queue the rollup increments of a single order status transition on a transaction or write batch."""
+    rollups: dict[RollupKey, dict] = {}
+    add_order_to_rollups(rollups, order, previous_status)
+    write_rollups(writer, db_ref, rollups)
+
+
+def get_order_rollups(
+    restaurant_id: str, period: RollupPeriod, start_from: datetime, start_to: datetime, db_ref: firestore.Client
+) -> list[OrderRollup]:
+    """Get the rollups of a restaurant for a time range, oldest first.
+
+    Args:
+        restaurant_id (str): The ID of the restaurant.
+        period (RollupPeriod): Daily or hourly rollups.
+        start_from (datetime): Only rollups starting at or after this time.
+        start_to (datetime): Only rollups starting before this time.
+        db_ref (firestore.Client): The Firestore client.
+
+    Raises:
+        HTTPException: 422 if the range is empty or spans more than `MAX_ROLLUPS_PER_QUERY` periods.
+
+    Returns:
+        list[OrderRollup]: The rollups of periods that had paid orders.
+    """
+    period_seconds = 86400 if period == RollupPeriod.DAY else 3600
+    if not 0 < (start_to - start_from).total_seconds() <= MAX_ROLLUPS_PER_QUERY * period_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Time range must be positive and span at most {MAX_ROLLUPS_PER_QUERY} periods",
+        )
+
+    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+    rollup_docs = (
+        db_ref.collection(CollectionNames.ORDER_ROLLUPS)
+        .where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
+        .where(filter=FieldFilter("period", "==", period.value))
+        .where(filter=FieldFilter("start", ">=", start_from))
+        .where(filter=FieldFilter("start", "<", start_to))
+        .order_by("start")
+        .stream()
+    )
+
+    return [OrderRollup(**{**doc.to_dict(), "restaurant_id": restaurant_id}) for doc in rollup_docs]
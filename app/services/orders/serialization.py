@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Annotated, Any, Iterable
+
+from google.cloud.firestore import DocumentSnapshot  # type: ignore
+from pydantic import PlainSerializer, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.models.order import PersistedOrder
+
+FirestoreRefId = Annotated[Any, PlainSerializer(lambda ref: ref.id, return_type=str)]
+
+
+class OrderJSON(TypedDict, total=False):
+    """The JSON shape of `Order`, read straight from Firestore data without validating it again."""
+
+    id: str | None
+    user_id: str
+    order_items: dict[str, int]
+    total_price: float
+    total_price_including_special_offers: float
+    status: str
+    points_used: int
+    points_gained: int
+    created_at: datetime
+    updated_at: datetime
+    restaurant_id: FirestoreRefId
+    payment_method: str
+
+
+ORDER_DEFAULTS = {"status": "checkout", "points_used": 0, "points_gained": 0, "payment_method": ""}
+
+_order_adapter = TypeAdapter(OrderJSON)
+_orders_adapter = TypeAdapter(list[OrderJSON])
+
+
+def _order_fields(data: dict, order_id: str | None) -> dict:
+    return {**ORDER_DEFAULTS, **data, "id": order_id}
+
+
+def order_to_json(order: PersistedOrder, order_id: str | None) -> bytes:
+    """Serialize an order to the JSON of `Order` in a single pass, without building an `Order`."""
+    return _order_adapter.dump_json(_order_fields(order.__dict__, order_id))
+
+
+def snapshot_to_json(snapshot: DocumentSnapshot) -> bytes:
+    """Serialize a Firestore order document to the JSON of `Order`."""
+    return _order_adapter.dump_json(_order_fields(snapshot.to_dict(), snapshot.id))
+
+
+def snapshots_to_json(snapshots: Iterable[DocumentSnapshot]) -> bytes:
+    """Serialize Firestore order documents to a JSON array of `Order` in a single pass."""
+    return _orders_adapter.dump_json([_order_fields(snapshot.to_dict(), snapshot.id) for snapshot in snapshots])
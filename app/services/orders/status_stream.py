@@ -0,0 +1,107 @@
+import itertools
+import threading
+import uuid
+from collections import deque
+from typing import AsyncIterator, NamedTuple
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.order import PersistedOrder
+from app.services.shared.sse import EventSubscriber, format_sse
+
+
+class StatusEvent(NamedTuple):
+    event_id: str
+    previous_event_id: str | None
+    message: bytes
+
+
+class OrderStatusBroker:
+    """Fans order status changes out to the connected clients of each user.
+
+    The last few events of every user are kept so a client reconnecting with `Last-Event-ID` gets
+    what it missed. Each event remembers the id of the user's previous event; when the chain from
+    the client's last event cannot be followed, e.g. after a restart or a long disconnect, the client
+    gets a `resync` event and should reload its orders once.
+    """
+
+    def __init__(self, history_size: int, history_max_users: int, history_ttl_seconds: float) -> None:
+        self.history_size = history_size
+        self.history: TTLCache[str, deque[StatusEvent]] = TTLCache(
+            "order_status_history", max_entries=history_max_users, ttl_seconds=history_ttl_seconds
+        )
+        self.subscribers: dict[str, set[EventSubscriber]] = {}
+        self._epoch = uuid.uuid4().hex[:8]
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, user_id: str, order_id: str, order: PersistedOrder) -> None:
+        data = f'{{"id":"{order_id}","status":"{order.status.value}","updated_at":"{order.updated_at.isoformat()}"}}'
+
+        with self._lock:
+            events = self.history.get(user_id) or deque(maxlen=self.history_size)
+            event_id = f"{self._epoch}-{next(self._sequence)}"
+            previous_event_id = events[-1].event_id if events else None
+            event = StatusEvent(event_id, previous_event_id, format_sse("status", data, event_id))
+            events.append(event)
+            self.history.set(user_id, events)
+
+            for subscriber in self.subscribers.get(user_id, ()):
+                subscriber.offer_threadsafe(event.message)
+
+    def subscribe(self, user_id: str, subscriber: EventSubscriber, last_event_id: str | None = None) -> None:
+        """Register a client, first replaying the events it missed since `last_event_id`."""
+        with self._lock:
+            if last_event_id is not None:
+                for message in self._replay(user_id, last_event_id):
+                    subscriber.offer(message)
+            self.subscribers.setdefault(user_id, set()).add(subscriber)
+
+    def unsubscribe(self, user_id: str, subscriber: EventSubscriber) -> None:
+        with self._lock:
+            user_subscribers = self.subscribers.get(user_id, set())
+            user_subscribers.discard(subscriber)
+            if not user_subscribers:
+                self.subscribers.pop(user_id, None)
+
+    def _replay(self, user_id: str, last_event_id: str) -> list[bytes]:
+        events = list(self.history.get(user_id) or ())
+        if events and events[-1].event_id == last_event_id:
+            return []
+
+        for index, event in enumerate(events):
+            if event.previous_event_id == last_event_id:
+                return [missed.message for missed in events[index:]]
+
+        return [format_sse("resync", "{}")]
+
+
+order_status_broker = OrderStatusBroker(
+    settings.stream_config.status_history_size,
+    settings.stream_config.status_history_max_users,
+    settings.stream_config.status_history_ttl_seconds,
+)
+
+
+def publish_order_status(order_id: str, order: PersistedOrder) -> None:
+    order_status_broker.publish(order.user_id, order_id, order)
+
+
+async def order_status_events(user_id: str, last_event_id: str | None = None) -> AsyncIterator[bytes]:
+    """Stream the status changes of a user's orders as Server-Sent Events.
+
+    Args:
+        user_id (str): The ID of the user.
+        last_event_id (str | None): The `Last-Event-ID` sent by a reconnecting client.
+
+    Yields:
+        bytes: `status` events, a `resync` event if missed events cannot be replayed, and heartbeat comments.
+    """
+    subscriber = EventSubscriber(settings.stream_config.subscriber_queue_size)
+    order_status_broker.subscribe(user_id, subscriber, last_event_id)
+
+    try:
+        async for message in subscriber.stream(settings.stream_config.heartbeat_seconds):
+            yield message
+    finally:
+        order_status_broker.unsubscribe(user_id, subscriber)
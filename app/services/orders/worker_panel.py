@@ -2,36 +2,172 @@ from datetime import UTC, datetime
 
 from fastapi import HTTPException, status
 from firebase_admin import firestore  # type: ignore
-from google.cloud.firestore import DocumentReference  # type: ignore
+from google.cloud.firestore import DocumentReference, Transaction  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
 
-from app.models.order import OrderStatus, PersistedOrder
-from app.services.orders.shared import check_order_validity_and_ownership
+from app.models.collection_names import CollectionNames
+from app.models.order import OrderStatus, OrderTransitionResult, PersistedOrder
+from app.services.orders.rollups import (
+    ROLLUPS_PER_ORDER,
+    RollupKey,
+    add_order_to_rollups,
+    record_order_transition,
+    write_rollups,
+)
+from app.services.orders.serialization import snapshots_to_json
+from app.services.orders.shared import check_order_validity_and_ownership, validate_order_snapshot
+from app.services.orders.status_stream import publish_order_status
+from app.services.shared.batching import get_all_in_chunks
 
+EXPECTED_STATUS_FOR_TRANSITIONS = {
+    OrderStatus.IN_PROGRESS.value: OrderStatus.PAID,
+    OrderStatus.READY.value: OrderStatus.IN_PROGRESS,
+    OrderStatus.COMPLETED.value: OrderStatus.READY,
+}
+MAX_WRITES_PER_COMMIT = 500
+# Each order is written together with at most `ROLLUPS_PER_ORDER` rollups (its day and hour),
+# so a bulk transition of 166 orders always fits in a single commit.
+BULK_TRANSITION_MAX_ORDERS = MAX_WRITES_PER_COMMIT // (1 + ROLLUPS_PER_ORDER)
 
-def transition_order_status(
-    order_id: str, restaurant_ref: DocumentReference, order_status: OrderStatus, db_ref: firestore.Client
-) -> PersistedOrder:
-    expected_status_for_transitions = {
-        OrderStatus.IN_PROGRESS.value: OrderStatus.PAID,
-        OrderStatus.READY.value: OrderStatus.IN_PROGRESS,
-        OrderStatus.COMPLETED.value: OrderStatus.READY,
-    }
 
-    if order_status not in expected_status_for_transitions.keys():
+def check_transition_target(order_status: OrderStatus) -> OrderStatus:
+    """Return the status an order must be in to move to `order_status`."""
+    if order_status not in EXPECTED_STATUS_FOR_TRANSITIONS.keys():
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Incorrect state to transition {order_status.value}",
         )
 
-    order = check_order_validity_and_ownership(order_id, expected_status_for_transitions[order_status], None, db_ref)
+    return EXPECTED_STATUS_FOR_TRANSITIONS[order_status]
 
+
+def check_order_restaurant(order_id: str, order: PersistedOrder, restaurant_ref: DocumentReference) -> None:
     if order.restaurant_id.id != restaurant_ref.id:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"No such order with id: {order_id}",
         )
 
+
+def transition_order_status(
+    order_id: str,
+    restaurant_ref: DocumentReference,
+    order_status: OrderStatus,
+    db_ref: firestore.Client,
+    transaction: Transaction | None = None,
+) -> PersistedOrder:
+    expected_status = check_transition_target(order_status)
+    order = check_order_validity_and_ownership(order_id, expected_status, None, db_ref, transaction=transaction)
+    check_order_restaurant(order_id, order, restaurant_ref)
+
     order.status = order_status
     order.updated_at = datetime.now(UTC)
 
     return order
+
+
+def apply_order_status_transition(
+    order_id: str, restaurant_ref: DocumentReference, order_status: OrderStatus, db_ref: firestore.Client
+) -> PersistedOrder:
+    """Transition an order, persist it and push the new status to the customer's status stream.
+
+    The order is read and written in one transaction with its rollup changes, so concurrent
+    transitions of the same order cannot both pass the status check and count it twice.
+    """
+    order_ref = db_ref.collection(CollectionNames.ORDERS).document(order_id)
+
+    @firestore.transactional
+    def transition(transaction: Transaction) -> PersistedOrder:
+        order = transition_order_status(order_id, restaurant_ref, order_status, db_ref, transaction=transaction)
+        transaction.set(order_ref, order.model_dump())
+        record_order_transition(transaction, db_ref, order, EXPECTED_STATUS_FOR_TRANSITIONS[order_status])
+        return order
+
+    order = transition(db_ref.transaction())
+
+    publish_order_status(order_id, order)
+
+    return order
+
+
+def bulk_transition_order_status(
+    order_ids: list[str], restaurant_ref: DocumentReference, order_status: OrderStatus, db_ref: firestore.Client
+) -> list[OrderTransitionResult]:
+    """Move many orders of a restaurant to the same status in one transaction.
+
+    Every order is validated on its own; orders that cannot move are reported and left untouched
+    while the others are updated. The orders are read and written in the same transaction as their
+    rollup changes, so either every valid order moves or none does.
+
+    Args:
+        order_ids (list[str]): The orders to transition.
+        restaurant_ref (DocumentReference): The restaurant of the worker.
+        order_status (OrderStatus): The target status.
+        db_ref (firestore.Client): The Firestore client.
+
+    Raises:
+        HTTPException: 422 if `order_status` is not a valid transition target or too many orders are given.
+
+    Returns:
+        list[OrderTransitionResult]: One result per requested order, in request order.
+    """
+    expected_status = check_transition_target(order_status)
+    order_ids = list(dict.fromkeys(order_ids))
+    if len(order_ids) > BULK_TRANSITION_MAX_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Cannot transition more than {BULK_TRANSITION_MAX_ORDERS} orders at once",
+        )
+
+    orders_collection = db_ref.collection(CollectionNames.ORDERS)
+    order_refs = {order_id: orders_collection.document(order_id) for order_id in order_ids}
+
+    @firestore.transactional
+    def transition(
+        transaction: Transaction,
+    ) -> tuple[list[OrderTransitionResult], list[tuple[str, PersistedOrder]]]:
+        order_docs = {doc.id: doc for doc in get_all_in_chunks(db_ref, order_refs.values(), transaction=transaction)}
+
+        now = datetime.now(UTC)
+        results = []
+        transitioned = []
+        rollups: dict[RollupKey, dict] = {}
+
+        for order_id in order_ids:
+            try:
+                order = validate_order_snapshot(order_id, order_docs[order_id], expected_status, None)
+                check_order_restaurant(order_id, order, restaurant_ref)
+            except HTTPException as e:
+                results.append(OrderTransitionResult(id=order_id, error=e.detail))
+                continue
+
+            order.status = order_status
+            order.updated_at = now
+            results.append(OrderTransitionResult(id=order_id, status=order_status))
+            transitioned.append((order_id, order))
+
+            transaction.update(order_refs[order_id], {"status": order_status.value, "updated_at": now})
+            add_order_to_rollups(rollups, order, expected_status)
+
+        write_rollups(transaction, db_ref, rollups)
+
+        return results, transitioned
+
+    results, transitioned = transition(db_ref.transaction())
+
+    for order_id, order in transitioned:
+        publish_order_status(order_id, order)
+
+    return results
+
+
+def get_restaurant_orders_with_status(
+    restaurant_ref: DocumentReference, order_status: str, db_ref: firestore.Client
+) -> bytes:
+    order_docs = (
+        db_ref.collection(CollectionNames.ORDERS)
+        .where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
+        .where(filter=FieldFilter("status", "==", order_status))
+    )
+
+    return snapshots_to_json(order_docs.stream())
@@ -0,0 +1,52 @@
+from fastapi import HTTPException, status
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentSnapshot  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.services.dishes.menu_cache import invalidate_menu
+from app.services.restaurant_dishes.stock import reshard_stock, write_stock
+
+
+def find_restaurant_dish(restaurant_id: str, dish_id: str, db_ref: firestore.Client) -> DocumentSnapshot:
+    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+    dish_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
+
+    coll = db_ref.collection(CollectionNames.RESTAURANT_DISHES)
+    query = coll.where("restaurant_id", "==", restaurant_ref).where("dish_id", "==", dish_ref).limit(1).get()
+
+    if not query:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not assigned to this restaurant")
+
+    return query[0]
+
+
+def set_restaurant_dish_state(
+    restaurant_id: str, dish_id: str, is_available: bool, stock_count: int, db_ref: firestore.Client
+) -> None:
+    entry = find_restaurant_dish(restaurant_id, dish_id, db_ref)
+    stock_shards = entry.to_dict().get("stock_shards", 0)
+
+    batch = db_ref.batch()
+    write_stock(batch, entry.reference, stock_count, stock_shards, stock_shards, {"is_available": is_available})
+    batch.commit()
+    invalidate_menu(restaurant_id)
+
+
+def set_restaurant_dish_stock_shards(
+    restaurant_id: str, dish_id: str, stock_shards: int, db_ref: firestore.Client
+) -> int:
+    """Shard, rebalance or unshard the stock of a dish in a restaurant.
+
+    Args:
+        restaurant_id (str): The ID of the restaurant.
+        dish_id (str): The ID of the dish.
+        stock_shards (int): The new number of stock shards, 0 to keep the stock on the restaurant dish itself.
+        db_ref (firestore.Client): The Firestore client.
+
+    Returns:
+        int: The total stock, unchanged by resharding.
+    """
+    entry = find_restaurant_dish(restaurant_id, dish_id, db_ref)
+    stock_count = reshard_stock(entry.reference, stock_shards, db_ref)
+    invalidate_menu(restaurant_id)
+    return stock_count
@@ -0,0 +1,164 @@
+import random
+from typing import Any, Iterable
+
+from fastapi import HTTPException, status
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference, Transaction  # type: ignore
+
+from app.services.shared.batching import get_all_in_chunks
+
+STOCK_SHARDS_COLLECTION = "stock_shards"
+MAX_STOCK_SHARDS = 50
+
+
+def get_shard_refs(restaurant_dish_ref: DocumentReference, stock_shards: int) -> list[DocumentReference]:
+    """References to the stock shards of a restaurant dish, `stock_shards/0` to `stock_shards/<n - 1>`."""
+    shards = restaurant_dish_ref.collection(STOCK_SHARDS_COLLECTION)
+    return [shards.document(str(index)) for index in range(stock_shards)]
+
+
+def split_stock(stock_count: int, stock_shards: int) -> list[int]:
+    """Spread a stock count over shards as evenly as possible."""
+    if stock_shards == 0:
+        return []
+
+    base, remainder = divmod(stock_count, stock_shards)
+    return [base + 1 if index < remainder else base for index in range(stock_shards)]
+
+
+def read_stock_counts(
+    db_ref: firestore.Client, restaurant_dishes: Iterable[tuple[DocumentReference, dict]]
+) -> dict[str, int]:
+    """Resolve the current stock of many restaurant dishes.
+
+    Unsharded rows use their `stock_count` field. Shards of all sharded rows are read with one batched read.
+
+    Args:
+        db_ref (firestore.Client): The Firestore client.
+        restaurant_dishes (Iterable[tuple[DocumentReference, dict]]): Restaurant dish references and their data.
+
+    Returns:
+        dict[str, int]: Stock count per restaurant dish document path.
+    """
+    stock_counts = {}
+    shard_refs = []
+    shard_owners = {}
+
+    for restaurant_dish_ref, restaurant_dish in restaurant_dishes:
+        stock_shards = restaurant_dish.get("stock_shards", 0)
+        if stock_shards == 0:
+            stock_counts[restaurant_dish_ref.path] = restaurant_dish.get("stock_count", 0)
+            continue
+
+        stock_counts[restaurant_dish_ref.path] = 0
+        for shard_ref in get_shard_refs(restaurant_dish_ref, stock_shards):
+            shard_refs.append(shard_ref)
+            shard_owners[shard_ref.path] = restaurant_dish_ref.path
+
+    for shard_doc in get_all_in_chunks(db_ref, shard_refs, field_paths=["count"]):
+        if shard_doc.exists:
+            stock_counts[shard_owners[shard_doc.reference.path]] += shard_doc.to_dict().get("count", 0)
+
+    return stock_counts
+
+
+def read_sharded_decrement(
+    transaction: Transaction, restaurant_dish_ref: DocumentReference, stock_shards: int, quantity: int
+) -> list[tuple[DocumentReference, dict]] | None:
+    """Pick shards to take `quantity` units from, reading them inside a transaction.
+
+    Shards are read in random order until together they hold enough stock, so concurrent checkouts
+    usually touch different shards and only one shard is read and written per dish.
+
+    Args:
+        transaction (Transaction): The checkout transaction.
+        restaurant_dish_ref (DocumentReference): The sharded restaurant dish.
+        stock_shards (int): Number of shards of the restaurant dish.
+        quantity (int): Units to take.
+
+    Returns:
+        list[tuple[DocumentReference, dict]] | None: The shard updates to write, or None if all shards
+            together hold less than `quantity`.
+    """
+    shard_refs = get_shard_refs(restaurant_dish_ref, stock_shards)
+    random.shuffle(shard_refs)
+
+    updates = []
+    remaining = quantity
+    for shard_ref in shard_refs:
+        shard_doc = shard_ref.get(transaction=transaction)
+        available = shard_doc.to_dict().get("count", 0) if shard_doc.exists else 0
+        if available <= 0:
+            continue
+
+        taken = min(available, remaining)
+        updates.append((shard_ref, {"count": available - taken}))
+        remaining -= taken
+        if remaining == 0:
+            return updates
+
+    return None
+
+
+def reshard_stock(restaurant_dish_ref: DocumentReference, stock_shards: int, db_ref: firestore.Client) -> int:
+    """Turn sharding on, off, or rebalance the stock of a restaurant dish.
+
+    The current stock is read in a transaction and rewritten evenly over `stock_shards` shards. With
+    `stock_shards == 0` the stock moves back into the `stock_count` field of the restaurant dish.
+
+    Args:
+        restaurant_dish_ref (DocumentReference): The restaurant dish.
+        stock_shards (int): The new number of shards, 0 to disable sharding.
+        db_ref (firestore.Client): The Firestore client.
+
+    Raises:
+        HTTPException: 422 if `stock_shards` is out of range.
+
+    Returns:
+        int: The total stock of the restaurant dish.
+    """
+    if not 0 <= stock_shards <= MAX_STOCK_SHARDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Number of stock shards must be between 0 and {MAX_STOCK_SHARDS}",
+        )
+
+    @firestore.transactional
+    def transaction_logic(transaction: Transaction) -> int:
+        restaurant_dish = restaurant_dish_ref.get(transaction=transaction).to_dict()
+        current_shards = restaurant_dish.get("stock_shards", 0)
+        current_shard_refs = get_shard_refs(restaurant_dish_ref, current_shards)
+
+        stock_count = restaurant_dish.get("stock_count", 0)
+        if current_shards > 0:
+            shard_docs = get_all_in_chunks(db_ref, current_shard_refs, transaction=transaction)
+            stock_count = sum(doc.to_dict().get("count", 0) for doc in shard_docs if doc.exists)
+
+        write_stock(transaction, restaurant_dish_ref, stock_count, stock_shards, current_shards)
+        return stock_count
+
+    return transaction_logic(db_ref.transaction())
+
+
+def write_stock(
+    writer: Any,
+    restaurant_dish_ref: DocumentReference,
+    stock_count: int,
+    stock_shards: int,
+    current_shards: int,
+    fields: dict | None = None,
+) -> None:
+    """Queue the writes that set the stock of a restaurant dish on a transaction or write batch.
+
+    Shards beyond `stock_shards` that are left over from a larger shard count are deleted.
+    Any `fields` are written to the restaurant dish together with its stock.
+    """
+    writer.update(restaurant_dish_ref, {**(fields or {}), "stock_count": stock_count, "stock_shards": stock_shards})
+
+    for shard_ref, count in zip(
+        get_shard_refs(restaurant_dish_ref, stock_shards), split_stock(stock_count, stock_shards)
+    ):
+        writer.set(shard_ref, {"count": count})
+
+    for shard_ref in get_shard_refs(restaurant_dish_ref, current_shards)[stock_shards:]:
+        writer.delete(shard_ref)
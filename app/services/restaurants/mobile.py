@@ -0,0 +1,16 @@
+from firebase_admin import firestore  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.models.restaurant import Restaurant
+
+
+def get_restaurants(db_ref: firestore.Client) -> list[Restaurant]:
+    restaurant_docs = db_ref.collection(CollectionNames.RESTAURANTS).stream()
+
+    restaurants = []
+    for doc in restaurant_docs:
+        data = doc.to_dict()
+        data["id"] = doc.id
+        restaurants.append(Restaurant(**data))
+
+    return restaurants
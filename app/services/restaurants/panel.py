@@ -0,0 +1,69 @@
+from fastapi import HTTPException, status
+from firebase_admin import firestore  # type: ignore
+
+from app.models.collection_names import CollectionNames
+from app.models.restaurant import Restaurant
+from app.models.restaurant_dish import RestaurantDish
+from app.services.dishes.menu_cache import invalidate_menu
+from app.services.special_offers.best_prices import refresh_best_prices
+
+
+def get_restaurant(restaurant_id: str, db_ref: firestore.Client) -> Restaurant:
+    restaurant_doc = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id).get()
+
+    if not restaurant_doc.exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
+
+    return Restaurant(**restaurant_doc.to_dict())
+
+
+def create_restaurant(restaurant: Restaurant, db_ref: firestore.Client) -> Restaurant:
+    restaurant_dict = restaurant.model_dump(exclude={"id"})
+
+    doc_ref = db_ref.collection(CollectionNames.RESTAURANTS).add(restaurant_dict)[1]
+    refresh_best_prices(doc_ref, db_ref)
+
+    return restaurant.model_copy(update={"id": doc_ref.id})
+
+
+def edit_restaurant(restaurant_id: str, restaurant: Restaurant, db_ref: firestore.Client) -> Restaurant:
+    restaurant_dict = restaurant.model_dump(exclude={"id"})
+
+    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+    restaurant_ref.update(restaurant_dict)
+    refresh_best_prices(restaurant_ref, db_ref)
+
+    return restaurant.model_copy(update={"id": restaurant_id})
+
+
+def remove_restaurant(restaurant_id: str, db_ref: firestore.Client) -> None:
+    db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id).delete()
+    invalidate_menu(restaurant_id)
+
+
+def add_dish_to_menu(restaurant_id: str, dish_id: str, db_ref: firestore.Client) -> None:
+    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+
+    if not restaurant_ref.get().exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found")
+
+    dish_ref = db_ref.collection(CollectionNames.DISHES).document(dish_id)
+
+    if not dish_ref.get().exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+
+    restaurant_dishes = (
+        db_ref.collection(CollectionNames.RESTAURANT_DISHES)
+        .where("restaurant_id", "==", restaurant_ref)
+        .where("dish_id", "==", dish_ref)
+        .get()
+    )
+
+    if restaurant_dishes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dish already in restaurant menu")
+
+    restaurant_dish_dict = RestaurantDish(
+        restaurant_id=restaurant_ref, dish_id=dish_ref, is_available=False, stock_count=0
+    ).model_dump()
+    db_ref.collection(CollectionNames.RESTAURANT_DISHES).add(restaurant_dish_dict)
+    invalidate_menu(restaurant_id)
@@ -0,0 +1,90 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Callable
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.background_job import BackgroundJobState, BackgroundJobStatus
+
+logger = logging.getLogger(__name__)
+
+_job_executor = ThreadPoolExecutor(
+    max_workers=settings.database_config.job_max_workers, thread_name_prefix="background-job"
+)
+
+
+class BackgroundJob:
+    """Progress of a long running write, shared between the worker thread and status requests."""
+
+    def __init__(self, name: str, total: int) -> None:
+        self._state = BackgroundJobState(
+            id=uuid.uuid4().hex,
+            name=name,
+            status=BackgroundJobStatus.RUNNING,
+            total=total,
+            created_at=datetime.now(UTC),
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def id(self) -> str:
+        return self._state.id
+
+    def advance(self, count: int) -> None:
+        with self._lock:
+            self._state.done += count
+
+    def finish(self, error: str | None = None) -> None:
+        with self._lock:
+            self._state.status = BackgroundJobStatus.FAILED if error else BackgroundJobStatus.SUCCEEDED
+            self._state.error = error
+            self._state.finished_at = datetime.now(UTC)
+
+    def state(self) -> BackgroundJobState:
+        with self._lock:
+            return self._state.model_copy()
+
+
+background_jobs: TTLCache[str, BackgroundJob] = TTLCache(
+    "background_jobs",
+    max_entries=settings.cache_config.job_max_entries,
+    ttl_seconds=settings.cache_config.job_ttl_seconds,
+)
+
+
+def start_background_job(name: str, total: int, work: Callable[[Callable[[int], None]], None]) -> BackgroundJobState:
+    """Run `work` on the background job pool and track its progress.
+
+    Args:
+        name (str): What the job does, reported with its state.
+        total (int): Number of items the job processes.
+        work (Callable): Does the work, calling the given callback with the number of items finished.
+
+    Returns:
+        BackgroundJobState: The state of the started job.
+    """
+    job = BackgroundJob(name, total)
+    background_jobs.set(job.id, job)
+
+    def run() -> None:
+        try:
+            work(job.advance)
+            job.finish()
+        except Exception as e:
+            logger.error(f"Background job {job.id} ({name}) failed: {e}")
+            job.finish(str(e))
+
+    _job_executor.submit(run)
+    return job.state()
+
+
+def get_background_job(job_id: str) -> BackgroundJobState:
+    job = background_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job with id {job_id} not found")
+    return job.state()
@@ -0,0 +1,82 @@
+from functools import partial
+from typing import Any, Iterable, Iterator, Sequence, TypeVar
+
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference, DocumentSnapshot, Query  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.core.database import fan_out
+
+T = TypeVar("T")
+
+# Firestore does not document a hard cap for batch gets, but large requests are slower and prone to
+# deadline errors, so keys are sent in chunks of this size.
+GET_ALL_CHUNK_SIZE = 100
+
+# Firestore rejects `in` filters with more values than this.
+IN_FILTER_MAX_VALUES = 30
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[list[T]]:
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
+def get_all_in_chunks(
+    db_ref: firestore.Client,
+    refs: Iterable[DocumentReference],
+    field_paths: list[str] | None = None,
+    transaction: Any = None,
+) -> list[DocumentSnapshot]:
+    """Read many documents with as few batched `get_all` calls as Firestore allows.
+
+    Duplicate references are read once. Missing documents are returned with `exists == False`.
+
+    Args:
+        db_ref (firestore.Client): The Firestore client.
+        refs (Iterable[DocumentReference]): The documents to read.
+        field_paths (list[str] | None): Optional projection, only these fields are returned.
+        transaction (Transaction | None): Optional transaction to read in.
+
+    Returns:
+        list[DocumentSnapshot]: One snapshot per unique reference.
+    """
+    unique_refs = list({ref.path: ref for ref in refs}.values())
+
+    snapshots = []
+    for chunk in chunked(unique_refs, GET_ALL_CHUNK_SIZE):
+        snapshots.extend(db_ref.get_all(chunk, field_paths=field_paths, transaction=transaction))
+
+    return snapshots
+
+
+def query_in_chunks(
+    query: Query, field_path: str, values: Iterable[Any], transaction: Any = None
+) -> list[DocumentSnapshot]:
+    """Run a query with an `in` filter over any number of values.
+
+    Values are split into chunks Firestore accepts and the chunk queries run concurrently, so a large
+    filter costs about as long as a single query. Duplicate values are queried once.
+
+    Args:
+        query (Query): The query without the `in` filter.
+        field_path (str): The field the `in` filter applies to.
+        values (Iterable[Any]): The values to match.
+        transaction (Transaction | None): Optional transaction to read in.
+
+    Returns:
+        list[DocumentSnapshot]: The documents matched by any chunk.
+    """
+    unique_values = list(dict.fromkeys(values))
+
+    def run_chunk(chunk: list[Any]) -> list[DocumentSnapshot]:
+        chunk_query = query.where(filter=FieldFilter(field_path, "in", chunk))
+        return list(transaction.get(chunk_query) if transaction is not None else chunk_query.stream())
+
+    chunks = list(chunked(unique_values, IN_FILTER_MAX_VALUES))
+    if len(chunks) <= 1:
+        return run_chunk(chunks[0]) if chunks else []
+
+    return [
+        snapshot for snapshots in fan_out(*(partial(run_chunk, chunk) for chunk in chunks)) for snapshot in snapshots
+    ]
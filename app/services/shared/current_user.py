@@ -0,0 +1,22 @@
+from fastapi import Request
+
+from app.core.database import run_in_database_executor
+from app.core.middleware import AuthMiddleware
+from app.models.user import User
+
+
+async def get_current_user(request: Request) -> User:
+    """Load the profile of the authenticated user, creating it on first login.
+
+    The result is kept on `request.state.user`, so the profile is read at most once per request.
+    """
+    user = getattr(request.state, "user", None)
+    if user is None:
+        user = await run_in_database_executor(AuthMiddleware.persist_user_to_database, request.state.token_claims)
+        request.state.user = user
+    return user
+
+
+async def get_current_user_id(request: Request) -> str:
+    """Get the uid of the authenticated user straight from the verified token, without loading the profile."""
+    return str(request.state.user_id)
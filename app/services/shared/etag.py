@@ -0,0 +1,23 @@
+import hashlib
+
+
+def make_strong_etag(body: bytes) -> str:
+    """Derive a strong ETag from the exact bytes sent to the client."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an `If-None-Match` header against the current ETag of a resource.
+
+    Args:
+        if_none_match (str | None): Raw header value, possibly a comma separated list or `*`.
+        etag (str): The current strong ETag, including quotes.
+
+    Returns:
+        bool: True if the client already holds the current representation.
+    """
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, NamedTuple
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    content: bytes | None = None
+    detail: str | None = None
+
+
+class StoredEntry(NamedTuple):
+    fingerprint: str
+    response: StoredResponse
+
+
+idempotency_cache: TTLCache[tuple[str, str, str], StoredEntry] = TTLCache(
+    "idempotency",
+    max_entries=settings.cache_config.idempotency_max_entries,
+    ttl_seconds=settings.cache_config.idempotency_ttl_seconds,
+)
+
+# Requests that are still running, keyed like `idempotency_cache`. Only touched from the event loop.
+_in_flight: dict[tuple[str, str, str], tuple[str, asyncio.Future]] = {}
+
+
+def fingerprint_payload(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def replay(response: StoredResponse) -> StoredResponse:
+    if response.detail is not None:
+        raise HTTPException(status_code=response.status_code, detail=response.detail)
+    return response
+
+
+def check_reused_key(idempotency_key: str, fingerprint: str, stored_fingerprint: str) -> None:
+    if fingerprint != stored_fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Idempotency key {idempotency_key} was already used with a different request",
+        )
+
+
+async def run_idempotent(
+    scope: str,
+    user_id: str,
+    idempotency_key: str | None,
+    payload: BaseModel,
+    call: Callable[[], Awaitable[StoredResponse]],
+) -> StoredResponse:
+    """Run a request at most once per `Idempotency-Key`.
+
+    A key that was seen before replays the stored response, or the stored rejection, without
+    running `call` again. A duplicate that arrives while the first request is still running waits
+    for it and gets the same result, or runs `call` itself if the first request is cancelled.
+    Server errors are not stored, so the client can retry them.
+
+    Args:
+        scope (str): The operation, keys of different operations never collide.
+        user_id (str): The caller, keys of different users never collide.
+        idempotency_key (str | None): The `Idempotency-Key` header, None runs `call` as is.
+        payload (BaseModel): The request body, reusing a key with a different body is rejected.
+        call (Callable[[], Awaitable[StoredResponse]]): Runs the request.
+
+    Raises:
+        HTTPException: 422 if the key is too long or was used with a different body, or the stored
+            rejection of the original request.
+
+    Returns:
+        StoredResponse: The response of the original request.
+    """
+    if idempotency_key is None:
+        return await call()
+
+    if len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Idempotency key cannot be longer than {MAX_IDEMPOTENCY_KEY_LENGTH} characters",
+        )
+
+    key = (scope, user_id, idempotency_key)
+    fingerprint = fingerprint_payload(payload)
+
+    while True:
+        stored = idempotency_cache.get(key)
+        if stored is not None:
+            check_reused_key(idempotency_key, fingerprint, stored.fingerprint)
+            return replay(stored.response)
+
+        in_flight = _in_flight.get(key)
+        if in_flight is None:
+            break
+
+        check_reused_key(idempotency_key, fingerprint, in_flight[0])
+        try:
+            return replay(await asyncio.shield(in_flight[1]))
+        except asyncio.CancelledError:
+            current_task = asyncio.current_task()
+            if not in_flight[1].cancelled() or (current_task is not None and current_task.cancelling()):
+                raise
+            # The original request was cancelled before it finished, e.g. its client disconnected,
+            # so this duplicate runs the request in its place.
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = (fingerprint, future)
+    try:
+        try:
+            response = await call()
+        except HTTPException as e:
+            if e.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                raise
+            response = StoredResponse(e.status_code, detail=e.detail)
+
+        idempotency_cache.set(key, StoredEntry(fingerprint, response))
+        future.set_result(response)
+        return replay(response)
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        elif not future.done():
+            future.set_exception(e)
+            # Mark the exception as retrieved when no duplicate is waiting for it.
+            future.exception()
+        raise
+    finally:
+        del _in_flight[key]
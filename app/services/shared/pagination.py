@@ -0,0 +1,101 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from google.cloud.firestore import DocumentSnapshot, Query  # type: ignore
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(snapshot: DocumentSnapshot) -> str:
+    """Build an opaque continuation token pointing just after `snapshot` in `created_at` order."""
+    position = {"created_at": snapshot.get("created_at").isoformat(), "id": snapshot.id}
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Turn a continuation token back into `start_after` values for a query ordered by `newest_first`.
+
+    Raises:
+        HTTPException: 400 if the token was not produced by `encode_cursor`.
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return {"created_at": datetime.fromisoformat(position["created_at"]), "__name__": position["id"]}
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def encode_id_cursor(snapshot: DocumentSnapshot) -> str:
+    """Build an opaque continuation token pointing just after `snapshot` in document id order."""
+    return base64.urlsafe_b64encode(json.dumps({"id": snapshot.id}).encode("utf-8")).decode("ascii")
+
+
+def decode_id_cursor(cursor: str) -> str:
+    """Turn a token made by `encode_id_cursor` back into a document id.
+
+    Raises:
+        HTTPException: 400 if the token was not produced by `encode_id_cursor`.
+    """
+    try:
+        return str(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["id"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def newest_first(query: Query) -> Query:
+    """Order a query by `created_at` descending, with the document id as a stable tie breaker."""
+    return query.order_by("created_at", direction=Query.DESCENDING).order_by("__name__", direction=Query.DESCENDING)
+
+
+def get_page(query: Query, page_size: int, cursor: str | None = None) -> tuple[list[DocumentSnapshot], str | None]:
+    """Read one page of a query, newest documents first.
+
+    Args:
+        query (Query): The filtered query, without ordering.
+        page_size (int): Number of documents per page, capped at `MAX_PAGE_SIZE`.
+        cursor (str | None): Continuation token returned with the previous page.
+
+    Returns:
+        tuple[list[DocumentSnapshot], str | None]: The page and the token of the next page, None on the last page.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    query = newest_first(query)
+    if cursor is not None:
+        query = query.start_after(decode_cursor(cursor))
+
+    snapshots = list(query.limit(page_size + 1).stream())
+    if len(snapshots) <= page_size:
+        return snapshots, None
+
+    snapshots = snapshots[:page_size]
+    return snapshots, encode_cursor(snapshots[-1])
+
+
+def get_page_by_id(
+    query: Query, page_size: int, cursor: str | None = None
+) -> tuple[list[DocumentSnapshot], str | None]:
+    """Read one page of a query ordered by document id, for collections without `created_at`.
+
+    Args:
+        query (Query): The filtered query, without ordering.
+        page_size (int): Number of documents per page, capped at `MAX_PAGE_SIZE`.
+        cursor (str | None): Continuation token returned with the previous page.
+
+    Returns:
+        tuple[list[DocumentSnapshot], str | None]: The page and the token of the next page, None on the last page.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    query = query.order_by("__name__")
+    if cursor is not None:
+        query = query.start_after({"__name__": decode_id_cursor(cursor)})
+
+    snapshots = list(query.limit(page_size + 1).stream())
+    if len(snapshots) <= page_size:
+        return snapshots, None
+
+    snapshots = snapshots[:page_size]
+    return snapshots, encode_id_cursor(snapshots[-1])
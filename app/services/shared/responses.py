@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi import Response
+
+
+class RawJSONResponse(Response):
+    """A JSON response for content that is already encoded, sent as is instead of encoded again."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content
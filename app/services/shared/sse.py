@@ -0,0 +1,66 @@
+import asyncio
+from typing import AsyncIterator
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SSE_HEARTBEAT = b": heartbeat\n\n"
+
+
+def format_sse(event: str, data: str, event_id: str | None = None) -> bytes:
+    """Encode one Server-Sent Event. `data` must be a single line, e.g. compact JSON."""
+    message = f"id: {event_id}\n" if event_id is not None else ""
+    message += f"event: {event}\ndata: {data}\n\n"
+    return message.encode("utf-8")
+
+
+class EventSubscriber:
+    """A bounded queue of encoded events for one connected client.
+
+    Events are offered from any thread through `offer_threadsafe`. A client that falls
+    `max_size` events behind is disconnected instead of buffering without limit.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max_size)
+        self.closed = False
+
+    def offer(self, message: bytes) -> None:
+        """Queue a message. Must be called on the subscriber's event loop."""
+        if self.closed:
+            return
+        if self.queue.full():
+            self.close()
+            return
+        self.queue.put_nowait(message)
+
+    def offer_threadsafe(self, message: bytes) -> None:
+        self.loop.call_soon_threadsafe(self.offer, message)
+
+    def close(self) -> None:
+        """End the stream right away, dropping undelivered events; the client resynchronises on reconnect."""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def next_message(self, timeout: float) -> bytes | None:
+        """Wait for the next queued message, None if the stream ended or nothing arrived in time."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def stream(self, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+        """Yield queued messages, and a heartbeat comment whenever the stream has been idle for a while."""
+        while True:
+            try:
+                message = await asyncio.wait_for(self.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield SSE_HEARTBEAT
+                continue
+
+            if message is None:
+                return
+            yield message
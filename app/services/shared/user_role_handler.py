@@ -1,12 +1,13 @@
 from typing import Any
 
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, status
 
+from app.models.user import User
+from app.services.shared.current_user import get_current_user
 
-def role_required(expected_role: str) -> Any:
-    async def dependency(request: Request) -> None:
-        user = request.state.user
 
+def role_required(expected_role: str) -> Any:
+    async def dependency(user: User = Depends(get_current_user)) -> None:
         if not user or user.role != expected_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,81 @@
+from functools import partial
+from typing import Iterable
+
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference, Transaction  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.core.database import fan_out
+from app.models.collection_names import CollectionNames
+from app.services.shared.batching import get_all_in_chunks
+
+BEST_PRICES_FIELD = "best_prices"
+BEST_PRICE_OFFER_FIELDS = ["dish_id", "special_price"]
+
+
+def lowest_special_prices(offer_docs: Iterable) -> dict[str, float]:
+    """Lowest special price per dish id among special offers."""
+    best_prices: dict[str, float] = {}
+    for offer_doc in offer_docs:
+        if not offer_doc.exists:
+            continue
+
+        offer = offer_doc.to_dict()
+        dish_id = offer["dish_id"].id
+        special_price = float(offer["special_price"])
+        best_prices[dish_id] = min(best_prices.get(dish_id, special_price), special_price)
+
+    return best_prices
+
+
+def refresh_best_prices(restaurant_ref: DocumentReference, db_ref: firestore.Client) -> dict[str, float]:
+    """Recompute the best-price table of a restaurant from its special offers.
+
+    The table maps dish ids to the lowest special price the restaurant offers for them and is stored
+    in the `best_prices` field of the restaurant. The restaurant and its offers are read in a
+    transaction, so concurrent refreshes never store a table built from outdated offers.
+
+    Returns:
+        dict[str, float]: The new table, empty if the restaurant does not exist.
+    """
+
+    @firestore.transactional
+    def transaction_logic(transaction: Transaction) -> dict[str, float]:
+        restaurant_doc = restaurant_ref.get(field_paths=["special_offers"], transaction=transaction)
+        if not restaurant_doc.exists:
+            return {}
+
+        offer_refs = (restaurant_doc.to_dict() or {}).get("special_offers") or []
+        offer_docs = get_all_in_chunks(db_ref, offer_refs, field_paths=BEST_PRICE_OFFER_FIELDS, transaction=transaction)
+        best_prices = lowest_special_prices(offer_docs)
+        transaction.update(restaurant_ref, {BEST_PRICES_FIELD: best_prices})
+        return best_prices
+
+    return transaction_logic(db_ref.transaction())
+
+
+def refresh_restaurants_best_prices(restaurant_refs: Iterable[DocumentReference], db_ref: firestore.Client) -> None:
+    """Recompute the best-price tables of many restaurants concurrently."""
+    fan_out(*(partial(refresh_best_prices, restaurant_ref, db_ref) for restaurant_ref in restaurant_refs))
+
+
+def refresh_offer_holders_best_prices(offer_ref: DocumentReference, db_ref: firestore.Client) -> None:
+    """Recompute the best-price tables of every restaurant listing a special offer."""
+    restaurant_docs = (
+        db_ref.collection(CollectionNames.RESTAURANTS)
+        .where(filter=FieldFilter("special_offers", "array_contains", offer_ref))
+        .select([])
+        .stream()
+    )
+    refresh_restaurants_best_prices([doc.reference for doc in restaurant_docs], db_ref)
+
+
+def get_best_prices(restaurant_ref: DocumentReference, db_ref: firestore.Client) -> dict[str, float]:
+    """Get the best-price table of a restaurant, building it on first use for restaurants that predate it."""
+    restaurant_doc = restaurant_ref.get(field_paths=[BEST_PRICES_FIELD])
+    best_prices = (restaurant_doc.to_dict() or {}).get(BEST_PRICES_FIELD) if restaurant_doc.exists else {}
+
+    if best_prices is None:
+        return refresh_best_prices(restaurant_ref, db_ref)
+
+    return best_prices
@@ -2,12 +2,16 @@ import random
 
 from fastapi import HTTPException, status
 from firebase_admin import firestore  # type: ignore
-from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore import ArrayUnion  # type: ignore
 
+from app.core.user_cache import invalidate_cached_user
 from app.models.collection_names import CollectionNames
 from app.models.special_offer import SpecialOffer
 from app.models.user import User
+from app.services.dishes.menu_cache import get_available_dishes
 from app.services.restaurants.shared import check_restaurant_existence
+from app.services.shared.batching import get_all_in_chunks
+from app.services.special_offers.shared import hydrate_special_offers
 
 
 def get_restaurant_special_offers(restaurant_id: str, db_ref: firestore.Client) -> list[dict]:
@@ -25,123 +29,62 @@ def get_restaurant_special_offers(restaurant_id: str, db_ref: firestore.Client)
     if not special_offer_refs:
         return []
 
-    special_offers_docs = db_ref.get_all(special_offer_refs)
-    result = []
-
-    for doc in special_offers_docs:
-        if not doc.exists:
-            continue
-
-        offer_data = doc.to_dict()
-        dish_ref = offer_data.get("dish_id")
-        dish_doc = dish_ref.get()
-
-        if not dish_doc.exists:
-            continue
-
-        dish_data = dish_doc.to_dict()
-
-        result.append(
-            {
-                "id": doc.id,
-                "name": offer_data.get("name"),
-                "dish_id": dish_ref.id,
-                "dish_name": dish_data.get("name"),
-                "dish_description": dish_data.get("description"),
-                "original_price": dish_data.get("price"),
-                "special_price": offer_data.get("special_price"),
-            }
-        )
-
-    return result
+    return hydrate_special_offers(get_all_in_chunks(db_ref, special_offer_refs), db_ref)
 
 
 def get_user_special_offers(user: User, db_ref: firestore.Client) -> list[dict]:
     if not user.special_offers:
         return []
 
-    special_offers_docs = db_ref.get_all(user.special_offers)
-    result = []
-
-    for doc in special_offers_docs:
-        if not doc.exists:
-            continue
-
-        offer_data = doc.to_dict()
-        dish_ref = offer_data.get("dish_id")
-        dish_doc = dish_ref.get()
+    return hydrate_special_offers(get_all_in_chunks(db_ref, user.special_offers), db_ref)
 
-        if not dish_doc.exists:
-            continue
-
-        dish_data = dish_doc.to_dict()
-
-        result.append(
-            {
-                "id": doc.id,
-                "dish_id": dish_ref.id,
-                "dish_name": dish_data.get("name"),
-                "dish_description": dish_data.get("description"),
-                "original_price": dish_data.get("price"),
-                "special_price": offer_data.get("special_price"),
-            }
-        )
 
-    return result
+def generate_special_offer_for_user(user: User, restaurant_id: str, db_ref: firestore.Client) -> dict:
+    """Create a special offer on a random available dish of a restaurant and give it to the user.
 
+    The dish is picked from the cached menu of the restaurant, and the offer and the user's offer
+    list are written in a single batch.
 
-def generate_special_offer_for_user(user: User, restaurant_id: str, db_ref: firestore.Client) -> dict:
-    restaurant_ref = check_restaurant_existence(restaurant_id, db_ref)
+    Args:
+        user (User): The authenticated user.
+        restaurant_id (str): The ID of the restaurant.
+        db_ref (firestore.Client): The Firestore client.
 
-    # Using only one db filter to avoid the composite index requirement
-    restaurant_dishes = (
-        db_ref.collection(CollectionNames.RESTAURANT_DISHES)
-        .where(filter=FieldFilter("restaurant_id", "==", restaurant_ref))
-        .stream()
-    )
+    Raises:
+        HTTPException: 422 if the restaurant does not exist, 404 if it has no available dishes.
 
-    dish_refs = []
-    for dish_doc in restaurant_dishes:
-        dish_data = dish_doc.to_dict()
-        if dish_data.get("is_available", False) and dish_data.get("stock_count", 0) > 0:
-            dish_refs.append(dish_data.get("dish_id"))
+    Returns:
+        dict: The new special offer with its dish.
+    """
+    available_dishes = get_available_dishes(restaurant_id, db_ref)
 
-    if not dish_refs:
+    if not available_dishes:
+        check_restaurant_existence(restaurant_id, db_ref)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No available dishes found for restaurant with id {restaurant_id}",
         )
 
-    selected_dish_ref = random.choice(dish_refs)
-    dish_doc = selected_dish_ref.get()
-
-    if not dish_doc.exists:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Selected dish not found")
-
-    dish_data = dish_doc.to_dict()
-    original_price = dish_data.get("base_price")
-
-    if original_price is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Dish data is missing base_price field"
-        )
-
-    special_price = round(original_price * (1 - random.uniform(0.1, 0.9)), 2)
+    dish = random.choice(available_dishes)
+    dish_ref = db_ref.collection(CollectionNames.DISHES).document(dish["id"])
+    special_price = round(dish["price"] * (1 - random.uniform(0.1, 0.9)), 2)
+    special_offer = SpecialOffer(dish_id=dish_ref, name=dish["name"], special_price=special_price)
 
-    _, special_offer_ref = db_ref.collection(CollectionNames.SPECIAL_OFFERS).add(
-        SpecialOffer(dish_id=selected_dish_ref, special_price=special_price).model_dump()
+    special_offer_ref = db_ref.collection(CollectionNames.SPECIAL_OFFERS).document()
+    batch = db_ref.batch()
+    batch.set(special_offer_ref, special_offer.model_dump())
+    batch.update(
+        db_ref.collection(CollectionNames.USERS).document(user.id), {"special_offers": ArrayUnion([special_offer_ref])}
     )
-
-    user_special_offers = user.special_offers.copy() if user.special_offers else []
-    user_special_offers.append(special_offer_ref)
-
-    db_ref.collection(CollectionNames.USERS).document(user.id).update({"special_offers": user_special_offers})
+    batch.commit()
+    invalidate_cached_user(user.id)
 
     return {
         "id": special_offer_ref.id,
-        "dish_id": selected_dish_ref.id,
-        "dish_name": dish_data.get("name"),
-        "dish_description": dish_data.get("description"),
-        "original_price": original_price,
+        "name": special_offer.name,
+        "dish_id": dish["id"],
+        "dish_name": dish["name"],
+        "dish_description": dish["description"],
+        "original_price": dish["price"],
         "special_price": special_price,
     }
@@ -1,37 +1,48 @@
+from functools import partial
+from typing import Any, Callable
+
 from fastapi import HTTPException, status
 from firebase_admin import firestore  # type: ignore
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import ArrayRemove, ArrayUnion, DocumentReference  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
 
+from app.core.database import fan_out
+from app.core.user_cache import invalidate_cached_user
 from app.models.collection_names import CollectionNames
 from app.models.special_offer import SpecialOffer
-from app.services.restaurants.shared import check_restaurant_existence
-
+from app.services.shared.background_jobs import start_background_job
+from app.services.shared.batching import chunked, get_all_in_chunks
+from app.services.shared.pagination import DEFAULT_PAGE_SIZE, get_page_by_id
+from app.services.special_offers.best_prices import (
+    refresh_best_prices,
+    refresh_offer_holders_best_prices,
+    refresh_restaurants_best_prices,
+)
+from app.services.special_offers.shared import hydrate_special_offers
 
-def get_all_special_offers(db_ref: firestore.Client) -> list[dict]:
-    special_offers_docs = db_ref.collection(CollectionNames.SPECIAL_OFFERS).stream()
-    result = []
+SPECIAL_OFFER_LISTING_FIELDS = ["name", "dish_id", "special_price"]
+WRITE_BATCH_SIZE = 500
+BACKGROUND_DELETION_THRESHOLD = 2000
 
-    for doc in special_offers_docs:
-        offer_data = doc.to_dict()
-        dish_ref = offer_data.get("dish_id")
-        dish_doc = dish_ref.get()
 
-        if not dish_doc.exists:
-            continue
+def get_all_special_offers(
+    db_ref: firestore.Client, page_size: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> dict:
+    """Get one page of all special offers with their dishes, ordered by id.
 
-        dish_data = dish_doc.to_dict()
+    Args:
+        db_ref (firestore.Client): The Firestore client.
+        page_size (int): Number of offers per page, capped at `MAX_PAGE_SIZE`.
+        cursor (str | None): Continuation token returned with the previous page.
 
-        result.append(
-            {
-                "id": doc.id,
-                "dish_id": dish_ref.id,
-                "dish_name": dish_data.get("name"),
-                "dish_description": dish_data.get("description"),
-                "original_price": dish_data.get("base_price"),
-                "special_price": offer_data.get("special_price"),
-            }
-        )
+    Returns:
+        dict: `special_offers` of the page and `next_cursor`, which is None on the last page.
+    """
+    query = db_ref.collection(CollectionNames.SPECIAL_OFFERS).select(SPECIAL_OFFER_LISTING_FIELDS)
+    offer_docs, next_cursor = get_page_by_id(query, page_size, cursor)
 
-    return result
+    return {"special_offers": hydrate_special_offers(offer_docs, db_ref), "next_cursor": next_cursor}
 
 
 def get_special_offer_by_id(offer_id: str, db_ref: firestore.Client) -> dict:
@@ -40,25 +51,14 @@ def get_special_offer_by_id(offer_id: str, db_ref: firestore.Client) -> dict:
     if not offer_doc.exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Special offer with id {offer_id} not found")
 
-    offer_data = offer_doc.to_dict()
-    dish_ref = offer_data.get("dish_id")
-    dish_doc = dish_ref.get()
+    offers = hydrate_special_offers([offer_doc], db_ref)
 
-    if not dish_doc.exists:
+    if not offers:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Dish associated with special offer {offer_id} not found"
         )
 
-    dish_data = dish_doc.to_dict()
-
-    return {
-        "id": offer_doc.id,
-        "dish_id": dish_ref.id,
-        "dish_name": dish_data.get("name"),
-        "dish_description": dish_data.get("description"),
-        "original_price": dish_data.get("base_price"),
-        "special_price": offer_data.get("special_price"),
-    }
+    return offers[0]
 
 
 def create_special_offer(dish_id: str, special_price: float, db_ref: firestore.Client) -> dict:
@@ -122,7 +122,9 @@ def update_special_offer(offer_id: str, special_price: float, db_ref: firestore.
             status_code=status.HTTP_400_BAD_REQUEST, detail="Special price must be lower than the original price"
         )
 
-    db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id).update({"special_price": special_price})
+    offer_ref = db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id)
+    offer_ref.update({"special_price": special_price})
+    refresh_offer_holders_best_prices(offer_ref, db_ref)
 
     return {
         "id": offer_id,
@@ -134,78 +136,173 @@ def update_special_offer(offer_id: str, special_price: float, db_ref: firestore.
     }
 
 
-def delete_special_offer(offer_id: str, db_ref: firestore.Client) -> dict:
-    offer_doc = db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id).get()
+def check_special_offer_existence(offer_id: str, db_ref: firestore.Client) -> DocumentReference:
+    offer_ref = db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id)
 
-    if not offer_doc.exists:
+    if not offer_ref.get(field_paths=[]).exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Special offer with id {offer_id} not found")
 
-    for restaurant_doc in (
-        db_ref.collection(CollectionNames.RESTAURANTS)
-        .where("special_offers", "array_contains", db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id))
-        .stream()
-    ):
-        restaurant_data = restaurant_doc.to_dict()
-        special_offers = restaurant_data.get("special_offers", [])
-        updated_offers = [offer for offer in special_offers if offer.id != offer_id]
-        db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_doc.id).update(
-            {"special_offers": updated_offers}
-        )
+    return offer_ref
 
-    for user_doc in (
-        db_ref.collection(CollectionNames.USERS)
-        .where("special_offers", "array_contains", db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id))
-        .stream()
-    ):
-        user_data = user_doc.to_dict()
-        special_offers = user_data.get("special_offers", [])
-        updated_offers = [offer for offer in special_offers if offer.id != offer_id]
-        db_ref.collection(CollectionNames.USERS).document(user_doc.id).update({"special_offers": updated_offers})
 
-    db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id).delete()
+def find_special_offer_holders(
+    offer_ref: DocumentReference, db_ref: firestore.Client
+) -> tuple[list[DocumentReference], list[DocumentReference]]:
+    """Find the restaurants and users listing a special offer, running both queries concurrently."""
 
-    return {"message": f"Special offer with id {offer_id} deleted successfully"}
+    def holders(collection_name: CollectionNames) -> list[DocumentReference]:
+        holder_docs = (
+            db_ref.collection(collection_name)
+            .where(filter=FieldFilter("special_offers", "array_contains", offer_ref))
+            .select([])
+            .stream()
+        )
+        return [doc.reference for doc in holder_docs]
+
+    restaurant_refs, user_refs = fan_out(
+        partial(holders, CollectionNames.RESTAURANTS), partial(holders, CollectionNames.USERS)
+    )
+    return restaurant_refs, user_refs
+
+
+def finish_special_offer_deletion(
+    offer_ref: DocumentReference,
+    restaurant_refs: list[DocumentReference],
+    user_refs: list[DocumentReference],
+    db_ref: firestore.Client,
+    on_progress: Callable[[int], None] | None = None,
+) -> None:
+    """Remove a special offer from its holders and delete it.
+
+    Holders are updated with `ArrayRemove` in batches of at most `WRITE_BATCH_SIZE` writes, committed
+    concurrently. The offer is deleted only once every holder stopped listing it.
+    """
+
+    def remove_from_chunk(chunk: list[DocumentReference]) -> None:
+        batch = db_ref.batch()
+        for holder_ref in chunk:
+            batch.update(holder_ref, {"special_offers": ArrayRemove([offer_ref])})
+        batch.commit()
+        if on_progress is not None:
+            on_progress(len(chunk))
+
+    fan_out(*(partial(remove_from_chunk, chunk) for chunk in chunked(restaurant_refs + user_refs, WRITE_BATCH_SIZE)))
+
+    for user_ref in user_refs:
+        invalidate_cached_user(user_ref.id)
+
+    offer_ref.delete()
+    refresh_restaurants_best_prices(restaurant_refs, db_ref)
+
+
+def delete_special_offer(offer_id: str, db_ref: firestore.Client, background: bool = False) -> dict:
+    """Delete a special offer and remove it from every restaurant and user listing it.
+
+    Offers listed by more than `BACKGROUND_DELETION_THRESHOLD` documents, or any offer when
+    `background` is set, are deleted by a background job whose progress can be polled.
+
+    Args:
+        offer_id (str): The ID of the special offer.
+        db_ref (firestore.Client): The Firestore client.
+        background (bool): Always delete in a background job.
+
+    Raises:
+        HTTPException: 404 if the special offer does not exist.
+
+    Returns:
+        dict: A confirmation, or the `job` state when the deletion runs in the background.
+    """
+    offer_ref = check_special_offer_existence(offer_id, db_ref)
+    restaurant_refs, user_refs = find_special_offer_holders(offer_ref, db_ref)
+    holders_count = len(restaurant_refs) + len(user_refs)
+
+    if background or holders_count > BACKGROUND_DELETION_THRESHOLD:
+        job = start_background_job(
+            f"delete special offer {offer_id}",
+            holders_count,
+            lambda on_progress: finish_special_offer_deletion(
+                offer_ref, restaurant_refs, user_refs, db_ref, on_progress
+            ),
+        )
+        return {"message": f"Deletion of special offer with id {offer_id} started", "job": job.model_dump(mode="json")}
 
+    finish_special_offer_deletion(offer_ref, restaurant_refs, user_refs, db_ref)
 
-def add_special_offer_to_restaurant(restaurant_id: str, offer_id: str, db_ref: firestore.Client) -> dict:
-    restaurant_ref = check_restaurant_existence(restaurant_id, db_ref)
-    offer_ref = db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id)
-    offer_doc = offer_ref.get()
+    return {"message": f"Special offer with id {offer_id} deleted successfully"}
 
-    if not offer_doc.exists:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Special offer with id {offer_id} not found")
 
-    restaurant_doc = restaurant_ref.get()
-    restaurant_data = restaurant_doc.to_dict()
-    special_offers = restaurant_data.get("special_offers", [])
+def update_restaurant_special_offers(restaurant_id: str, transform: Any, db_ref: firestore.Client) -> None:
+    """Apply an array transform to the special offers of a restaurant without reading it first,
+    then refresh its best-price table.
 
-    if any(offer.id == offer_id for offer in special_offers):
+    Raises:
+        HTTPException: 422 if the restaurant does not exist.
+    """
+    restaurant_ref = db_ref.collection(CollectionNames.RESTAURANTS).document(restaurant_id)
+    try:
+        restaurant_ref.update({"special_offers": transform})
+    except NotFound:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Special offer with id {offer_id} already added to restaurant",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Incorrect restaurant id: {restaurant_id}"
         )
 
-    special_offers.append(offer_ref)
-    restaurant_ref.update({"special_offers": special_offers})
+    refresh_best_prices(restaurant_ref, db_ref)
+
+
+def add_special_offer_to_restaurant(restaurant_id: str, offer_id: str, db_ref: firestore.Client) -> dict:
+    """Add a special offer to a restaurant with `ArrayUnion`. Adding an offer the restaurant already has is a no-op."""
+    offer_ref = check_special_offer_existence(offer_id, db_ref)
+    update_restaurant_special_offers(restaurant_id, ArrayUnion([offer_ref]), db_ref)
 
     return {"message": f"Special offer added to restaurant {restaurant_id} successfully"}
 
 
-def remove_special_offer_from_restaurant(restaurant_id: str, offer_id: str, db_ref: firestore.Client) -> dict:
-    restaurant_ref = check_restaurant_existence(restaurant_id, db_ref)
+def add_special_offer_to_restaurants(offer_id: str, restaurant_ids: list[str], db_ref: firestore.Client) -> dict:
+    """Add a special offer to many restaurants in a single batched commit.
 
-    restaurant_doc = restaurant_ref.get()
-    restaurant_data = restaurant_doc.to_dict()
-    special_offers = restaurant_data.get("special_offers", [])
+    Args:
+        offer_id (str): The ID of the special offer.
+        restaurant_ids (list[str]): The restaurants to add it to.
+        db_ref (firestore.Client): The Firestore client.
 
-    updated_offers = [offer for offer in special_offers if offer.id != offer_id]
+    Raises:
+        HTTPException: 404 if the special offer does not exist, 422 if there are too many restaurants
+            or any of them does not exist, in which case none is changed.
 
-    if len(special_offers) == len(updated_offers):
+    Returns:
+        dict: A confirmation.
+    """
+    restaurant_ids = list(dict.fromkeys(restaurant_ids))
+    if len(restaurant_ids) > WRITE_BATCH_SIZE:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Special offer with id {offer_id} not found in restaurant {restaurant_id}",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Cannot add a special offer to more than {WRITE_BATCH_SIZE} restaurants at once",
         )
 
-    restaurant_ref.update({"special_offers": updated_offers})
+    offer_ref = check_special_offer_existence(offer_id, db_ref)
+    restaurant_refs = [db_ref.collection(CollectionNames.RESTAURANTS).document(rid) for rid in restaurant_ids]
+
+    batch = db_ref.batch()
+    for restaurant_ref in restaurant_refs:
+        batch.update(restaurant_ref, {"special_offers": ArrayUnion([offer_ref])})
+
+    try:
+        batch.commit()
+    except NotFound:
+        # The batch is atomic, so nothing was written. Only now pay for reads to name the missing restaurants.
+        missing_ids = [doc.id for doc in get_all_in_chunks(db_ref, restaurant_refs, field_paths=[]) if not doc.exists]
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Incorrect restaurant ids: {missing_ids}"
+        )
+
+    refresh_restaurants_best_prices(restaurant_refs, db_ref)
+
+    return {"message": f"Special offer added to {len(restaurant_ids)} restaurants successfully"}
+
+
+def remove_special_offer_from_restaurant(restaurant_id: str, offer_id: str, db_ref: firestore.Client) -> dict:
+    """Remove a special offer from a restaurant with `ArrayRemove`. Removing an offer it does not have is a no-op."""
+    offer_ref = db_ref.collection(CollectionNames.SPECIAL_OFFERS).document(offer_id)
+    update_restaurant_special_offers(restaurant_id, ArrayRemove([offer_ref]), db_ref)
 
     return {"message": f"Special offer removed from restaurant {restaurant_id} successfully"}
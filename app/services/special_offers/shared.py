@@ -0,0 +1,87 @@
+from typing import Iterable
+
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference, DocumentSnapshot  # type: ignore
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.services.shared.batching import get_all_in_chunks
+
+OFFER_DISH_FIELDS = ["name", "description", "base_price", "price"]
+
+dish_summary_cache: TTLCache[str, dict] = TTLCache(
+    "dish_summaries",
+    max_entries=settings.cache_config.dish_summary_max_entries,
+    ttl_seconds=settings.cache_config.dish_summary_ttl_seconds,
+)
+
+
+def get_dish_summaries(dish_refs: Iterable[DocumentReference], db_ref: firestore.Client) -> dict[str, dict]:
+    """Get the fields special offers show about their dishes, reading uncached dishes with one batched read.
+
+    Returns:
+        dict[str, dict]: Summary per dish id, missing dishes are left out.
+    """
+    summaries = {}
+    missing_refs = []
+
+    for dish_ref in dish_refs:
+        summary = dish_summary_cache.get(dish_ref.id)
+        if summary is None:
+            missing_refs.append(dish_ref)
+        else:
+            summaries[dish_ref.id] = summary
+
+    for dish_doc in get_all_in_chunks(db_ref, missing_refs, field_paths=OFFER_DISH_FIELDS):
+        if not dish_doc.exists:
+            continue
+
+        dish_data = dish_doc.to_dict()
+        summary = {
+            "dish_name": dish_data.get("name"),
+            "dish_description": dish_data.get("description"),
+            "original_price": dish_data.get("base_price", dish_data.get("price")),
+        }
+        dish_summary_cache.set(dish_doc.id, summary)
+        summaries[dish_doc.id] = summary
+
+    return summaries
+
+
+def invalidate_dish_summary(dish_id: str) -> None:
+    dish_summary_cache.invalidate(dish_id)
+
+
+def hydrate_special_offers(offer_docs: Iterable[DocumentSnapshot], db_ref: firestore.Client) -> list[dict]:
+    """Join special offers with their dishes.
+
+    Missing offers and offers whose dish no longer exists are left out.
+
+    Args:
+        offer_docs (Iterable[DocumentSnapshot]): The special offers.
+        db_ref (firestore.Client): The Firestore client.
+
+    Returns:
+        list[dict]: The offers with their dish name, description and original price, in input order.
+    """
+    offers = [(doc.id, doc.to_dict()) for doc in offer_docs if doc.exists]
+    dish_summaries = get_dish_summaries((offer_data["dish_id"] for _, offer_data in offers), db_ref)
+    result = []
+
+    for offer_id, offer_data in offers:
+        dish_ref = offer_data["dish_id"]
+        dish_summary = dish_summaries.get(dish_ref.id)
+        if dish_summary is None:
+            continue
+
+        result.append(
+            {
+                "id": offer_id,
+                "name": offer_data.get("name"),
+                "dish_id": dish_ref.id,
+                **dish_summary,
+                "special_price": offer_data.get("special_price"),
+            }
+        )
+
+    return result
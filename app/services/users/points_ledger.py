@@ -0,0 +1,81 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from firebase_admin import firestore  # type: ignore
+from google.cloud.firestore import DocumentReference, Increment, Transaction  # type: ignore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.models.collection_names import CollectionNames
+from app.models.points_ledger import PointsLedgerEntry, PointsLedgerReason
+
+
+def get_ledger_entry_ref(db_ref: firestore.Client, key: str, reason: PointsLedgerReason) -> DocumentReference:
+    """Ledger entries have deterministic ids, so writing the same change twice keeps a single entry."""
+    return db_ref.collection(CollectionNames.POINTS_LEDGER).document(f"{key}_{reason.value}")
+
+
+def record_order_points(
+    writer: Any, db_ref: firestore.Client, user_id: str, order_id: str, points_spent: int, points_earned: int
+) -> None:
+    """Queue the ledger entries and the balance change of an order on a transaction or write batch.
+
+    The balance is changed with a single `Increment`, so concurrent orders of the same user never
+    overwrite each other's changes.
+
+    Args:
+        writer (Transaction | WriteBatch): Where the writes are queued.
+        db_ref (firestore.Client): The Firestore client.
+        user_id (str): The ID of the user.
+        order_id (str): The ID of the order.
+        points_spent (int): Points spent on the order.
+        points_earned (int): Points the order earns.
+    """
+    now = datetime.now(UTC)
+    changes = [(PointsLedgerReason.ORDER_SPENT, -points_spent), (PointsLedgerReason.ORDER_EARNED, points_earned)]
+
+    for reason, delta in changes:
+        if delta == 0:
+            continue
+        entry = PointsLedgerEntry(user_id=user_id, order_id=order_id, reason=reason, delta=delta, created_at=now)
+        writer.set(get_ledger_entry_ref(db_ref, order_id, reason), entry.model_dump())
+
+    if points_earned != points_spent:
+        writer.update(
+            db_ref.collection(CollectionNames.USERS).document(user_id),
+            {"points": Increment(points_earned - points_spent)},
+        )
+
+
+def sum_ledger(snapshots: Any) -> dict[str, int]:
+    balances: dict[str, int] = {}
+    for snapshot in snapshots:
+        entry = snapshot.to_dict()
+        balances[entry["user_id"]] = balances.get(entry["user_id"], 0) + entry["delta"]
+    return balances
+
+
+def reconcile_user_balance(user_id: str, db_ref: firestore.Client) -> int:
+    """Set a user's balance to the sum of their ledger entries.
+
+    The entries and the balance are read in one transaction, so an order committed at the same
+    time is either included in the sum or retried after the correction.
+
+    Returns:
+        int: The reconciled balance.
+    """
+    user_ref = db_ref.collection(CollectionNames.USERS).document(user_id)
+    entries_query = (
+        db_ref.collection(CollectionNames.POINTS_LEDGER)
+        .where(filter=FieldFilter("user_id", "==", user_id))
+        .select(["user_id", "delta"])
+    )
+
+    @firestore.transactional
+    def transaction_logic(transaction: Transaction) -> int:
+        balance = sum_ledger(transaction.get(entries_query)).get(user_id, 0)
+        user_doc = user_ref.get(transaction=transaction, field_paths=["points"])
+        if user_doc.exists and user_doc.to_dict().get("points", 0) != balance:
+            transaction.update(user_ref, {"points": balance})
+        return balance
+
+    return transaction_logic(db_ref.transaction())
@@ -5,8 +5,8 @@ from fastapi import HTTPException, status
 from firebase_admin import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 
-from app.core.firebase_auth import (change_user_password, create_firebase_user,
-                                    delete_firebase_user)
+from app.core.firebase_auth import change_user_password, create_firebase_user, delete_firebase_user
+from app.core.user_cache import invalidate_cached_user
 from app.models.collection_names import CollectionNames
 from app.models.user import PersistedUser, UserRole
 from app.services.restaurants.shared import check_restaurant_existence
@@ -120,6 +120,7 @@ def assign_worker_to_restaurant(worker_id: str, restaurant_id: str, db_ref: fire
     restaurant_ref = check_restaurant_existence(restaurant_id, db_ref)
 
     db_ref.collection(CollectionNames.USERS).document(worker_id).update({"restaurant_id": restaurant_ref})
+    invalidate_cached_user(worker_id)
 
     restaurant_doc = restaurant_ref.get()
     restaurant_name = restaurant_doc.to_dict().get("name")
@@ -150,6 +151,7 @@ def remove_worker_from_restaurant(worker_id: str, db_ref: firestore.Client) -> d
         )
 
     db_ref.collection(CollectionNames.USERS).document(worker_id).update({"restaurant_id": None})
+    invalidate_cached_user(worker_id)
 
     return {
         "id": worker_id,
@@ -173,6 +175,7 @@ def delete_worker(worker_id: str, db_ref: firestore.Client) -> dict:
     delete_firebase_user(worker_id)
 
     db_ref.collection(CollectionNames.USERS).document(worker_id).delete()
+    invalidate_cached_user(worker_id)
 
     return {"message": f"Worker with id {worker_id} deleted successfully"}
 
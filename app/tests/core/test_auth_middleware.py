@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.middleware import AuthMiddleware
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+
+    @app.get("/whoami")
+    async def whoami(request: Request) -> dict:
+        return {"user_id": request.state.user_id, "email": request.state.token_claims["email"]}
+
+    @app.options("/whoami")
+    async def whoami_options() -> dict:
+        return {"ok": True}
+
+    @app.get("/docs/page")
+    async def docs_page() -> dict:
+        return {"ok": True}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_missing_bearer_token_is_rejected(client):
+    response = client.get("/whoami")
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "No Bearer token. Unauthorized."}
+
+
+@patch("app.core.middleware.verify_firebase_token")
+def test_invalid_token_is_rejected(mock_verify, client):
+    mock_verify.side_effect = HTTPException(status_code=401, detail="Unable to authenticate: bad token.")
+
+    response = client.get("/whoami", headers={"Authorization": "Bearer bad"})
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Unable to authenticate: bad token."}
+
+
+@patch("app.core.middleware.verify_firebase_token")
+def test_claims_are_exposed_on_request_state(mock_verify, client):
+    mock_verify.return_value = {"user_id": "user1", "email": "test@example.com"}
+
+    response = client.get("/whoami", headers={"Authorization": "Bearer good"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "user1", "email": "test@example.com"}
+    mock_verify.assert_called_once_with("good")
+
+
+def test_options_and_docs_bypass_auth(client):
+    assert client.options("/whoami").status_code == 200
+    assert client.get("/docs/page").status_code == 200
+
+
+@patch("app.core.middleware.run_in_database_executor")
+@patch("app.core.middleware.get_cached_token_claims")
+def test_cached_token_skips_the_database_executor(mock_get_cached, mock_run_in_executor, client):
+    mock_get_cached.return_value = {"user_id": "user1", "email": "test@example.com"}
+
+    response = client.get("/whoami", headers={"Authorization": "Bearer cached"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "user1", "email": "test@example.com"}
+    mock_get_cached.assert_called_once_with("cached")
+    mock_run_in_executor.assert_not_called()
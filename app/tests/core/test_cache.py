@@ -0,0 +1,95 @@
+import pytest
+
+from app.core.cache import TTLCache, cache_stats
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_entry_expires_at_deadline(clock):
+    cache = TTLCache("test_expiry", max_entries=10, clock=clock)
+    cache.set("token", {"uid": "1"}, expires_at=1010.0)
+
+    assert cache.get("token") == {"uid": "1"}
+
+    clock.now = 1010.0
+
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_default_ttl_applies_when_no_deadline_given(clock):
+    cache = TTLCache("test_default_ttl", max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("user", "profile")
+
+    clock.now = 1004.0
+    assert cache.get("user") == "profile"
+
+    clock.now = 1005.0
+    assert cache.get("user") is None
+
+
+def test_replaced_entry_keeps_its_deadline(clock):
+    cache = TTLCache("test_replace", max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("menu", "old")
+
+    clock.now = 1004.0
+    assert cache.replace("menu", "new")
+    assert cache.get("menu") == "new"
+
+    clock.now = 1005.0
+    assert cache.get("menu") is None
+    assert not cache.replace("menu", "newer")
+    assert len(cache) == 0
+
+
+def test_already_expired_entry_is_not_stored(clock):
+    cache = TTLCache("test_expired_set", max_entries=10, clock=clock)
+    cache.set("token", "claims", expires_at=999.0)
+
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache("test_lru", max_entries=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_counters_are_reported(clock):
+    cache = TTLCache("test_counters", max_entries=10, clock=clock)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache_stats()["test_counters"]
+
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_invalidate_removes_entry(clock):
+    cache = TTLCache("test_invalidate", max_entries=10, clock=clock)
+    cache.set("a", 1)
+    cache.invalidate("a")
+
+    assert cache.get("a") is None
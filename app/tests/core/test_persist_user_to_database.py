@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.middleware import AuthMiddleware
+from app.core.user_cache import invalidate_cached_user, user_cache
+from app.models.user import UserRole
+
+CLAIMS = {"user_id": "user1", "email": "test@example.com"}
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture
+def mock_db_ref():
+    mock_db = MagicMock()
+    user_doc = mock_db.collection.return_value.document.return_value.get.return_value
+    user_doc.exists = True
+    user_doc.to_dict.return_value = {"email": "test@example.com", "role": UserRole.CUSTOMER, "points": 10}
+
+    with patch("app.core.middleware.get_database_ref", return_value=mock_db):
+        yield mock_db
+
+
+def test_profile_is_read_once_while_cached(mock_db_ref):
+    first = AuthMiddleware.persist_user_to_database(CLAIMS)
+    second = AuthMiddleware.persist_user_to_database(CLAIMS)
+
+    assert first.points == second.points == 10
+    mock_db_ref.collection.return_value.document.return_value.get.assert_called_once()
+
+
+def test_cached_profile_is_not_shared_between_callers(mock_db_ref):
+    first = AuthMiddleware.persist_user_to_database(CLAIMS)
+    first.points = 0
+
+    assert AuthMiddleware.persist_user_to_database(CLAIMS).points == 10
+
+
+def test_invalidation_forces_reload(mock_db_ref):
+    AuthMiddleware.persist_user_to_database(CLAIMS)
+    invalidate_cached_user("user1")
+    AuthMiddleware.persist_user_to_database(CLAIMS)
+
+    assert mock_db_ref.collection.return_value.document.return_value.get.call_count == 2
+
+
+def test_new_user_is_created_and_cached(mock_db_ref):
+    mock_db_ref.collection.return_value.document.return_value.get.return_value.exists = False
+
+    user = AuthMiddleware.persist_user_to_database(CLAIMS)
+    AuthMiddleware.persist_user_to_database(CLAIMS)
+
+    assert user.role == UserRole.CUSTOMER
+    mock_db_ref.collection.return_value.document.return_value.set.assert_called_once()
+    mock_db_ref.collection.return_value.document.return_value.get.assert_called_once()
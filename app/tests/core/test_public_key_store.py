@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.public_keys import FirebasePublicKeyStore
+from app.tests.core.keys import make_keys_response, make_signing_key
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def certificates():
+    _, first = make_signing_key()
+    _, second = make_signing_key()
+    return {"kid1": first, "kid2": second}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_store(session, clock):
+    return FirebasePublicKeyStore("https://keys", refresh_margin_seconds=60, session=session, clock=clock)
+
+
+def test_keys_are_fetched_once_while_fresh(certificates, clock):
+    session = MagicMock()
+    session.get.return_value = make_keys_response({"kid1": certificates["kid1"]}, "public, max-age=600")
+    store = make_store(session, clock)
+
+    store.get_key("kid1")
+    clock.now += 500
+    store.get_key("kid1")
+
+    session.get.assert_called_once()
+
+
+def test_keys_are_refetched_after_max_age(certificates, clock):
+    session = MagicMock()
+    session.get.return_value = make_keys_response({"kid1": certificates["kid1"]}, "public, max-age=600")
+    store = make_store(session, clock)
+
+    store.get_key("kid1")
+    clock.now += 600
+    store.get_key("kid1")
+
+    assert session.get.call_count == 2
+
+
+def test_unknown_kid_triggers_single_refetch(certificates, clock):
+    session = MagicMock()
+    session.get.side_effect = [
+        make_keys_response({"kid1": certificates["kid1"]}),
+        make_keys_response(certificates),
+    ]
+    store = make_store(session, clock)
+
+    store.get_key("kid1")
+    clock.now += 120
+
+    assert store.get_key("kid2") is not None
+    assert session.get.call_count == 2
+
+
+def test_unknown_kid_refetch_is_rate_limited(certificates, clock):
+    session = MagicMock()
+    session.get.return_value = make_keys_response({"kid1": certificates["kid1"]})
+    store = make_store(session, clock)
+
+    store.get_key("kid1")
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as e:
+            store.get_key("forged")
+        assert e.value.status_code == 401
+
+    session.get.assert_called_once()
+
+
+def test_stale_keys_are_used_when_refresh_fails(certificates, clock):
+    failed_response = MagicMock(status_code=503)
+    session = MagicMock()
+    session.get.side_effect = [make_keys_response({"kid1": certificates["kid1"]}, "max-age=600"), failed_response]
+    store = make_store(session, clock)
+
+    key = store.get_key("kid1")
+    clock.now += 600
+
+    assert store.get_key("kid1") is key
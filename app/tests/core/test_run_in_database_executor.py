@@ -0,0 +1,45 @@
+import asyncio
+import threading
+from functools import partial
+
+import pytest
+
+from app.core.database import fan_out, run_in_database_executor
+
+
+def test_runs_blocking_call_outside_event_loop_thread():
+    def blocking_call(value, multiplier=1):
+        return threading.current_thread().name, value * multiplier
+
+    async def run():
+        return await run_in_database_executor(blocking_call, 21, multiplier=2)
+
+    thread_name, result = asyncio.run(run())
+
+    assert result == 42
+    assert thread_name.startswith("firestore")
+    assert thread_name != threading.main_thread().name
+
+
+def test_propagates_exceptions():
+    def failing_call():
+        raise ValueError("boom")
+
+    async def run():
+        await run_in_database_executor(failing_call)
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run())
+
+
+def test_fan_out_runs_calls_concurrently_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def call(value):
+        barrier.wait()
+        return threading.current_thread().name, value
+
+    results = fan_out(partial(call, 1), partial(call, 2), partial(call, 3))
+
+    assert [value for _, value in results] == [1, 2, 3]
+    assert all(thread_name.startswith("firestore-fan-out") for thread_name, _ in results)
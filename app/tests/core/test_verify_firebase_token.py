@@ -0,0 +1,100 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.core.firebase_auth import token_cache, verify_firebase_token
+from app.core.public_keys import FirebasePublicKeyStore
+from app.tests.core.keys import make_keys_response, make_signing_key
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return make_signing_key()
+
+
+@pytest.fixture
+def key_session(signing_key):
+    _, certificate = signing_key
+    session = MagicMock()
+    session.get.return_value = make_keys_response({"kid1": certificate})
+    store = FirebasePublicKeyStore("https://keys", session=session)
+
+    with patch("app.core.firebase_auth.public_key_store", store):
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def make_token(private_key, kid="kid1", **overrides):
+    project_id = settings.firebase_config.project_id
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{project_id}",
+        "aud": project_id,
+        "sub": "user1",
+        "user_id": "user1",
+        "email": "test@example.com",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_token_is_verified_locally_and_cached(signing_key, key_session):
+    private_key, _ = signing_key
+    token = make_token(private_key)
+
+    first = verify_firebase_token(token)
+    second = verify_firebase_token(token)
+
+    assert first["user_id"] == "user1"
+    assert second is first
+    key_session.get.assert_called_once()
+
+
+def test_second_token_does_not_refetch_keys(signing_key, key_session):
+    private_key, _ = signing_key
+
+    verify_firebase_token(make_token(private_key, sub="user1"))
+    verify_firebase_token(make_token(private_key, sub="user2", user_id="user2"))
+
+    key_session.get.assert_called_once()
+
+
+def test_token_signed_with_unknown_key_is_rejected(key_session):
+    other_key, _ = make_signing_key()
+
+    with pytest.raises(HTTPException) as e:
+        verify_firebase_token(make_token(other_key))
+
+    assert e.value.status_code == 401
+    assert len(token_cache) == 0
+
+
+def test_token_for_other_project_is_rejected(signing_key, key_session):
+    private_key, _ = signing_key
+
+    with pytest.raises(HTTPException) as e:
+        verify_firebase_token(make_token(private_key, aud="other-project"))
+
+    assert e.value.status_code == 401
+
+
+def test_expired_token_is_rejected(signing_key, key_session):
+    private_key, _ = signing_key
+    now = int(time.time())
+
+    with pytest.raises(HTTPException) as e:
+        verify_firebase_token(make_token(private_key, iat=now - 7200, exp=now - 3600))
+
+    assert e.value.status_code == 401
@@ -0,0 +1,52 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+from google.cloud.firestore_v1 import DocumentReference
+
+from app.jobs.backfill_order_rollups import backfill_order_rollups
+
+
+def make_order_doc(order_status, created_at):
+    return MagicMock(
+        to_dict=lambda: {
+            "user_id": "user1",
+            "order_items": {"dish1": 1},
+            "total_price": 10.0,
+            "total_price_including_special_offers": 8.0,
+            "status": order_status,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "restaurant_id": MagicMock(spec=DocumentReference, id="rest1"),
+        }
+    )
+
+
+def test_rollups_are_rebuilt_and_stale_ones_deleted():
+    mock_db_ref = MagicMock()
+    orders = [
+        make_order_doc("paid", datetime(2025, 3, 14, 18, 5, tzinfo=UTC)),
+        make_order_doc("completed", datetime(2025, 3, 14, 19, 5, tzinfo=UTC)),
+    ]
+    stale = MagicMock(reference=MagicMock(path="order_rollups/rest1_day_2025031300"))
+    current = MagicMock(reference=MagicMock(path="order_rollups/rest1_day_2025031400"))
+    orders_query = MagicMock()
+    orders_query.stream.return_value = orders
+    rollups_query = MagicMock()
+    rollups_query.select.return_value.stream.return_value = [stale, current]
+    collections = {"orders": orders_query, "order_rollups": rollups_query}
+    mock_db_ref.collection.side_effect = lambda name: MagicMock(
+        where=lambda filter: collections[name.value],
+        select=rollups_query.select,
+        document=lambda doc_id: MagicMock(id=doc_id, path=f"{name.value}/{doc_id}"),
+    )
+
+    assert backfill_order_rollups(mock_db_ref) == 3
+
+    batch = mock_db_ref.batch.return_value
+    written = {call.args[0].path: call.args[1] for call in batch.set.call_args_list}
+    day = written["order_rollups/rest1_day_2025031400"]
+    assert day["order_count"] == 2
+    assert day["total_price"] == 20.0
+    assert day["status_counts"] == {"paid": 1, "completed": 1}
+    assert all(call.kwargs == {"merge": False} for call in batch.set.call_args_list)
+    batch.delete.assert_called_once_with(stale.reference)
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+from app.jobs.reconcile_points_balances import open_balances, reconcile_points_balances
+
+
+def make_doc(doc_id, data):
+    return MagicMock(id=doc_id, to_dict=lambda: data)
+
+
+def stage(mock_db_ref, users, entries):
+    collections = {
+        "users": [make_doc(user_id, {"points": points}) for user_id, points in users.items()],
+        "points_ledger": [make_doc(f"entry{i}", entry) for i, entry in enumerate(entries)],
+    }
+    mock_db_ref.collection.side_effect = lambda name: MagicMock(
+        select=lambda fields: MagicMock(stream=lambda: iter(collections[name.value])),
+        document=lambda doc_id: MagicMock(id=doc_id, path=f"{name.value}/{doc_id}"),
+    )
+
+
+@patch("app.jobs.reconcile_points_balances.reconcile_user_balance")
+def test_only_drifted_balances_are_reconciled(mock_reconcile):
+    mock_db_ref = MagicMock()
+    stage(
+        mock_db_ref,
+        {"user1": 10, "user2": 7, "user3": 0},
+        [
+            {"user_id": "user1", "delta": 12, "reason": "order_earned"},
+            {"user_id": "user1", "delta": -2, "reason": "order_spent"},
+            {"user_id": "user2", "delta": 5, "reason": "order_earned"},
+        ],
+    )
+
+    drifted = reconcile_points_balances(mock_db_ref)
+
+    assert drifted == {"user2": (7, 5)}
+    mock_reconcile.assert_called_once_with("user2", mock_db_ref)
+
+
+def test_opening_entries_cover_the_unexplained_balance():
+    mock_db_ref = MagicMock()
+    stage(
+        mock_db_ref,
+        {"user1": 10, "user2": 7, "user3": 4},
+        [
+            {"user_id": "user1", "delta": 3, "reason": "order_earned"},
+            {"user_id": "user2", "delta": 7, "reason": "order_earned"},
+            {"user_id": "user3", "delta": 1, "reason": "opening_balance"},
+        ],
+    )
+
+    assert open_balances(mock_db_ref) == 1
+
+    entry_ref, entry = mock_db_ref.batch.return_value.set.call_args.args
+    assert entry_ref.path == "points_ledger/user1_opening_balance"
+    assert entry["delta"] == 7
@@ -0,0 +1,65 @@
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.database import get_database_ref
+from app.core.middleware import AuthMiddleware
+from app.main import app
+from app.models.user import User, UserRole
+from app.services.orders.kitchen_queue import _hubs
+
+BASE_URL = "/order/worker_panel"
+
+
+@pytest.fixture
+def worker_client() -> Any:
+    mock_db_ref = MagicMock()
+    restaurant_ref = MagicMock(id="restaurant1")
+    worker = User.model_construct(
+        id="worker1", email="worker@example.com", role=UserRole.WORKER, points=0, restaurant_id=restaurant_ref
+    )
+
+    with patch("app.core.middleware.verify_firebase_token") as mock_verify, patch.object(
+        AuthMiddleware, "persist_user_to_database", return_value=worker
+    ):
+        mock_verify.return_value = {"user_id": "worker1", "email": "worker@example.com"}
+        app.dependency_overrides[get_database_ref] = lambda: mock_db_ref
+
+        with TestClient(app) as test_client:
+            yield test_client, mock_db_ref
+
+        app.dependency_overrides.clear()
+        _hubs.clear()
+
+
+@patch("app.services.orders.kitchen_queue.submit_to_database_executor", lambda func, *args: func(*args))
+@patch("app.services.orders.kitchen_queue.settings.stream_config.snapshot_timeout_seconds", 0.01)
+def test_kitchen_queue_stream_fails_with_503_without_a_first_snapshot(worker_client):
+    client, mock_db_ref = worker_client
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+
+    response = client.get(f"{BASE_URL}/queue/stream", headers={"Authorization": "Bearer valid-token"})
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"detail": "Kitchen queue of restaurant restaurant1 is not available"}
+    query.on_snapshot.return_value.unsubscribe.assert_called_once()
+    assert "restaurant1" not in _hubs
+
+
+def test_kitchen_queue_stream_starts_with_the_snapshot(worker_client):
+    client, mock_db_ref = worker_client
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    query.on_snapshot.side_effect = lambda callback: callback([], [], None) or MagicMock()
+
+    async def finite_events(restaurant_ref, subscriber, snapshot):
+        yield snapshot
+
+    with patch("app.routers.orders.worker_panel.kitchen_queue_events", finite_events):
+        response = client.get(f"{BASE_URL}/queue/stream", headers={"Authorization": "Bearer valid-token"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == "event: snapshot\ndata: []\n\n"
@@ -1,5 +1,7 @@
 from typing import Any
 
+from app.core.middleware import AuthMiddleware
+
 
 def test_get_all_restaurants(
     mock_authorized_client: Any,
@@ -13,3 +15,14 @@ def test_get_all_restaurants(
     data = response.json()
     assert isinstance(data, list)
     assert len(data) == 2
+
+
+def test_route_without_user_dependency_skips_profile_load(
+    mock_authorized_client: Any,
+) -> None:
+    mock_authorized_client.get(
+        "/restaurant/mobile/get_all_restaurants",
+        headers={"Authorization": "Bearer valid-token"},
+    )
+
+    AuthMiddleware.persist_user_to_database.assert_not_called()
@@ -0,0 +1,97 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.services.dishes import menu_cache
+from app.services.dishes.menu_cache import (
+    apply_menu_stock_decrements,
+    build_menu,
+    get_cached_menu,
+    invalidate_all_menus,
+    invalidate_menu,
+    reserve_menu_version,
+)
+
+DISHES = [{"id": "dish1", "name": "Zinger", "base_price": 10.0, "stock_count": 3, "is_available": True}]
+
+
+@pytest.fixture(autouse=True)
+def clear_menu_cache():
+    menu_cache.menu_cache.clear()
+    yield
+    menu_cache.menu_cache.clear()
+
+
+@patch("app.services.dishes.menu_cache.list_available_dishes", return_value=DISHES)
+def test_menu_is_cached_with_stable_etag(mock_list):
+    menu = build_menu("restaurant1", None)
+
+    assert json.loads(menu.body) == DISHES
+    assert menu.etag.startswith('"') and menu.etag.endswith('"')
+    assert get_cached_menu("restaurant1") == menu
+    assert build_menu("restaurant1", None).etag == menu.etag
+
+
+@patch("app.services.dishes.menu_cache.list_available_dishes", return_value=DISHES)
+def test_invalidation_drops_cached_menu(mock_list):
+    build_menu("restaurant1", None)
+    build_menu("restaurant2", None)
+
+    invalidate_menu("restaurant1")
+    assert get_cached_menu("restaurant1") is None
+    assert get_cached_menu("restaurant2") is not None
+
+    invalidate_all_menus()
+    assert get_cached_menu("restaurant2") is None
+
+
+def test_menu_built_during_invalidation_is_not_cached():
+    def list_while_invalidated(restaurant_id, db_ref):
+        invalidate_menu(restaurant_id)
+        return DISHES
+
+    with patch("app.services.dishes.menu_cache.list_available_dishes", side_effect=list_while_invalidated):
+        menu = build_menu("restaurant1", None)
+
+    assert json.loads(menu.body) == DISHES
+    assert get_cached_menu("restaurant1") is None
+
+
+@patch("app.services.dishes.menu_cache.list_available_dishes")
+def test_committed_sales_are_subtracted_from_the_cached_menu(mock_list):
+    mock_list.return_value = [
+        {"id": "dish1", "name": "Zinger", "stock_count": 3},
+        {"id": "dish2", "name": "Twister", "stock_count": 1},
+    ]
+    menu = build_menu("restaurant1", None)
+
+    version = reserve_menu_version("restaurant1")
+    apply_menu_stock_decrements("restaurant1", {"dish1": 2, "dish2": 1}, version)
+
+    updated = get_cached_menu("restaurant1")
+    assert json.loads(updated.body) == [{"id": "dish1", "name": "Zinger", "stock_count": 1}]
+    assert updated.dishes == json.loads(updated.body)
+    assert updated.etag != menu.etag
+    assert updated.version == menu.version
+
+
+@patch("app.services.dishes.menu_cache.list_available_dishes", return_value=DISHES)
+def test_menu_built_after_the_reservation_is_dropped_instead(mock_list):
+    version = reserve_menu_version("restaurant1")
+    build_menu("restaurant1", None)
+
+    apply_menu_stock_decrements("restaurant1", {"dish1": 1}, version)
+
+    assert get_cached_menu("restaurant1") is None
+
+
+def test_menu_built_across_a_reservation_is_not_cached():
+    def list_across_checkout(restaurant_id, db_ref):
+        reserve_menu_version(restaurant_id)
+        return DISHES
+
+    with patch("app.services.dishes.menu_cache.list_available_dishes", side_effect=list_across_checkout):
+        build_menu("restaurant1", None)
+
+    assert get_cached_menu("restaurant1") is None
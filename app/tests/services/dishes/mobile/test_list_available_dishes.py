@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.dishes.mobile import MENU_DISH_FIELDS, list_available_dishes
+
+
+def make_dish_ref(dish_id):
+    return MagicMock(id=dish_id, path=f"dishes/{dish_id}")
+
+
+def make_restaurant_dish_doc(dish_id, stock_count, stock_shards=0):
+    doc = MagicMock()
+    doc.reference.path = f"restaurant_dishes/rd_{dish_id}"
+    doc.reference.collection.return_value.document.side_effect = lambda shard_id: MagicMock(
+        path=f"restaurant_dishes/rd_{dish_id}/stock_shards/{shard_id}"
+    )
+    doc.to_dict.return_value = {
+        "dish_id": make_dish_ref(dish_id),
+        "stock_count": stock_count,
+        "stock_shards": stock_shards,
+        "is_available": True,
+    }
+    return doc
+
+
+def make_shard_doc(shard_ref, count):
+    return MagicMock(reference=shard_ref, exists=True, to_dict=lambda: {"count": count})
+
+
+def make_dish_doc(dish_id, exists=True):
+    doc = MagicMock(id=dish_id, exists=exists)
+    doc.to_dict.return_value = {
+        "name": f"Dish {dish_id}",
+        "description": "Crispy",
+        "ingredients": "chicken",
+        "base_price": 10.0,
+        "points": 5,
+    }
+    return doc
+
+
+@pytest.fixture
+def mock_db_ref():
+    mock_db = MagicMock()
+    query = mock_db.collection.return_value.where.return_value.where.return_value
+    query.stream.return_value = [make_restaurant_dish_doc(f"dish{i}", i + 1) for i in range(60)]
+
+    def get_all(refs, field_paths=None, transaction=None):
+        if field_paths == ["count"]:
+            return [make_shard_doc(ref, 2) for ref in refs]
+        return [make_dish_doc(ref.id, exists=ref.id != "dish3") for ref in reversed(refs)]
+
+    mock_db.get_all.side_effect = get_all
+    return mock_db
+
+
+def test_dishes_are_joined_with_batched_projected_reads(mock_db_ref):
+    result = list_available_dishes("restaurant1", mock_db_ref)
+
+    mock_db_ref.get_all.assert_called_once()
+    assert mock_db_ref.get_all.call_args.kwargs["field_paths"] == MENU_DISH_FIELDS
+    assert len(mock_db_ref.get_all.call_args.args[0]) == 60
+    assert [dish["id"] for dish in result][:4] == ["dish0", "dish1", "dish2", "dish4"]
+    assert result[0] == {
+        "id": "dish0",
+        "name": "Dish dish0",
+        "description": "Crispy",
+        "ingredients": "chicken",
+        "price": 10.0,
+        "points": 5,
+        "stock_count": 1,
+        "is_available": True,
+    }
+
+
+def test_missing_dishes_are_skipped(mock_db_ref):
+    result = list_available_dishes("restaurant1", mock_db_ref)
+
+    assert len(result) == 59
+    assert "dish3" not in [dish["id"] for dish in result]
+
+
+def test_stock_is_aggregated_from_shards_and_out_of_stock_dishes_are_skipped(mock_db_ref):
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    query.stream.return_value = [
+        make_restaurant_dish_doc("dish1", 0),
+        make_restaurant_dish_doc("dish2", 0, stock_shards=3),
+    ]
+
+    result = list_available_dishes("restaurant1", mock_db_ref)
+
+    assert [(dish["id"], dish["stock_count"]) for dish in result] == [("dish2", 6)]
+    assert mock_db_ref.get_all.call_count == 2
@@ -0,0 +1,145 @@
+import asyncio
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.orders.kitchen_queue import _hubs, kitchen_queue_events, subscribe_to_kitchen_queue
+
+
+def make_change(change_type, order_id, status="paid"):
+    document = MagicMock(id=order_id)
+    document.to_dict.return_value = {
+        "user_id": "user1",
+        "order_items": {"dish1": 1},
+        "total_price": 10.0,
+        "total_price_including_special_offers": 10.0,
+        "status": status,
+        "created_at": datetime(2025, 5, 1, tzinfo=UTC),
+        "updated_at": datetime(2025, 5, 1, tzinfo=UTC),
+        "restaurant_id": MagicMock(id="restaurant1"),
+    }
+    return SimpleNamespace(type=SimpleNamespace(name=change_type), document=document)
+
+
+def parse(message):
+    lines = dict(line.split(": ", 1) for line in message.decode("utf-8").strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+def deliver_initial_snapshot(callback):
+    callback([], [make_change("ADDED", "order0")], None)
+    return MagicMock()
+
+
+async def open_stream(restaurant_ref, mock_db_ref):
+    subscriber, snapshot = await subscribe_to_kitchen_queue(restaurant_ref, mock_db_ref)
+    return kitchen_queue_events(restaurant_ref, subscriber, snapshot)
+
+
+@patch("app.services.orders.kitchen_queue.submit_to_database_executor", lambda func, *args: func(*args))
+def test_screens_of_a_restaurant_share_one_listener():
+    mock_db_ref = MagicMock()
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    query.on_snapshot.side_effect = deliver_initial_snapshot
+    restaurant_ref = MagicMock(id="restaurant1")
+
+    async def run():
+        first = await open_stream(restaurant_ref, mock_db_ref)
+        first_events = [await anext(first)]
+        query.on_snapshot.assert_called_once()
+        callback = query.on_snapshot.call_args.args[0]
+
+        callback([], [make_change("ADDED", "order1")], None)
+        first_events.append(await anext(first))
+        second = await open_stream(restaurant_ref, mock_db_ref)
+        second_events = [await anext(second)]
+
+        callback([], [make_change("MODIFIED", "order1", "in_progress"), make_change("REMOVED", "order2")], None)
+        first_events += [await anext(first), await anext(first)]
+        second_events += [await anext(second), await anext(second)]
+
+        watch = _hubs[restaurant_ref.id].watch
+        await first.aclose()
+        watch.unsubscribe.assert_not_called()
+        await second.aclose()
+        watch.unsubscribe.assert_called_once()
+        assert restaurant_ref.id not in _hubs
+        return [parse(event) for event in first_events], [parse(event) for event in second_events]
+
+    first_events, second_events = asyncio.run(run())
+
+    assert first_events[0][0] == "snapshot"
+    assert [order["id"] for order in first_events[0][1]] == ["order0"]
+    assert first_events[1][0] == "added"
+    assert second_events[0][0] == "snapshot"
+    assert [order["id"] for order in second_events[0][1]] == ["order0", "order1"]
+    assert [(event, data["id"]) for event, data in second_events[1:]] == [("modified", "order1"), ("removed", "order2")]
+    assert first_events[2][1]["status"] == "in_progress"
+
+
+@patch("app.services.orders.kitchen_queue.submit_to_database_executor", lambda func, *args: func(*args))
+def test_first_screen_waits_for_the_first_snapshot():
+    mock_db_ref = MagicMock()
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    restaurant_ref = MagicMock(id="restaurant3")
+
+    async def run():
+        subscribing = asyncio.create_task(subscribe_to_kitchen_queue(restaurant_ref, mock_db_ref))
+        while not query.on_snapshot.called:
+            await asyncio.sleep(0.001)
+        assert not subscribing.done()
+
+        callback = query.on_snapshot.call_args.args[0]
+        callback([], [make_change("ADDED", "order0"), make_change("ADDED", "order1")], None)
+        subscriber, snapshot = await subscribing
+
+        stream = kitchen_queue_events(restaurant_ref, subscriber, snapshot)
+        events = [await anext(stream)]
+        await stream.aclose()
+        return [parse(event) for event in events]
+
+    events = asyncio.run(run())
+
+    assert events[0][0] == "snapshot"
+    assert [order["id"] for order in events[0][1]] == ["order0", "order1"]
+    query.on_snapshot.return_value.unsubscribe.assert_called_once()
+
+
+@patch("app.services.orders.kitchen_queue.submit_to_database_executor", lambda func, *args: func(*args))
+@patch("app.services.orders.kitchen_queue.settings.stream_config.snapshot_timeout_seconds", 0.01)
+def test_listener_without_a_first_snapshot_is_dropped():
+    mock_db_ref = MagicMock()
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    restaurant_ref = MagicMock(id="restaurant2")
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(subscribe_to_kitchen_queue(restaurant_ref, mock_db_ref))
+
+    assert e.value.status_code == 503
+    query.on_snapshot.return_value.unsubscribe.assert_called_once()
+    assert restaurant_ref.id not in _hubs
+
+
+@patch("app.services.orders.kitchen_queue.submit_to_database_executor", lambda func, *args: func(*args))
+def test_abandoned_stream_is_dropped_with_its_listener():
+    mock_db_ref = MagicMock()
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    query.on_snapshot.side_effect = deliver_initial_snapshot
+    restaurant_ref = MagicMock(id="restaurant4")
+
+    async def run():
+        # The response never started, so the stream's generator never runs and cannot unsubscribe.
+        subscriber, _ = await subscribe_to_kitchen_queue(restaurant_ref, mock_db_ref)
+        subscriber.close()
+        watch = _hubs[restaurant_ref.id].watch
+        query.on_snapshot.call_args.args[0]([], [make_change("ADDED", "order1")], None)
+        return watch
+
+    watch = asyncio.run(run())
+
+    watch.unsubscribe.assert_called_once()
+    assert restaurant_ref.id not in _hubs
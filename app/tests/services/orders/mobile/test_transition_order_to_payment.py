@@ -0,0 +1,143 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, status
+from google.cloud.firestore import Increment, Transaction  # type: ignore
+
+from app.models.order import OrderStatus, PayForOrderPayload
+from app.models.user import User, UserRole
+from app.services.orders.mobile import transition_order_to_payment
+from app.services.orders.pricing import OrderPricing
+
+
+def make_snapshot(path, data):
+    return MagicMock(reference=MagicMock(path=path), exists=data is not None, to_dict=lambda: data)
+
+
+def make_restaurant_dish_doc(doc_id, dish_id, stock_count):
+    doc = MagicMock(id=doc_id)
+    doc.to_dict.return_value = {
+        "dish_id": MagicMock(id=dish_id),
+        "restaurant_id": MagicMock(),
+        "stock_count": stock_count,
+        "is_available": True,
+    }
+    return doc
+
+
+@pytest.fixture
+def mock_user():
+    return User(id="user1", email="test@test.com", role=UserRole.CUSTOMER, points=5)
+
+
+@pytest.fixture
+def mock_transaction():
+    return MagicMock(spec=Transaction)
+
+
+@pytest.fixture
+def mock_db_ref(mock_transaction):
+    mock_db = MagicMock()
+    mock_db.transaction.return_value = mock_transaction
+    mock_db.collection.side_effect = lambda name: MagicMock(
+        document=lambda doc_id: MagicMock(id=doc_id, path=f"{name.value}/{doc_id}")
+    )
+    return mock_db
+
+
+def order_data(status=OrderStatus.CHECKOUT, order_items=None):
+    now = datetime.now(UTC)
+    return {
+        "user_id": "user1",
+        "order_items": {"dish1": 2} if order_items is None else order_items,
+        "restaurant_id": MagicMock(id="restaurant1"),
+        "total_price": 0.0,
+        "total_price_including_special_offers": 0.0,
+        "status": status.value,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def stage_reads(mock_transaction, order, user_points=30, stock_count=5):
+    mock_transaction.get_all.return_value = [
+        make_snapshot("users/user1", {"email": "test@test.com", "role": "customer", "points": user_points}),
+        make_snapshot("orders/order1", order),
+    ]
+    mock_transaction.get.return_value = [make_restaurant_dish_doc("rd1", "dish1", stock_count)]
+
+
+@patch("app.services.orders.mobile.invalidate_cached_user")
+@patch("app.services.orders.mobile.apply_menu_stock_decrements")
+@patch("app.services.orders.mobile.reserve_menu_version", return_value=7)
+@patch(
+    "app.services.orders.mobile.price_order",
+    return_value=OrderPricing(total_price=20.0, total_price_including_special_offers=16.0, points_gained=4),
+)
+@patch("app.services.orders.mobile.firestore.transactional", lambda f: f)
+def test_pay_commits_stock_points_and_order_together(
+    mock_price_order,
+    mock_reserve_menu_version,
+    mock_apply_menu_stock,
+    mock_invalidate_user,
+    mock_db_ref,
+    mock_transaction,
+    mock_user,
+):
+    stage_reads(mock_transaction, order_data())
+
+    order = transition_order_to_payment(
+        PayForOrderPayload(id="order1", points=10, payment_method="card"), mock_user, mock_db_ref
+    )
+
+    assert order.status == OrderStatus.PAID
+    assert order.payment_method == "card"
+    assert order.total_price_including_special_offers == 16.0
+    assert order.points_used == 10
+
+    updates = {call.args[0].path: call.args[1] for call in mock_transaction.update.call_args_list}
+    assert updates == {"restaurant_dishes/rd1": {"stock_count": 3}, "users/user1": {"points": Increment(-6)}}
+    writes = {call.args[0].path: call.args[1] for call in mock_transaction.set.call_args_list}
+    assert writes.pop("orders/order1")["status"] == OrderStatus.PAID
+    assert writes.pop("points_ledger/order1_order_spent")["delta"] == -10
+    assert writes.pop("points_ledger/order1_order_earned")["delta"] == 4
+    assert sorted(rollup["period"] for rollup in writes.values()) == ["day", "hour"]
+    mock_reserve_menu_version.assert_called_once_with("restaurant1")
+    mock_apply_menu_stock.assert_called_once_with("restaurant1", order.order_items, 7)
+    mock_invalidate_user.assert_called_once_with("user1")
+
+
+@patch("app.services.orders.mobile.price_order")
+@patch("app.services.orders.mobile.firestore.transactional", lambda f: f)
+def test_insufficient_stock_writes_nothing(mock_price_order, mock_db_ref, mock_transaction, mock_user):
+    mock_price_order.return_value = OrderPricing(
+        total_price=20.0, total_price_including_special_offers=20.0, points_gained=4
+    )
+    stage_reads(mock_transaction, order_data(), stock_count=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        transition_order_to_payment(PayForOrderPayload(id="order1", payment_method="card"), mock_user, mock_db_ref)
+
+    assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_transaction.update.assert_not_called()
+    mock_transaction.set.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "order, detail",
+    [
+        (None, "No such order"),
+        (order_data(status=OrderStatus.PAID), "incorrect state"),
+        (order_data(order_items={}), "Cannot pay for empty order"),
+    ],
+)
+@patch("app.services.orders.mobile.firestore.transactional", lambda f: f)
+def test_invalid_orders_are_rejected(order, detail, mock_db_ref, mock_transaction, mock_user):
+    stage_reads(mock_transaction, order)
+
+    with pytest.raises(HTTPException) as exc_info:
+        transition_order_to_payment(PayForOrderPayload(id="order1", payment_method="card"), mock_user, mock_db_ref)
+
+    assert detail in exc_info.value.detail
+    mock_transaction.set.assert_not_called()
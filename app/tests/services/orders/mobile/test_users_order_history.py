@@ -0,0 +1,52 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+from app.models.order import Order, OrderSummary
+from app.services.orders.mobile import ORDER_SUMMARY_FIELDS, users_order_history
+
+
+def make_order_doc(order_id, with_items=True):
+    data = {
+        "user_id": "user1",
+        "total_price": 20.0,
+        "total_price_including_special_offers": 15.0,
+        "status": "paid",
+        "created_at": datetime(2025, 5, 1, tzinfo=UTC),
+        "updated_at": datetime(2025, 5, 1, tzinfo=UTC),
+        "restaurant_id": MagicMock(id="restaurant1"),
+    }
+    if with_items:
+        data["order_items"] = {"dish1": 2}
+
+    doc = MagicMock(id=order_id)
+    doc.to_dict.return_value = data
+    doc.get.side_effect = lambda field: data[field]
+    return doc
+
+
+@patch("app.services.orders.mobile.get_page")
+def test_history_returns_full_orders_and_cursor(mock_get_page):
+    mock_get_page.return_value = ([make_order_doc("order1")], "next")
+
+    page = users_order_history("user1", MagicMock(), page_size=1)
+
+    assert page.next_cursor == "next"
+    assert isinstance(page.orders[0], Order)
+    assert page.orders[0].id == "order1"
+    assert page.orders[0].restaurant_id == "restaurant1"
+    assert page.orders[0].order_items == {"dish1": 2}
+
+
+@patch("app.services.orders.mobile.get_page")
+def test_summary_history_projects_out_order_items(mock_get_page):
+    mock_db_ref = MagicMock()
+    mock_get_page.return_value = ([make_order_doc("order1", with_items=False)], None)
+
+    page = users_order_history("user1", mock_db_ref, summary=True, cursor="cursor")
+
+    query = mock_db_ref.collection.return_value.where.return_value.where.return_value
+    query.select.assert_called_once_with(ORDER_SUMMARY_FIELDS)
+    assert "order_items" not in ORDER_SUMMARY_FIELDS
+    assert mock_get_page.call_args.args[1:] == (20, "cursor")
+    assert isinstance(page.orders[0], OrderSummary)
+    assert "order_items" not in page.model_dump()["orders"][0]
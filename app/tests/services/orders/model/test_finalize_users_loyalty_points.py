@@ -8,11 +8,6 @@ from app.models.order import OrderStatus, PersistedOrder
 from app.models.user import User, UserRole
 
 
-@pytest.fixture
-def mock_db_ref():
-    return MagicMock()
-
-
 @pytest.fixture
 def mock_order():
     return PersistedOrder(
@@ -32,43 +27,47 @@ def user_with_specified_points(points):
     return User(id="id", email="test@test.test", role=UserRole.CUSTOMER, points=points)
 
 
-def test_no_loyalty_points_used(mock_order, mock_db_ref):
+def test_no_loyalty_points_used(mock_order):
     user = user_with_specified_points(100)
 
-    mock_order.finalize_users_loyalty_points(user, 0, 0, mock_db_ref)
+    mock_order.finalize_users_loyalty_points(user, 0, 0)
 
     assert mock_order.points_used == 0
     assert user.points == 100
-    mock_db_ref.collection().document().update.assert_not_called()
 
 
-def test_loyalty_points_used_within_limits(mock_order, mock_db_ref):
+def test_points_gained_are_credited_without_spending(mock_order):
+    user = user_with_specified_points(100)
+
+    mock_order.finalize_users_loyalty_points(user, 0, 7)
+
+    assert mock_order.points_used == 0
+    assert user.points == 107
+
+
+def test_loyalty_points_used_within_limits(mock_order):
     user = user_with_specified_points(20)
 
-    mock_order.finalize_users_loyalty_points(user, 15, 0, mock_db_ref)
+    mock_order.finalize_users_loyalty_points(user, 15, 0)
 
     assert mock_order.points_used == 15
     assert user.points == 5
-    mock_db_ref.collection().document.assert_called_with(user.id)
-    mock_db_ref.collection().document().update.assert_called_once_with({"points": 5})
 
 
-def test_loyalty_points_exceeds_user_points(mock_order, mock_db_ref):
+def test_loyalty_points_exceeds_user_points(mock_order):
     user = user_with_specified_points(10)
 
-    mock_order.finalize_users_loyalty_points(user, 50, 0, mock_db_ref)
+    mock_order.finalize_users_loyalty_points(user, 50, 0)
 
     assert mock_order.points_used == 10
     assert user.points == 0
-    mock_db_ref.collection().document().update.assert_called_once_with({"points": 0})
 
 
-def test_loyalty_points_exceeds_price(mock_order, mock_db_ref):
+def test_loyalty_points_exceeds_price(mock_order):
     user = user_with_specified_points(50)
     mock_order.total_price_including_special_offers = 20
 
-    mock_order.finalize_users_loyalty_points(user, 40, 0, mock_db_ref)
+    mock_order.finalize_users_loyalty_points(user, 40, 3)
 
     assert mock_order.points_used == 20
-    assert user.points == 30
-    mock_db_ref.collection().document().update.assert_called_once_with({"points": 30})
+    assert user.points == 33
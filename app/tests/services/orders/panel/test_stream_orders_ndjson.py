@@ -0,0 +1,64 @@
+import asyncio
+import json
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+from app.services.orders.panel import build_orders_query, stream_orders_ndjson
+from app.services.shared.pagination import decode_cursor
+
+
+def make_order_doc(order_id, day):
+    data = {
+        "user_id": "user1",
+        "order_items": {"dish1": 2},
+        "total_price": 20.0,
+        "total_price_including_special_offers": 15.0,
+        "status": "paid",
+        "created_at": datetime(2025, 5, day, tzinfo=UTC),
+        "updated_at": datetime(2025, 5, day, tzinfo=UTC),
+        "restaurant_id": MagicMock(id="restaurant1"),
+    }
+    doc = MagicMock(id=order_id)
+    doc.to_dict.return_value = data
+    doc.get.side_effect = lambda field: data[field]
+    return doc
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+@patch("app.services.orders.panel.get_page")
+def test_orders_are_streamed_page_by_page_as_ndjson(mock_get_page):
+    mock_get_page.side_effect = [
+        ([make_order_doc("order1", 3), make_order_doc("order2", 2)], "page2"),
+        ([make_order_doc("order3", 1)], None),
+    ]
+    query = MagicMock()
+
+    body = asyncio.run(collect(stream_orders_ndjson(query, "resume")))
+
+    lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert [line["order"]["id"] for line in lines] == ["order1", "order2", "order3"]
+    assert lines[0]["order"]["restaurant_id"] == "restaurant1"
+    assert lines[0]["order"]["created_at"] == "2025-05-03T00:00:00Z"
+    assert decode_cursor(lines[1]["cursor"])["__name__"] == "order2"
+    assert [call.args[2] for call in mock_get_page.call_args_list] == ["resume", "page2"]
+
+
+def test_created_at_range_filters_are_applied():
+    mock_db_ref = MagicMock()
+    created_from = datetime(2025, 5, 1, tzinfo=UTC)
+    created_to = datetime(2025, 6, 1, tzinfo=UTC)
+
+    build_orders_query(mock_db_ref, created_from=created_from, created_to=created_to)
+
+    collection = mock_db_ref.collection.return_value
+    filters = [
+        collection.where.call_args.kwargs["filter"],
+        collection.where.return_value.where.call_args.kwargs["filter"],
+    ]
+    assert [(f.field_path, f.op_string, f.value) for f in filters] == [
+        ("created_at", ">=", created_from),
+        ("created_at", "<", created_to),
+    ]
@@ -0,0 +1,102 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.order import PersistedOrder
+from app.models.user import User, UserRole
+from app.services.orders.pricing import PRICING_DISH_FIELDS, PRICING_SPECIAL_OFFER_FIELDS, price_order
+
+
+def make_ref(path):
+    return MagicMock(id=path.split("/")[-1], path=path)
+
+
+def make_doc(doc_id, data, exists=True):
+    return MagicMock(id=doc_id, exists=exists, to_dict=lambda: data)
+
+
+def make_special_offer_doc(offer_id, dish_id, special_price):
+    return make_doc(offer_id, {"dish_id": make_ref(f"dishes/{dish_id}"), "special_price": special_price})
+
+
+@pytest.fixture
+def special_offers():
+    return {}
+
+
+@pytest.fixture
+def mock_db_ref(special_offers):
+    mock_db = MagicMock()
+    mock_db.collection.return_value.document.side_effect = lambda dish_id: make_ref(f"dishes/{dish_id}")
+    dishes = {
+        "dish1": make_doc("dish1", {"base_price": 10.0, "points": 3}),
+        "dish2": make_doc("dish2", {"base_price": 20.0, "points": 5}),
+    }
+
+    def get_all(refs, field_paths=None, transaction=None):
+        source = dishes if field_paths == PRICING_DISH_FIELDS else special_offers
+        return [source[ref.id] for ref in refs]
+
+    mock_db.get_all.side_effect = get_all
+    return mock_db
+
+
+@pytest.fixture
+def mock_order():
+    mock_restaurant_ref = MagicMock()
+    mock_restaurant_ref.get.return_value.to_dict.return_value = {"best_prices": {}}
+
+    return PersistedOrder(
+        order_items={"dish1": 2, "dish2": 1},
+        restaurant_id=mock_restaurant_ref,
+        user_id="user1",
+        total_price=0.0,
+        total_price_including_special_offers=0.0,
+        created_at=datetime.now(UTC),
+        updated_at=datetime.now(UTC),
+    )
+
+
+@pytest.fixture
+def mock_user():
+    return User(id="user1", email="test@test.com", role=UserRole.CUSTOMER)
+
+
+def test_price_order_without_special_offers(mock_db_ref, mock_order, mock_user):
+    pricing = price_order(mock_order, mock_user, mock_db_ref)
+
+    assert pricing.total_price == 40.0
+    assert pricing.total_price_including_special_offers == 40.0
+    assert pricing.points_gained == 11  # 2 * 3 + 1 * 5
+    mock_db_ref.get_all.assert_called_once()
+    assert mock_db_ref.get_all.call_args.kwargs["field_paths"] == PRICING_DISH_FIELDS
+
+
+def test_price_order_with_special_offers(mock_db_ref, mock_order, mock_user, special_offers):
+    special_offers.update(
+        {
+            "offer1": make_special_offer_doc("offer1", "dish1", 5.0),
+            "offer3": make_special_offer_doc("offer3", "dish2", 18.0),
+        }
+    )
+    mock_user.special_offers = [make_ref("special_offers/offer1"), make_ref("special_offers/offer3")]
+    mock_order.restaurant_id.get.return_value.to_dict.return_value = {"best_prices": {"dish2": 15.0, "dish9": 1.0}}
+
+    pricing = price_order(mock_order, mock_user, mock_db_ref)
+
+    assert pricing.total_price == 40.0  # 2 * 10 + 1 * 20
+    assert pricing.total_price_including_special_offers == 25.0  # 2 * 5 + 1 * 15
+    assert pricing.points_gained == 11
+    assert mock_db_ref.get_all.call_count == 2
+    mock_order.restaurant_id.get.assert_called_once_with(field_paths=["best_prices"])
+    offer_reads = [call for call in mock_db_ref.get_all.call_args_list if call.args[0][0].path.startswith("special")]
+    assert all(call.kwargs["field_paths"] == PRICING_SPECIAL_OFFER_FIELDS for call in offer_reads)
+
+
+def test_apply_to_updates_order(mock_db_ref, mock_order, mock_user):
+    price_order(mock_order, mock_user, mock_db_ref).apply_to(mock_order)
+
+    assert mock_order.total_price == 40.0
+    assert mock_order.total_price_including_special_offers == 40.0
+    assert mock_order.points_gained == 11
@@ -0,0 +1,74 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from google.cloud.firestore import Increment  # type: ignore
+
+from app.models.firestore_ref import FirestoreRef
+from app.models.order import OrderStatus, PersistedOrder
+from app.models.order_rollup import RollupPeriod
+from app.services.orders.rollups import add_order_to_rollups, record_order_transition
+
+CREATED_AT = datetime(2025, 3, 14, 18, 42, tzinfo=UTC)
+DAY = ("rest1", RollupPeriod.DAY, datetime(2025, 3, 14, tzinfo=UTC))
+HOUR = ("rest1", RollupPeriod.HOUR, datetime(2025, 3, 14, 18, tzinfo=UTC))
+
+
+def make_order(order_status, total_price=20.0):
+    return PersistedOrder(
+        user_id="user1",
+        order_items={"dish1": 1},
+        total_price=total_price,
+        total_price_including_special_offers=total_price - 4,
+        status=order_status,
+        points_used=3,
+        points_gained=2,
+        created_at=CREATED_AT,
+        updated_at=CREATED_AT,
+        restaurant_id=FirestoreRef(SimpleNamespace(id="rest1")),
+    )
+
+
+def test_paid_order_is_counted_in_day_and_hour():
+    rollups = {}
+
+    add_order_to_rollups(rollups, make_order(OrderStatus.PAID), OrderStatus.CHECKOUT)
+    add_order_to_rollups(rollups, make_order(OrderStatus.PAID, total_price=10.0), OrderStatus.CHECKOUT)
+
+    assert rollups.keys() == {DAY, HOUR}
+    assert rollups[DAY] == {
+        "order_count": 2,
+        "total_price": 30.0,
+        "total_price_including_special_offers": 22.0,
+        "points_used": 6,
+        "points_gained": 4,
+        "status_counts": {"paid": 2},
+    }
+
+
+def test_later_transition_only_moves_status_counts():
+    rollups = {}
+
+    add_order_to_rollups(rollups, make_order(OrderStatus.READY), OrderStatus.IN_PROGRESS)
+
+    assert rollups[HOUR] == {"status_counts": {"in_progress": -1, "ready": 1}}
+
+
+def test_checkout_orders_are_not_rolled_up():
+    rollups = {}
+
+    add_order_to_rollups(rollups, make_order(OrderStatus.CHECKOUT), None)
+
+    assert rollups == {}
+
+
+def test_transition_is_written_with_increments():
+    writer = MagicMock()
+    db_ref = MagicMock()
+
+    record_order_transition(writer, db_ref, make_order(OrderStatus.COMPLETED), OrderStatus.READY)
+
+    assert writer.set.call_count == 2
+    document = writer.set.call_args.args[1]
+    assert document["status_counts"] == {"ready": Increment(-1), "completed": Increment(1)}
+    assert writer.set.call_args.kwargs == {"merge": True}
@@ -0,0 +1,65 @@
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.firestore_ref import FirestoreRef
+from app.models.order import Order, OrderStatus, PersistedOrder
+from app.services.orders.serialization import order_to_json, snapshot_to_json, snapshots_to_json
+
+ORDER_DATA = {
+    "user_id": "user1",
+    "order_items": {"dish1": 2, "dish2": 1},
+    "total_price": 40.0,
+    "total_price_including_special_offers": 25.5,
+    "status": "paid",
+    "points_gained": 11,
+    "created_at": datetime(2025, 5, 1, 12, 30, tzinfo=UTC),
+    "updated_at": datetime(2025, 5, 1, 12, 45, tzinfo=UTC),
+    "restaurant_id": FirestoreRef(SimpleNamespace(id="restaurant1")),
+}
+
+
+def make_snapshot(order_id, data):
+    return MagicMock(id=order_id, to_dict=lambda: dict(data))
+
+
+def legacy_order_json(order_id, data):
+    persisted_order_dict = PersistedOrder(**data).model_dump()
+    persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
+    return jsonable_encoder(Order(**persisted_order_dict, id=order_id).model_dump())
+
+
+def parse(body):
+    decoded = json.loads(body)
+    for order in decoded if isinstance(decoded, list) else [decoded]:
+        order["created_at"] = datetime.fromisoformat(order["created_at"])
+        order["updated_at"] = datetime.fromisoformat(order["updated_at"])
+    return decoded
+
+
+def test_persisted_order_matches_the_order_model_output():
+    order = PersistedOrder(**ORDER_DATA)
+
+    assert parse(order_to_json(order, "order1")) == parse(json.dumps(legacy_order_json("order1", ORDER_DATA)))
+
+
+def test_snapshot_defaults_and_extra_fields():
+    data = {key: value for key, value in ORDER_DATA.items() if key not in ("status", "points_gained")}
+    data["internal_note"] = "not part of the API"
+
+    result = parse(snapshot_to_json(make_snapshot("order1", data)))
+
+    assert result == parse(json.dumps(legacy_order_json("order1", data)))
+    assert result["status"] == OrderStatus.CHECKOUT.value
+    assert "internal_note" not in result
+
+
+def test_snapshots_serialize_to_a_json_array():
+    result = parse(snapshots_to_json([make_snapshot("order1", ORDER_DATA), make_snapshot("order2", ORDER_DATA)]))
+
+    assert [order["id"] for order in result] == ["order1", "order2"]
+    assert result[0]["restaurant_id"] == "restaurant1"
+    assert parse(snapshots_to_json([])) == []
@@ -7,7 +7,7 @@ from google.cloud.firestore import Transaction
 
 from app.models.firestore_ref import FirestoreRef
 from app.models.order import PersistedOrder
-from app.services.orders.shared import finalize_order_stock
+from app.services.orders.shared import read_order_stock_updates
 
 
 @pytest.fixture
@@ -17,9 +17,11 @@ def mock_db_ref():
 
 @pytest.fixture
 def mock_order():
+    restaurant_ref = MagicMock(spec=FirestoreRef)
+    restaurant_ref.id = "rest1"
     return PersistedOrder(
         order_items={"dish1": 2, "dish2": 1},
-        restaurant_id=MagicMock(spec=FirestoreRef),
+        restaurant_id=restaurant_ref,
         user_id="user1",
         total_price=0.0,
         total_price_including_special_offers=0.0,
@@ -28,22 +30,21 @@ def mock_order():
     )
 
 
-def make_restaurant_dish_doc(doc_id, dish_id, stock_count):
+def make_restaurant_dish_doc(doc_id, dish_id, stock_count, stock_shards=0):
     doc = MagicMock()
     doc.id = doc_id
     doc.to_dict.return_value = {
         "dish_id": MagicMock(id=dish_id),
         "restaurant_id": MagicMock(),
         "stock_count": stock_count,
+        "stock_shards": stock_shards,
         "is_available": True,
     }
     return doc
 
 
-@patch("app.services.orders.shared.firestore.transactional", lambda f: f)  # skip transactional decorator logic
-def test_finalize_order_success(mock_order, mock_db_ref):
+def test_stock_is_decremented_by_ordered_quantity(mock_order, mock_db_ref):
     mock_transaction = MagicMock(spec=Transaction)
-    mock_db_ref.transaction.return_value = mock_transaction
 
     dish1_doc = make_restaurant_dish_doc("rd1", "dish1", stock_count=5)
     dish2_doc = make_restaurant_dish_doc("rd2", "dish2", stock_count=2)
@@ -51,18 +52,17 @@ def test_finalize_order_success(mock_order, mock_db_ref):
     mock_db_ref.collection.return_value.where.return_value.where.return_value = MagicMock()
     mock_transaction.get.return_value = [dish1_doc, dish2_doc]
 
-    result = finalize_order_stock(mock_order, "order1", mock_db_ref)
+    updates = read_order_stock_updates(mock_transaction, mock_order, "order1", mock_db_ref)
 
-    assert result is True
-    assert mock_transaction.update.call_count == 2
-    mock_transaction.update.assert_any_call(mock_db_ref.collection().document("rd1"), {"stock_count": 3})
-    mock_transaction.update.assert_any_call(mock_db_ref.collection().document("rd2"), {"stock_count": 1})
+    assert updates == [
+        (mock_db_ref.collection().document("rd1"), {"stock_count": 3}),
+        (mock_db_ref.collection().document("rd2"), {"stock_count": 1}),
+    ]
+    mock_transaction.update.assert_not_called()
 
 
-@patch("app.services.orders.shared.firestore.transactional", lambda f: f)
-def test_finalize_order_insufficient_stock(mock_order, mock_db_ref):
+def test_insufficient_stock_is_rejected(mock_order, mock_db_ref):
     mock_transaction = MagicMock(spec=Transaction)
-    mock_db_ref.transaction.return_value = mock_transaction
 
     dish1_doc = make_restaurant_dish_doc("rd1", "dish1", stock_count=1)  # Not enough for quantity=2
     dish2_doc = make_restaurant_dish_doc("rd2", "dish2", stock_count=5)
@@ -71,8 +71,24 @@ def test_finalize_order_insufficient_stock(mock_order, mock_db_ref):
     mock_transaction.get.return_value = [dish1_doc, dish2_doc]
 
     with pytest.raises(HTTPException) as exc_info:
-        finalize_order_stock(mock_order, "order2", mock_db_ref)
+        read_order_stock_updates(mock_transaction, mock_order, "order2", mock_db_ref)
 
     assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     assert "exceeds current restaurant stock" in exc_info.value.detail
     mock_transaction.update.assert_not_called()
+
+
+@patch("app.services.orders.shared.read_sharded_decrement")
+def test_sharded_dishes_decrement_their_shards(mock_read_sharded_decrement, mock_order, mock_db_ref):
+    mock_transaction = MagicMock(spec=Transaction)
+    shard_ref = MagicMock()
+    mock_read_sharded_decrement.return_value = [(shard_ref, {"count": 1})]
+    mock_transaction.get.return_value = [
+        make_restaurant_dish_doc("rd1", "dish1", stock_count=0, stock_shards=4),
+        make_restaurant_dish_doc("rd2", "dish2", stock_count=2),
+    ]
+
+    updates = read_order_stock_updates(mock_transaction, mock_order, "order1", mock_db_ref)
+
+    mock_read_sharded_decrement.assert_called_once_with(mock_transaction, mock_db_ref.collection().document(), 4, 2)
+    assert updates == [(shard_ref, {"count": 1}), (mock_db_ref.collection().document("rd2"), {"stock_count": 1})]
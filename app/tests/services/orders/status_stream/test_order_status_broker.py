@@ -0,0 +1,101 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.order import OrderStatus, PersistedOrder
+from app.services.orders.status_stream import OrderStatusBroker
+from app.services.shared.sse import EventSubscriber
+
+
+def make_order(order_status):
+    now = datetime(2025, 5, 1, tzinfo=UTC)
+    return PersistedOrder(
+        user_id="user1",
+        order_items={"dish1": 1},
+        total_price=10.0,
+        total_price_including_special_offers=10.0,
+        status=order_status,
+        created_at=now,
+        updated_at=now,
+        restaurant_id=MagicMock(),
+    )
+
+
+def drain(subscriber):
+    messages = []
+    while not subscriber.queue.empty():
+        messages.append(subscriber.queue.get_nowait().decode("utf-8"))
+    return messages
+
+
+def event_id(message):
+    return message.split("\n")[0].removeprefix("id: ")
+
+
+@pytest.fixture
+def broker():
+    return OrderStatusBroker(history_size=2, history_max_users=10, history_ttl_seconds=60)
+
+
+def test_status_changes_reach_only_the_order_owner(broker):
+    async def run():
+        owner, other = EventSubscriber(10), EventSubscriber(10)
+        broker.subscribe("user1", owner)
+        broker.subscribe("user2", other)
+        broker.publish("user1", "order1", make_order(OrderStatus.IN_PROGRESS))
+        await asyncio.sleep(0)
+        return drain(owner), drain(other)
+
+    owner_messages, other_messages = asyncio.run(run())
+
+    assert len(owner_messages) == 1
+    assert "event: status" in owner_messages[0]
+    assert '"id":"order1","status":"in_progress"' in owner_messages[0]
+    assert other_messages == []
+
+
+def test_reconnect_replays_missed_events(broker):
+    async def run():
+        first = EventSubscriber(10)
+        broker.subscribe("user1", first)
+        broker.publish("user1", "order1", make_order(OrderStatus.IN_PROGRESS))
+        await asyncio.sleep(0)
+        seen = drain(first)
+        broker.unsubscribe("user1", first)
+
+        broker.publish("user1", "order1", make_order(OrderStatus.READY))
+        reconnected = EventSubscriber(10)
+        broker.subscribe("user1", reconnected, event_id(seen[-1]))
+        up_to_date = EventSubscriber(10)
+        broker.subscribe("user1", up_to_date, event_id(drain(reconnected)[-1]))
+        return drain(up_to_date)
+
+    assert asyncio.run(run()) == []
+
+
+def test_reconnect_past_the_kept_history_asks_for_resync(broker):
+    statuses = [OrderStatus.IN_PROGRESS, OrderStatus.READY, OrderStatus.COMPLETED, OrderStatus.CANCELLED]
+
+    async def run():
+        subscriber = EventSubscriber(10)
+        broker.subscribe("user1", subscriber)
+        for order_status in statuses:
+            broker.publish("user1", "order1", make_order(order_status))
+        await asyncio.sleep(0)
+        event_ids = [event_id(message) for message in drain(subscriber)]
+
+        replayed, trimmed, unknown = EventSubscriber(10), EventSubscriber(10), EventSubscriber(10)
+        broker.subscribe("user1", replayed, event_ids[1])
+        broker.subscribe("user1", trimmed, event_ids[0])
+        broker.subscribe("user1", unknown, "previous-process-7")
+        return drain(replayed), drain(trimmed), drain(unknown)
+
+    replayed_messages, trimmed_messages, unknown_messages = asyncio.run(run())
+
+    assert len(replayed_messages) == 2
+    assert '"status":"completed"' in replayed_messages[0]
+    assert '"status":"cancelled"' in replayed_messages[1]
+    assert trimmed_messages == ["event: resync\ndata: {}\n\n"]
+    assert unknown_messages == ["event: resync\ndata: {}\n\n"]
@@ -0,0 +1,108 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from google.cloud.firestore_v1 import DocumentReference
+
+from app.models.order import OrderStatus
+from app.services.orders.rollups import ROLLUPS_PER_ORDER
+from app.services.orders.worker_panel import (
+    BULK_TRANSITION_MAX_ORDERS,
+    MAX_WRITES_PER_COMMIT,
+    bulk_transition_order_status,
+)
+
+
+def make_order_doc(order_id, order_status, restaurant_id="rest1"):
+    now = datetime.now(UTC)
+    data = {
+        "user_id": "user1",
+        "order_items": {"dish1": 1},
+        "total_price": 20.0,
+        "total_price_including_special_offers": 20.0,
+        "status": order_status.value,
+        "points_used": 0,
+        "created_at": now,
+        "updated_at": now,
+        "restaurant_id": MagicMock(spec=DocumentReference, id=restaurant_id),
+    }
+    return MagicMock(id=order_id, exists=True, to_dict=lambda: data)
+
+
+@pytest.fixture
+def mock_db_ref():
+    mock_db = MagicMock()
+    mock_db.collection.return_value.document.side_effect = lambda doc_id: MagicMock(id=doc_id, path=f"orders/{doc_id}")
+    return mock_db
+
+
+@patch("app.services.orders.worker_panel.publish_order_status")
+@patch("app.services.orders.worker_panel.get_all_in_chunks")
+@patch("app.services.orders.worker_panel.firestore.transactional", lambda f: f)
+def test_transitions_valid_orders_in_one_transaction(mock_get_all, mock_publish, mock_db_ref):
+    missing = MagicMock(id="missing", exists=False)
+    mock_get_all.return_value = [
+        make_order_doc("order1", OrderStatus.IN_PROGRESS),
+        make_order_doc("order2", OrderStatus.PAID),
+        make_order_doc("order3", OrderStatus.IN_PROGRESS, restaurant_id="other"),
+        make_order_doc("order4", OrderStatus.IN_PROGRESS),
+        missing,
+    ]
+    restaurant_ref = MagicMock(spec=DocumentReference, id="rest1")
+
+    results = bulk_transition_order_status(
+        ["order1", "order2", "order3", "order1", "order4", "missing"], restaurant_ref, OrderStatus.READY, mock_db_ref
+    )
+
+    assert [result.id for result in results] == ["order1", "order2", "order3", "order4", "missing"]
+    assert [result.status for result in results] == [OrderStatus.READY, None, None, OrderStatus.READY, None]
+    assert "incorrect state" in results[1].error
+    assert "No such order" in results[2].error
+    assert "No such order" in results[4].error
+
+    transaction = mock_db_ref.transaction.return_value
+    mock_get_all.assert_called_once()
+    assert mock_get_all.call_args.kwargs["transaction"] is transaction
+    assert transaction.update.call_count == 2
+    assert transaction.update.call_args.args[1]["status"] == OrderStatus.READY.value
+    # Both orders were created in the same hour, so they share their day and hour rollups.
+    assert transaction.set.call_count == 2
+    mock_db_ref.batch.assert_not_called()
+    assert [call.args[0] for call in mock_publish.call_args_list] == ["order1", "order4"]
+
+
+@patch("app.services.orders.worker_panel.publish_order_status")
+@patch("app.services.orders.worker_panel.get_all_in_chunks")
+@patch("app.services.orders.worker_panel.firestore.transactional", lambda f: f)
+def test_writes_nothing_when_nothing_transitions(mock_get_all, mock_publish, mock_db_ref):
+    mock_get_all.return_value = [make_order_doc("order1", OrderStatus.PAID)]
+
+    results = bulk_transition_order_status(
+        ["order1"], MagicMock(spec=DocumentReference, id="rest1"), OrderStatus.COMPLETED, mock_db_ref
+    )
+
+    assert results[0].error is not None
+    mock_db_ref.transaction.return_value.update.assert_not_called()
+    mock_db_ref.transaction.return_value.set.assert_not_called()
+    mock_publish.assert_not_called()
+
+
+def test_invalid_target_status_raises_error(mock_db_ref):
+    with pytest.raises(HTTPException) as e:
+        bulk_transition_order_status(["order1"], MagicMock(spec=DocumentReference), OrderStatus.PAID, mock_db_ref)
+
+    assert e.value.status_code == 422
+    assert "Incorrect state to transition" in e.value.detail
+
+
+def test_too_many_orders_raise_error(mock_db_ref):
+    assert BULK_TRANSITION_MAX_ORDERS == 166
+    assert BULK_TRANSITION_MAX_ORDERS * (1 + ROLLUPS_PER_ORDER) <= MAX_WRITES_PER_COMMIT
+    order_ids = [f"order{i}" for i in range(BULK_TRANSITION_MAX_ORDERS + 1)]
+
+    with pytest.raises(HTTPException) as e:
+        bulk_transition_order_status(order_ids, MagicMock(spec=DocumentReference), OrderStatus.READY, mock_db_ref)
+
+    assert e.value.status_code == 422
+    mock_db_ref.transaction.assert_not_called()
@@ -6,7 +6,7 @@ from fastapi import HTTPException
 from google.cloud.firestore_v1 import DocumentReference
 
 from app.models.order import OrderStatus, PersistedOrder
-from app.services.orders.worker_panel import transition_order_status
+from app.services.orders.worker_panel import apply_order_status_transition, transition_order_status
 
 
 @pytest.fixture
@@ -46,7 +46,7 @@ def test_successful_transition(mock_check_order, mock_order, mock_db_ref, target
 
     assert result.status == target_status
     assert isinstance(result.updated_at, datetime)
-    mock_check_order.assert_called_once_with("order123", expected_from_status, None, mock_db_ref)
+    mock_check_order.assert_called_once_with("order123", expected_from_status, None, mock_db_ref, transaction=None)
 
 
 def test_invalid_transition_raises_error(mock_db_ref):
@@ -69,3 +69,24 @@ def test_wrong_restaurant_id_raises_error(mock_check_order, mock_order, mock_db_
 
     assert e.value.status_code == 422
     assert "No such order with id" in e.value.detail
+
+
+@patch("app.services.orders.worker_panel.publish_order_status")
+@patch("app.services.orders.worker_panel.record_order_transition")
+@patch("app.services.orders.worker_panel.check_order_validity_and_ownership")
+@patch("app.services.orders.worker_panel.firestore.transactional", lambda f: f)
+def test_applied_transition_reads_and_writes_in_one_transaction(
+    mock_check_order, mock_record, mock_publish, mock_order, mock_db_ref
+):
+    mock_check_order.return_value = mock_order
+    transaction = mock_db_ref.transaction.return_value
+
+    result = apply_order_status_transition(
+        "order123", MagicMock(spec=DocumentReference, id="rest1"), OrderStatus.IN_PROGRESS, mock_db_ref
+    )
+
+    assert mock_check_order.call_args.kwargs["transaction"] is transaction
+    transaction.set.assert_called_once_with(mock_db_ref.collection().document("order123"), result.model_dump())
+    mock_record.assert_called_once_with(transaction, mock_db_ref, result, OrderStatus.PAID)
+    mock_db_ref.batch.assert_not_called()
+    mock_publish.assert_called_once_with("order123", result)
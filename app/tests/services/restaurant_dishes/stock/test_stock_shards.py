@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.restaurant_dishes.stock import read_sharded_decrement, reshard_stock, split_stock
+
+
+def make_restaurant_dish_ref(shard_counts):
+    restaurant_dish_ref = MagicMock(path="restaurant_dishes/rd1")
+
+    def make_shard_ref(shard_id):
+        shard_ref = MagicMock(path=f"restaurant_dishes/rd1/stock_shards/{shard_id}")
+        shard_ref.get.return_value = MagicMock(exists=True, to_dict=lambda: {"count": shard_counts[int(shard_id)]})
+        return shard_ref
+
+    restaurant_dish_ref.collection.return_value.document.side_effect = make_shard_ref
+    return restaurant_dish_ref
+
+
+def test_split_stock_spreads_remainder():
+    assert split_stock(10, 3) == [4, 3, 3]
+    assert split_stock(2, 4) == [1, 1, 0, 0]
+    assert split_stock(5, 0) == []
+
+
+def test_decrement_takes_from_a_single_shard_when_it_has_enough():
+    restaurant_dish_ref = make_restaurant_dish_ref([5, 5, 5, 5])
+
+    updates = read_sharded_decrement(MagicMock(), restaurant_dish_ref, 4, 3)
+
+    assert len(updates) == 1
+    assert updates[0][1] == {"count": 2}
+
+
+def test_decrement_spans_shards_and_fails_when_total_is_short():
+    restaurant_dish_ref = make_restaurant_dish_ref([1, 0, 2])
+
+    updates = read_sharded_decrement(MagicMock(), restaurant_dish_ref, 3, 3)
+
+    assert sorted(update["count"] for _, update in updates) == [0, 0]
+    assert read_sharded_decrement(MagicMock(), restaurant_dish_ref, 3, 4) is None
+
+
+@patch("app.services.restaurant_dishes.stock.firestore.transactional", lambda f: f)
+def test_reshard_moves_stock_from_shards_to_new_shards():
+    restaurant_dish_ref = make_restaurant_dish_ref([3, 4, 0])
+    restaurant_dish_ref.get.return_value.to_dict.return_value = {"stock_count": 0, "stock_shards": 3}
+    mock_db_ref = MagicMock()
+    mock_db_ref.get_all.side_effect = lambda refs, field_paths=None, transaction=None: [ref.get() for ref in refs]
+    transaction = mock_db_ref.transaction.return_value
+
+    assert reshard_stock(restaurant_dish_ref, 2, mock_db_ref) == 7
+
+    transaction.update.assert_called_once_with(restaurant_dish_ref, {"stock_count": 7, "stock_shards": 2})
+    assert [(call.args[0].path, call.args[1]) for call in transaction.set.call_args_list] == [
+        ("restaurant_dishes/rd1/stock_shards/0", {"count": 4}),
+        ("restaurant_dishes/rd1/stock_shards/1", {"count": 3}),
+    ]
+    assert [call.args[0].path for call in transaction.delete.call_args_list] == ["restaurant_dishes/rd1/stock_shards/2"]
+
+
+def test_reshard_rejects_out_of_range_shard_counts():
+    with pytest.raises(HTTPException):
+        reshard_stock(MagicMock(), -1, MagicMock())
@@ -0,0 +1,14 @@
+from unittest.mock import MagicMock, patch
+
+from app.services.restaurants.panel import remove_restaurant
+
+
+@patch("app.services.restaurants.panel.invalidate_menu")
+def test_removed_restaurant_menu_is_invalidated(mock_invalidate_menu):
+    mock_db_ref = MagicMock()
+
+    remove_restaurant("restaurant1", mock_db_ref)
+
+    mock_db_ref.collection.return_value.document.assert_called_once_with("restaurant1")
+    mock_db_ref.collection.return_value.document.return_value.delete.assert_called_once()
+    mock_invalidate_menu.assert_called_once_with("restaurant1")
@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+
+from app.services.shared.batching import GET_ALL_CHUNK_SIZE, get_all_in_chunks
+
+
+def make_ref(doc_id):
+    return MagicMock(id=doc_id, path=f"dishes/{doc_id}")
+
+
+def test_references_are_read_in_chunks():
+    mock_db_ref = MagicMock()
+    mock_db_ref.get_all.side_effect = lambda refs, field_paths=None, transaction=None: [
+        MagicMock(id=ref.id) for ref in refs
+    ]
+    refs = [make_ref(f"dish{i}") for i in range(GET_ALL_CHUNK_SIZE + 20)]
+
+    snapshots = get_all_in_chunks(mock_db_ref, refs, field_paths=["name"])
+
+    assert len(snapshots) == GET_ALL_CHUNK_SIZE + 20
+    assert mock_db_ref.get_all.call_count == 2
+    assert [len(call.args[0]) for call in mock_db_ref.get_all.call_args_list] == [GET_ALL_CHUNK_SIZE, 20]
+
+
+def test_duplicate_references_are_read_once():
+    mock_db_ref = MagicMock()
+    mock_db_ref.get_all.return_value = []
+
+    get_all_in_chunks(mock_db_ref, [make_ref("dish1"), make_ref("dish1"), make_ref("dish2")])
+
+    assert len(mock_db_ref.get_all.call_args.args[0]) == 2
+
+
+def test_no_references_make_no_calls():
+    mock_db_ref = MagicMock()
+
+    assert get_all_in_chunks(mock_db_ref, []) == []
+    mock_db_ref.get_all.assert_not_called()
@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+from app.services.shared.batching import IN_FILTER_MAX_VALUES, query_in_chunks
+
+
+def make_query():
+    query = MagicMock()
+    query.where.side_effect = lambda filter: MagicMock(
+        values=filter.value, stream=lambda: [MagicMock(id=value) for value in filter.value]
+    )
+    return query
+
+
+def test_values_are_queried_in_chunks():
+    query = make_query()
+    values = [f"dish{i}" for i in range(IN_FILTER_MAX_VALUES * 2 + 5)]
+
+    snapshots = query_in_chunks(query, "dish_id", values)
+
+    assert sorted(snapshot.id for snapshot in snapshots) == sorted(values)
+    chunk_sizes = [len(call.kwargs["filter"].value) for call in query.where.call_args_list]
+    assert chunk_sizes == [IN_FILTER_MAX_VALUES, IN_FILTER_MAX_VALUES, 5]
+    assert all(call.kwargs["filter"].op_string == "in" for call in query.where.call_args_list)
+
+
+def test_duplicate_values_are_queried_once():
+    query = make_query()
+
+    query_in_chunks(query, "dish_id", ["dish1", "dish1", "dish2"])
+
+    assert query.where.call_args.kwargs["filter"].value == ["dish1", "dish2"]
+
+
+def test_no_values_skip_the_query():
+    query = make_query()
+
+    assert query_in_chunks(query, "dish_id", []) == []
+    query.where.assert_not_called()
+
+
+def test_chunks_are_read_in_the_transaction():
+    query = make_query()
+    transaction = MagicMock()
+    transaction.get.side_effect = lambda chunk_query: [MagicMock(id=value) for value in chunk_query.values]
+    values = [f"dish{i}" for i in range(IN_FILTER_MAX_VALUES + 1)]
+
+    snapshots = query_in_chunks(query, "dish_id", values, transaction=transaction)
+
+    assert len(snapshots) == len(values)
+    assert transaction.get.call_count == 2
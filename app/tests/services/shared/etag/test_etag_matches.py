@@ -0,0 +1,19 @@
+from app.services.shared.etag import etag_matches, make_strong_etag
+
+ETAG = make_strong_etag(b"[]")
+
+
+def test_missing_header_does_not_match():
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+
+
+def test_header_lists_and_wildcards_match():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches(f'"other", {ETAG}', ETAG)
+    assert etag_matches(f"W/{ETAG}", ETAG)
+    assert etag_matches("*", ETAG)
+
+
+def test_stale_etag_does_not_match():
+    assert not etag_matches(make_strong_etag(b"[{}]"), ETAG)
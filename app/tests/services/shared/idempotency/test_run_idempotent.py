@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from app.services.shared.idempotency import StoredResponse, idempotency_cache, run_idempotent
+
+
+class Payload(BaseModel):
+    id: str
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    idempotency_cache.clear()
+    yield
+    idempotency_cache.clear()
+
+
+def counting_call(response=StoredResponse(status.HTTP_201_CREATED, b"{}"), error=None, delay=0.0):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return response
+
+    return call, calls
+
+
+def test_replays_stored_response():
+    call, calls = counting_call()
+
+    async def run():
+        first = await run_idempotent("create", "user1", "key1", Payload(id="a"), call)
+        second = await run_idempotent("create", "user1", "key1", Payload(id="a"), call)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_keys_are_scoped_per_user_and_operation():
+    call, calls = counting_call()
+
+    async def run():
+        await run_idempotent("create", "user1", "key1", Payload(id="a"), call)
+        await run_idempotent("create", "user2", "key1", Payload(id="a"), call)
+        await run_idempotent("pay", "user1", "key1", Payload(id="a"), call)
+
+    asyncio.run(run())
+
+    assert len(calls) == 3
+
+
+def test_runs_every_request_without_key():
+    call, calls = counting_call()
+
+    async def run():
+        await run_idempotent("create", "user1", None, Payload(id="a"), call)
+        await run_idempotent("create", "user1", None, Payload(id="a"), call)
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+
+
+def test_collapses_concurrent_duplicates():
+    call, calls = counting_call(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(
+            *(run_idempotent("create", "user1", "key1", Payload(id="a"), call) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert len(set(results)) == 1
+    assert len(calls) == 1
+
+
+def test_replays_client_errors():
+    call, calls = counting_call(error=HTTPException(status_code=422, detail="incorrect state"))
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(HTTPException) as e:
+                await run_idempotent("pay", "user1", "key1", Payload(id="a"), call)
+            assert e.value.status_code == 422
+            assert e.value.detail == "incorrect state"
+
+    asyncio.run(run())
+
+    assert len(calls) == 1
+
+
+def test_does_not_store_server_errors():
+    call, calls = counting_call(error=RuntimeError("deadline exceeded"))
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await run_idempotent("pay", "user1", "key1", Payload(id="a"), call)
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+
+
+def test_rejects_key_reused_with_different_payload():
+    call, _ = counting_call()
+
+    async def run():
+        await run_idempotent("create", "user1", "key1", Payload(id="a"), call)
+        with pytest.raises(HTTPException) as e:
+            await run_idempotent("create", "user1", "key1", Payload(id="b"), call)
+        return e.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 422
+
+
+def test_duplicate_runs_the_request_when_the_first_one_is_cancelled():
+    call, calls = counting_call(delay=0.05)
+
+    async def run():
+        first = asyncio.create_task(run_idempotent("create", "user1", "key1", Payload(id="a"), call))
+        await asyncio.sleep(0)
+        duplicates = [
+            asyncio.create_task(run_idempotent("create", "user1", "key1", Payload(id="a"), call)) for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await asyncio.gather(*duplicates)
+
+    results = asyncio.run(run())
+
+    assert results == [StoredResponse(status.HTTP_201_CREATED, b"{}")] * 2
+    assert len(calls) == 2
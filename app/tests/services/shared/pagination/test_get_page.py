@@ -0,0 +1,66 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.shared.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, get_page
+
+
+def make_snapshot(doc_id, created_at):
+    snapshot = MagicMock(id=doc_id)
+    snapshot.get.side_effect = lambda field: {"created_at": created_at}[field]
+    return snapshot
+
+
+@pytest.fixture
+def mock_query():
+    query = MagicMock()
+    ordered = query.order_by.return_value.order_by.return_value
+    ordered.start_after.return_value = ordered
+    return query
+
+
+def ordered_query(query):
+    return query.order_by.return_value.order_by.return_value
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 5, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+    assert decode_cursor(encode_cursor(make_snapshot("order7", created_at))) == {
+        "created_at": created_at,
+        "__name__": "order7",
+    }
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30=", "bnVsbA=="])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_full_page_returns_next_cursor(mock_query):
+    snapshots = [make_snapshot(f"order{i}", datetime(2025, 5, 3 - i, tzinfo=UTC)) for i in range(3)]
+    ordered_query(mock_query).limit.return_value.stream.return_value = snapshots
+
+    page, next_cursor = get_page(mock_query, 2)
+
+    assert page == snapshots[:2]
+    assert decode_cursor(next_cursor)["__name__"] == "order1"
+    ordered_query(mock_query).limit.assert_called_once_with(3)
+
+
+def test_last_page_has_no_cursor_and_resumes_after_cursor(mock_query):
+    snapshots = [make_snapshot("order2", datetime(2025, 5, 1, tzinfo=UTC))]
+    ordered_query(mock_query).limit.return_value.stream.return_value = snapshots
+    cursor = encode_cursor(make_snapshot("order1", datetime(2025, 5, 2, tzinfo=UTC)))
+
+    page, next_cursor = get_page(mock_query, 500, cursor)
+
+    assert page == snapshots
+    assert next_cursor is None
+    ordered_query(mock_query).start_after.assert_called_once_with(decode_cursor(cursor))
+    ordered_query(mock_query).limit.assert_called_once_with(MAX_PAGE_SIZE + 1)
@@ -0,0 +1,39 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.shared.pagination import decode_id_cursor, encode_id_cursor, get_page_by_id
+
+
+def test_last_page_has_no_cursor():
+    query = MagicMock()
+    ordered = query.order_by.return_value
+    ordered.limit.return_value.stream.return_value = [MagicMock(id="offer1")]
+
+    snapshots, next_cursor = get_page_by_id(query, 2)
+
+    assert [snapshot.id for snapshot in snapshots] == ["offer1"]
+    assert next_cursor is None
+    query.order_by.assert_called_once_with("__name__")
+    ordered.limit.assert_called_once_with(3)
+
+
+def test_next_page_starts_after_last_document():
+    query = MagicMock()
+    ordered = query.order_by.return_value
+    ordered.start_after.return_value = ordered
+    ordered.limit.return_value.stream.return_value = [MagicMock(id=f"offer{i}") for i in range(3)]
+
+    snapshots, next_cursor = get_page_by_id(query, 2, encode_id_cursor(MagicMock(id="offer0")))
+
+    assert len(snapshots) == 2
+    assert decode_id_cursor(next_cursor) == "offer1"
+    ordered.start_after.assert_called_once_with({"__name__": "offer0"})
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_id_cursor("not-a-cursor")
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,32 @@
+import asyncio
+
+from app.services.shared.sse import SSE_HEARTBEAT, EventSubscriber, format_sse
+
+
+def test_format_sse():
+    assert format_sse("status", '{"a":1}', "7") == b'id: 7\nevent: status\ndata: {"a":1}\n\n'
+    assert format_sse("status", "{}") == b"event: status\ndata: {}\n\n"
+
+
+def test_idle_stream_sends_heartbeats():
+    async def run():
+        subscriber = EventSubscriber(max_size=2)
+        stream = subscriber.stream(heartbeat_seconds=0.01)
+        heartbeat = await anext(stream)
+        subscriber.offer(b"event")
+        return heartbeat, await anext(stream)
+
+    assert asyncio.run(run()) == (SSE_HEARTBEAT, b"event")
+
+
+def test_slow_subscriber_is_closed_instead_of_buffering():
+    async def run():
+        subscriber = EventSubscriber(max_size=2)
+        for index in range(5):
+            subscriber.offer(f"event{index}".encode())
+        return subscriber.closed, [message async for message in subscriber.stream(heartbeat_seconds=1)]
+
+    closed, messages = asyncio.run(run())
+
+    assert closed
+    assert messages == []
@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock, patch
+
+from app.services.special_offers.best_prices import BEST_PRICE_OFFER_FIELDS, get_best_prices, refresh_best_prices
+
+
+def make_offer_doc(dish_id, special_price, exists=True):
+    return MagicMock(exists=exists, to_dict=lambda: {"dish_id": MagicMock(id=dish_id), "special_price": special_price})
+
+
+@patch("app.services.special_offers.best_prices.firestore.transactional", lambda f: f)
+def test_refresh_keeps_the_lowest_price_per_dish():
+    mock_db_ref = MagicMock()
+    transaction = mock_db_ref.transaction.return_value
+    restaurant_ref = MagicMock()
+    restaurant_ref.get.return_value.to_dict.return_value = {"special_offers": [MagicMock(path="special_offers/1")]}
+    mock_db_ref.get_all.return_value = [
+        make_offer_doc("dish1", 12.0),
+        make_offer_doc("dish1", 9.5),
+        make_offer_doc("dish2", 4.0),
+        make_offer_doc("dish3", 1.0, exists=False),
+    ]
+
+    best_prices = refresh_best_prices(restaurant_ref, mock_db_ref)
+
+    assert best_prices == {"dish1": 9.5, "dish2": 4.0}
+    assert mock_db_ref.get_all.call_args.kwargs["field_paths"] == BEST_PRICE_OFFER_FIELDS
+    assert mock_db_ref.get_all.call_args.kwargs["transaction"] is transaction
+    transaction.update.assert_called_once_with(restaurant_ref, {"best_prices": best_prices})
+
+
+@patch("app.services.special_offers.best_prices.refresh_best_prices")
+def test_stored_table_is_used_as_is(mock_refresh):
+    restaurant_ref = MagicMock()
+    restaurant_ref.get.return_value.to_dict.return_value = {"best_prices": {"dish1": 9.5}}
+
+    assert get_best_prices(restaurant_ref, MagicMock()) == {"dish1": 9.5}
+    mock_refresh.assert_not_called()
+
+
+@patch("app.services.special_offers.best_prices.refresh_best_prices", return_value={"dish1": 7.0})
+def test_missing_table_is_built_on_first_use(mock_refresh):
+    restaurant_ref = MagicMock()
+    restaurant_ref.get.return_value.to_dict.return_value = {}
+    mock_db_ref = MagicMock()
+
+    assert get_best_prices(restaurant_ref, mock_db_ref) == {"dish1": 7.0}
+    mock_refresh.assert_called_once_with(restaurant_ref, mock_db_ref)
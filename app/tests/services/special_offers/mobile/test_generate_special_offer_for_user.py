@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from google.cloud.firestore import ArrayUnion  # type: ignore
+
+from app.models.user import User, UserRole
+from app.services.special_offers.mobile import generate_special_offer_for_user
+
+MENU = [{"id": "dish1", "name": "Wings", "description": "Hot", "price": 20.0, "stock_count": 3}]
+
+
+@pytest.fixture
+def mock_user():
+    return User(id="user1", email="test@test.com", role=UserRole.CUSTOMER)
+
+
+@pytest.fixture
+def mock_db_ref():
+    mock_db = MagicMock()
+    mock_db.collection.side_effect = lambda name: MagicMock(
+        document=lambda doc_id="offer1": MagicMock(id=doc_id, path=f"{name.value}/{doc_id}")
+    )
+    return mock_db
+
+
+@patch("app.services.special_offers.mobile.invalidate_cached_user")
+@patch("app.services.special_offers.mobile.get_available_dishes", return_value=MENU)
+def test_offer_is_created_with_one_batched_write(mock_available, mock_invalidate, mock_db_ref, mock_user):
+    result = generate_special_offer_for_user(mock_user, "rest1", mock_db_ref)
+
+    assert result["dish_id"] == "dish1"
+    assert result["original_price"] == 20.0
+    assert 2.0 <= result["special_price"] <= 18.0
+    mock_db_ref.get_all.assert_not_called()
+
+    batch = mock_db_ref.batch.return_value
+    offer_ref, offer = batch.set.call_args.args
+    assert offer_ref.path == "special_offers/offer1"
+    assert offer["special_price"] == result["special_price"]
+    user_ref, update = batch.update.call_args.args
+    assert user_ref.path == "users/user1"
+    assert update == {"special_offers": ArrayUnion([offer_ref])}
+    batch.commit.assert_called_once()
+    mock_invalidate.assert_called_once_with("user1")
+
+
+@patch("app.services.special_offers.mobile.check_restaurant_existence")
+@patch("app.services.special_offers.mobile.get_available_dishes", return_value=[])
+def test_no_available_dishes_raises_error(mock_available, mock_check_restaurant, mock_db_ref, mock_user):
+    with pytest.raises(HTTPException) as e:
+        generate_special_offer_for_user(mock_user, "rest1", mock_db_ref)
+
+    assert e.value.status_code == 404
+    mock_check_restaurant.assert_called_once_with("rest1", mock_db_ref)
+    mock_db_ref.batch.assert_not_called()
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import ArrayUnion  # type: ignore
+
+from app.services.special_offers.panel import (
+    add_special_offer_to_restaurant,
+    add_special_offer_to_restaurants,
+    remove_special_offer_from_restaurant,
+)
+
+
+@pytest.fixture
+def mock_db_ref():
+    mock_db = MagicMock()
+    mock_db.collection.side_effect = lambda name: MagicMock(
+        document=lambda doc_id: MagicMock(id=doc_id, path=f"{name.value}/{doc_id}")
+    )
+    return mock_db
+
+
+@patch("app.services.special_offers.panel.refresh_restaurants_best_prices")
+def test_offer_is_added_to_all_restaurants_in_one_commit(mock_refresh, mock_db_ref):
+    result = add_special_offer_to_restaurants("offer1", ["rest1", "rest2", "rest1"], mock_db_ref)
+
+    batch = mock_db_ref.batch.return_value
+    assert [call.args[0].id for call in batch.update.call_args_list] == ["rest1", "rest2"]
+    assert list(batch.update.call_args.args[1]["special_offers"].values)[0].id == "offer1"
+    batch.commit.assert_called_once()
+    assert "2 restaurants" in result["message"]
+    assert [ref.id for ref in mock_refresh.call_args.args[0]] == ["rest1", "rest2"]
+
+
+def test_missing_restaurants_are_reported(mock_db_ref):
+    mock_db_ref.batch.return_value.commit.side_effect = NotFound("no document to update")
+    mock_db_ref.get_all.return_value = [MagicMock(id="rest1", exists=True), MagicMock(id="rest2", exists=False)]
+
+    with pytest.raises(HTTPException) as e:
+        add_special_offer_to_restaurants("offer1", ["rest1", "rest2"], mock_db_ref)
+
+    assert e.value.status_code == 422
+    assert "rest2" in e.value.detail and "rest1" not in e.value.detail
+
+
+@patch("app.services.special_offers.panel.refresh_best_prices")
+def test_single_restaurant_is_updated_without_reading_it(mock_refresh):
+    offer_ref = MagicMock()
+    restaurant_ref = MagicMock()
+    mock_db = MagicMock()
+    mock_db.collection.side_effect = lambda name: MagicMock(
+        document=lambda doc_id: offer_ref if name.value == "special_offers" else restaurant_ref
+    )
+
+    add_special_offer_to_restaurant("rest1", "offer1", mock_db)
+
+    restaurant_ref.get.assert_not_called()
+    restaurant_ref.update.assert_called_once_with({"special_offers": ArrayUnion([offer_ref])})
+    mock_refresh.assert_called_once_with(restaurant_ref, mock_db)
+
+
+def test_removing_from_missing_restaurant_raises_error():
+    mock_db = MagicMock()
+    mock_db.collection.return_value.document.return_value.update.side_effect = NotFound("no document to update")
+
+    with pytest.raises(HTTPException) as e:
+        remove_special_offer_from_restaurant("rest1", "offer1", mock_db)
+
+    assert e.value.status_code == 422
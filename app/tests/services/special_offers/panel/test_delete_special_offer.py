@@ -0,0 +1,76 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from google.cloud.firestore import ArrayRemove  # type: ignore
+
+from app.models.background_job import BackgroundJobStatus
+from app.services.shared.background_jobs import get_background_job
+from app.services.special_offers.panel import WRITE_BATCH_SIZE, delete_special_offer
+
+
+def stage(mock_db_ref, restaurants_count, users_count, exists=True):
+    offer_ref = MagicMock(id="offer1")
+    offer_ref.get.return_value.exists = exists
+    holders = {
+        "restaurants": [MagicMock(reference=MagicMock(id=f"rest{i}")) for i in range(restaurants_count)],
+        "users": [MagicMock(reference=MagicMock(id=f"user{i}")) for i in range(users_count)],
+    }
+
+    def collection(name):
+        mock_collection = MagicMock()
+        mock_collection.document.return_value = offer_ref
+        mock_collection.where.return_value.select.return_value.stream.side_effect = lambda: iter(holders[name.value])
+        return mock_collection
+
+    mock_db_ref.collection.side_effect = collection
+    return offer_ref
+
+
+@patch("app.services.special_offers.panel.invalidate_cached_user")
+def test_holders_are_updated_with_array_remove_in_batches(mock_invalidate):
+    mock_db_ref = MagicMock()
+    offer_ref = stage(mock_db_ref, 2, WRITE_BATCH_SIZE + 10)
+    # Batches are committed from several threads, so each gets its own mock to keep call counts exact.
+    batches = []
+    mock_db_ref.batch.side_effect = lambda: batches.append(MagicMock()) or batches[-1]
+
+    result = delete_special_offer("offer1", mock_db_ref)
+
+    assert "deleted successfully" in result["message"]
+    assert len(batches) == 2
+    assert all(batch.commit.call_count == 1 for batch in batches)
+    assert sorted(batch.update.call_count for batch in batches) == [12, WRITE_BATCH_SIZE]
+    assert batches[0].update.call_args.args[1] == {"special_offers": ArrayRemove([offer_ref])}
+    assert mock_invalidate.call_count == WRITE_BATCH_SIZE + 10
+    offer_ref.delete.assert_called_once()
+
+
+def test_missing_offer_raises_error():
+    mock_db_ref = MagicMock()
+    stage(mock_db_ref, 0, 0, exists=False)
+
+    with pytest.raises(HTTPException) as e:
+        delete_special_offer("offer1", mock_db_ref)
+
+    assert e.value.status_code == 404
+
+
+@patch("app.services.special_offers.panel.invalidate_cached_user")
+def test_background_deletion_reports_progress(mock_invalidate):
+    mock_db_ref = MagicMock()
+    offer_ref = stage(mock_db_ref, 1, 3)
+
+    result = delete_special_offer("offer1", mock_db_ref, background=True)
+
+    job_id = result["job"]["id"]
+    for _ in range(100):
+        state = get_background_job(job_id)
+        if state.status != BackgroundJobStatus.RUNNING:
+            break
+        time.sleep(0.01)
+
+    assert state.status == BackgroundJobStatus.SUCCEEDED
+    assert (state.done, state.total) == (4, 4)
+    offer_ref.delete.assert_called_once()
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.special_offers.shared import dish_summary_cache, hydrate_special_offers
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    dish_summary_cache.clear()
+    yield
+    dish_summary_cache.clear()
+
+
+def make_offer_doc(offer_id, dish_id, special_price):
+    data = {
+        "name": f"{offer_id} deal",
+        "dish_id": MagicMock(id=dish_id, path=f"dishes/{dish_id}"),
+        "special_price": special_price,
+    }
+    return MagicMock(id=offer_id, exists=True, to_dict=lambda: data)
+
+
+def make_dish_doc(dish_id, data):
+    return MagicMock(id=dish_id, exists=data is not None, to_dict=lambda: data)
+
+
+@pytest.fixture
+def mock_db_ref():
+    mock_db = MagicMock()
+    mock_db.get_all.return_value = [
+        make_dish_doc("dish1", {"name": "Wings", "description": "Hot", "base_price": 20.0}),
+        make_dish_doc("dish2", {"name": "Fries", "description": "Salty", "price": 8.0}),
+        make_dish_doc("dish3", None),
+    ]
+    return mock_db
+
+
+def test_dishes_are_read_with_one_batched_read(mock_db_ref):
+    offers = [
+        make_offer_doc("offer1", "dish1", 15.0),
+        make_offer_doc("offer2", "dish2", 5.0),
+        make_offer_doc("offer3", "dish1", 12.0),
+        make_offer_doc("offer4", "dish3", 1.0),
+        MagicMock(exists=False),
+    ]
+
+    result = hydrate_special_offers(offers, mock_db_ref)
+
+    mock_db_ref.get_all.assert_called_once()
+    assert len(mock_db_ref.get_all.call_args.args[0]) == 3
+    assert [offer["id"] for offer in result] == ["offer1", "offer2", "offer3"]
+    assert result[0] == {
+        "id": "offer1",
+        "name": "offer1 deal",
+        "dish_id": "dish1",
+        "dish_name": "Wings",
+        "dish_description": "Hot",
+        "original_price": 20.0,
+        "special_price": 15.0,
+    }
+    assert result[1]["original_price"] == 8.0
+
+
+def test_dish_summaries_are_cached(mock_db_ref):
+    hydrate_special_offers([make_offer_doc("offer1", "dish1", 15.0)], mock_db_ref)
+    mock_db_ref.get_all.reset_mock()
+
+    result = hydrate_special_offers([make_offer_doc("offer1", "dish1", 15.0)], mock_db_ref)
+
+    mock_db_ref.get_all.assert_not_called()
+    assert result[0]["dish_name"] == "Wings"
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+from google.cloud.firestore import Increment  # type: ignore
+
+from app.models.points_ledger import PointsLedgerReason
+from app.services.users.points_ledger import record_order_points
+
+
+def ledger_entries(writer):
+    return {call.args[1]["reason"]: call.args[1]["delta"] for call in writer.set.call_args_list}
+
+
+def test_nothing_is_written_without_points():
+    writer = MagicMock()
+
+    record_order_points(writer, MagicMock(), "user1", "order1", 0, 0)
+
+    writer.set.assert_not_called()
+    writer.update.assert_not_called()
+
+
+def test_spent_and_earned_points_are_recorded_with_one_increment():
+    writer = MagicMock()
+    mock_db_ref = MagicMock()
+
+    record_order_points(writer, mock_db_ref, "user1", "order1", 10, 3)
+
+    assert ledger_entries(writer) == {PointsLedgerReason.ORDER_SPENT: -10, PointsLedgerReason.ORDER_EARNED: 3}
+    writer.update.assert_called_once_with(mock_db_ref.collection().document("user1"), {"points": Increment(-7)})
+
+
+def test_earned_points_alone_are_credited():
+    writer = MagicMock()
+
+    record_order_points(writer, MagicMock(), "user1", "order1", 0, 7)
+
+    assert ledger_entries(writer) == {PointsLedgerReason.ORDER_EARNED: 7}
+    assert writer.update.call_args.args[1] == {"points": Increment(7)}
@@ -0,0 +1,122 @@
+"""Compare requests/sec of the pure ASGI `AuthMiddleware` with the former `BaseHTTPMiddleware` version.
+
+Both variants serve the same routers in-process (no network, Firestore replaced by a mock, token verification
+stubbed as a cache hit), so the difference comes from the middleware implementation only.
+
+Usage:
+    PYTHONPATH=. python benchmarks/auth_middleware.py [--requests 5000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable
+from unittest.mock import MagicMock, patch
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.database import get_database_ref, run_in_database_executor
+from app.core.middleware import AuthMiddleware
+from app.routers.dishes import mobile as dishes_mobile
+from app.routers.restaurants import mobile as restaurant_mobile
+
+ENDPOINTS = ["/restaurant/mobile/get_all_restaurants", "/dish/mobile/restaurant1/available"]
+CLAIMS = {"user_id": "bench_user", "email": "bench@example.com", "exp": time.time() + 3600}
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """The previous `BaseHTTPMiddleware` based implementation, kept here as the baseline."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Any:
+        if request.method == "OPTIONS":
+            return await call_next(request)
+
+        if request.url.path.startswith("/docs") or request.url.path.startswith("/openapi.json"):
+            return await call_next(request)
+
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return JSONResponse(status_code=401, content={"detail": "No Bearer token. Unauthorized."})
+
+        token = auth_header.split("Bearer ")[1]
+        try:
+            claims = await run_in_database_executor(verify_token, token)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+
+        request.state.token_claims = claims
+        request.state.user_id = claims.get("user_id")
+        return await call_next(request)
+
+
+def verify_token(token: str) -> dict:
+    return CLAIMS
+
+
+def build_db_mock() -> MagicMock:
+    restaurant_doc = MagicMock(id="restaurant1")
+    restaurant_doc.to_dict.return_value = {
+        "name": "AGH Fried Chicken",
+        "city": "Cracow",
+        "address": "Czarnowiejska 1",
+        "opening_hours": "10:00-22:00",
+    }
+    db_ref = MagicMock()
+    db_ref.collection.return_value.stream.return_value = [restaurant_doc] * 10
+    db_ref.collection.return_value.where.return_value.where.return_value.where.return_value.stream.return_value = []
+    return db_ref
+
+
+def build_app(middleware: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+    app.include_router(restaurant_mobile.router)
+    app.include_router(dishes_mobile.router)
+    db_ref = build_db_mock()
+    app.dependency_overrides[get_database_ref] = lambda: db_ref
+    return app
+
+
+async def measure(app: FastAPI, total_requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": "Bearer benchmark-token"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in ENDPOINTS:
+            (await client.get(endpoint, headers=headers)).raise_for_status()
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                await client.get(ENDPOINTS[i % len(ENDPOINTS)], headers=headers)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total_requests)))
+        return total_requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with patch("app.core.middleware.verify_firebase_token", verify_token):
+        apps = {"BaseHTTPMiddleware": build_app(LegacyAuthMiddleware), "pure ASGI": build_app(AuthMiddleware)}
+        results = {name: 0.0 for name in apps}
+        for _ in range(args.rounds):
+            for name, app in apps.items():
+                results[name] = max(results[name], asyncio.run(measure(app, args.requests, args.concurrency)))
+
+    baseline = results["BaseHTTPMiddleware"]
+    for name, requests_per_second in results.items():
+        print(f"{name:>20}: {requests_per_second:8.0f} req/s ({requests_per_second / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Compare the per-order cost of serializing order lists with the previous model round trip.
+
+The previous path validated every Firestore document as `PersistedOrder`, dumped it, built an `Order`,
+dumped it again and ran `jsonable_encoder` before `JSONResponse` encoded the result. The current path
+serializes the Firestore data straight to JSON bytes with a precompiled `TypeAdapter`.
+
+Usage:
+    PYTHONPATH=. python benchmarks/order_serialization.py [--orders 1000] [--rounds 20]
+"""
+
+import argparse
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.firestore_ref import FirestoreRef
+from app.models.order import Order, PersistedOrder
+from app.services.orders.serialization import snapshots_to_json
+
+
+class Snapshot:
+    def __init__(self, order_id: str, data: dict) -> None:
+        self.id = order_id
+        self._data = data
+
+    def to_dict(self) -> dict:
+        return dict(self._data)
+
+
+def make_snapshots(count: int) -> list[Snapshot]:
+    created_at = datetime(2025, 5, 1, tzinfo=UTC)
+    restaurant_ref = FirestoreRef(SimpleNamespace(id="restaurant1"))
+    return [
+        Snapshot(
+            f"order{index}",
+            {
+                "user_id": f"user{index % 50}",
+                "order_items": {f"dish{item}": item + 1 for item in range(index % 5 + 1)},
+                "total_price": 42.5,
+                "total_price_including_special_offers": 37.25,
+                "status": "paid",
+                "points_used": 0,
+                "points_gained": 12,
+                "created_at": created_at + timedelta(minutes=index),
+                "updated_at": created_at + timedelta(minutes=index + 5),
+                "restaurant_id": restaurant_ref,
+                "payment_method": "card",
+            },
+        )
+        for index in range(count)
+    ]
+
+
+def legacy(snapshots: list[Snapshot]) -> bytes:
+    result = []
+    for doc in snapshots:
+        persisted_order = PersistedOrder(**doc.to_dict())
+        persisted_order_dict = persisted_order.model_dump()
+        persisted_order_dict["restaurant_id"] = persisted_order_dict["restaurant_id"].id
+        result.append(Order(**persisted_order_dict, id=doc.id).model_dump())
+    return bytes(JSONResponse(content=jsonable_encoder(result)).body)
+
+
+def current(snapshots: list[Snapshot]) -> bytes:
+    return snapshots_to_json(snapshots)
+
+
+def measure(serialize: Callable[[list[Snapshot]], Any], snapshots: list[Snapshot], rounds: int) -> float:
+    serialize(snapshots)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        serialize(snapshots)
+    return (time.perf_counter() - started) / rounds / len(snapshots)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    snapshots = make_snapshots(args.orders)
+    legacy_cost = measure(legacy, snapshots, args.rounds)
+    current_cost = measure(current, snapshots, args.rounds)
+
+    print(f"{args.orders} orders, {args.rounds} rounds")
+    print(f"model round trip: {legacy_cost * 1e6:8.2f} us/order")
+    print(f"TypeAdapter:      {current_cost * 1e6:8.2f} us/order")
+    print(f"speedup:          {legacy_cost / current_cost:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()